@@ -0,0 +1,204 @@
+from __future__ import annotations
+import sys
+from pathlib import Path
+import argparse
+import csv
+import json
+import math
+import platform
+import statistics
+import time
+import tracemalloc
+
+ROOT = Path(__file__).resolve().parents[1]
+
+sys.path.insert(0, str(ROOT / "src"))
+from grafo_mst import GrafoMST
+from ponderacion import convertir_y_ponderar
+import grafo_compacto
+
+P1_SRC = ROOT / "lib" / "Biblioteca-grafos" / "src"
+sys.path.insert(0, str(P1_SRC))
+import modelos
+
+OUT_BENCH = ROOT / "outputs" / "bench"
+
+# ============================================================
+# Modelos parametrizados por n (grado medio ~ constante)
+# ============================================================
+
+def modelos_por_tamano():
+    return {
+        "malla":   lambda n, seed: modelos.grafoMalla(max(2, round(math.sqrt(n))), max(2, round(math.sqrt(n))), dirigido=False),
+        "erdos":   lambda n, seed: modelos.grafoErdosRenyi(n, 4 * n, False, seed=seed),
+        "gilbert": lambda n, seed: modelos.grafoGilbert(n, min(1.0, 8.0 / n), False, seed=seed),
+        "geo":     lambda n, seed: modelos.grafoGeografico(n, math.sqrt(8.0 / (math.pi * n)), False, seed=seed),
+        "ba":      lambda n, seed: modelos.grafoBarabasiAlbert(n, 3, False, seed=seed),
+        "dm":      lambda n, seed: modelos.grafoDorogovtsevMendes(n, False, seed=seed),
+    }
+
+# nombre -> función que recibe el GrafoMST y ejecuta el método
+METODOS = {
+    "KruskalD":         lambda g: g.KruskalD(),
+    "KruskalD_numpy":   lambda g: g.KruskalD(modo="numpy"),
+    "KruskalD_enteros": lambda g: g.KruskalD(modo="enteros"),
+    "KruskalI":         lambda g: g.KruskalI(),
+    "Prim":             lambda g: g.Prim(),
+    "Boruvka":          lambda g: g.Boruvka(),
+}
+
+def escalera(n_min: int, n_max: int, factor: float):
+    tamanos = []
+    n = n_min
+    while n <= n_max:
+        tamanos.append(int(n))
+        n = n * factor
+    return tamanos
+
+# ============================================================
+# Medición
+# ============================================================
+
+def medir(fn, g: GrafoMST, warmup: int, repeticiones: int, reusar_vista: bool = False):
+    # GrafoMST guarda la vista compacta (y su orden por peso) entre llamadas;
+    # salvo con reusar_vista, cada medición la reconstruye como en frío
+    def correr_una():
+        if not reusar_vista:
+            g.invalidar_compacto()
+        t0 = time.perf_counter()
+        fn(g)
+        return time.perf_counter() - t0
+
+    for _ in range(warmup):
+        correr_una()
+
+    tiempos = [correr_una() for _ in range(repeticiones)]
+
+    # la memoria se mide aparte: tracemalloc distorsiona los tiempos
+    if not reusar_vista:
+        g.invalidar_compacto()
+    tracemalloc.start()
+    try:
+        fn(g)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return tiempos, pico
+
+def correr(args):
+    builders = modelos_por_tamano()
+    nombres_modelos = args.modelos or list(builders)
+    nombres_metodos = args.metodos or [m for m in METODOS if m != "KruskalD_numpy" or grafo_compacto.np is not None]
+    tamanos = escalera(args.n_min, args.n_max, args.factor)
+
+    filas = []
+    for i, modelo in enumerate(nombres_modelos):
+        for k, n in enumerate(tamanos):
+            seed = 1000 * (i + 1) + k
+            g = convertir_y_ponderar(builders[modelo](n, seed), seed=seed)
+            m = g.numero_aristas()
+
+            for metodo in nombres_metodos:
+                tiempos, pico = medir(METODOS[metodo], g, args.warmup, args.repeticiones,
+                                      reusar_vista=args.reusar_vista)
+                mediana = statistics.median(tiempos)
+                fila = {
+                    "modelo": modelo,
+                    "n": g.numero_nodos(),
+                    "m": m,
+                    "metodo": metodo,
+                    "repeticiones": args.repeticiones,
+                    "t_min": min(tiempos),
+                    "t_mediana": mediana,
+                    "t_max": max(tiempos),
+                    "pico_bytes": pico,
+                    "aristas_por_seg": (m / mediana) if mediana > 0 else float("inf"),
+                }
+                filas.append(fila)
+                print(f"{modelo:8s} n={fila['n']:<8d} m={m:<9d} {metodo:15s} "
+                      f"{mediana:9.4f} s  {pico / 2**20:8.2f} MiB  {fila['aristas_por_seg']:12.0f} aristas/s")
+
+    salida = Path(args.salida)
+    salida.parent.mkdir(parents=True, exist_ok=True)
+    meta = {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "numpy": getattr(grafo_compacto.np, "__version__", None),
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "warmup": args.warmup,
+        "reusar_vista": args.reusar_vista,
+    }
+    salida.with_suffix(".json").write_text(
+        json.dumps({"meta": meta, "resultados": filas}, indent=2), encoding="utf-8")
+    with salida.with_suffix(".csv").open("w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=list(filas[0]) if filas else ["modelo"])
+        w.writeheader()
+        w.writerows(filas)
+    print("[OK] resultados ->", salida.with_suffix(".json"), salida.with_suffix(".csv"))
+
+# ============================================================
+# Comparación entre dos corridas
+# ============================================================
+
+def comparar(args) -> int:
+    def cargar(path):
+        datos = json.loads(Path(path).read_text(encoding="utf-8"))
+        return {(r["modelo"], r["n"], r["metodo"]): r for r in datos["resultados"]}
+
+    base = cargar(args.base)
+    nuevo = cargar(args.nuevo)
+
+    regresiones = 0
+    for clave in sorted(base.keys() & nuevo.keys(), key=str):
+        tb = base[clave]["t_mediana"]
+        tn = nuevo[clave]["t_mediana"]
+        razon = tn / tb if tb > 0 else float("inf")
+        marca = "OK"
+        if razon > 1.0 + args.tolerancia and tn - tb > args.minimo:
+            marca = "REGRESION"
+            regresiones += 1
+        elif razon < 1.0 - args.tolerancia:
+            marca = "MEJORA"
+        modelo, n, metodo = clave
+        print(f"[{marca}] {modelo:8s} n={n:<8d} {metodo:15s} {tb:9.4f} s -> {tn:9.4f} s  (x{razon:.2f})")
+
+    for clave in sorted(base.keys() - nuevo.keys(), key=str):
+        print("[FALTA]", *clave)
+
+    print(f"{regresiones} regresiones (tolerancia {args.tolerancia:.0%})")
+    return 1 if regresiones else 0
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark de KruskalD, KruskalI, Prim y Borůvka.")
+    sub = ap.add_subparsers(dest="comando", required=True)
+
+    c = sub.add_parser("correr", help="ejecuta el barrido y guarda JSON/CSV")
+    c.add_argument("--modelos", nargs="*", choices=list(modelos_por_tamano()))
+    c.add_argument("--metodos", nargs="*", choices=list(METODOS))
+    c.add_argument("--n-min", type=int, default=100)
+    c.add_argument("--n-max", type=int, default=10_000)
+    c.add_argument("--factor", type=float, default=10.0, help="razón de la escalera geométrica")
+    c.add_argument("--warmup", type=int, default=1)
+    c.add_argument("--repeticiones", type=int, default=5)
+    c.add_argument("--reusar-vista", action="store_true",
+                   help="no descartar la vista compacta entre repeticiones (mide en caliente)")
+    c.add_argument("--salida", default=str(OUT_BENCH / "bench"),
+                   help="ruta base; se escriben .json y .csv")
+
+    k = sub.add_parser("comparar", help="compara dos corridas y marca regresiones")
+    k.add_argument("base")
+    k.add_argument("nuevo")
+    k.add_argument("--tolerancia", type=float, default=0.10, help="aumento relativo permitido")
+    k.add_argument("--minimo", type=float, default=1e-3, help="diferencia absoluta mínima (s)")
+
+    args = ap.parse_args(argv)
+    if args.comando == "correr":
+        # se mide el cálculo, no el caché de $MST_CACHE_DIR
+        GrafoMST.CACHE = None
+        correr(args)
+        return 0
+    return comparar(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
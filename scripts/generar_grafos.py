@@ -1,13 +1,15 @@
 from __future__ import annotations
 import sys
 from pathlib import Path
-import random
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
 
 ROOT = Path(__file__).resolve().parents[1]
 
 # Proyecto 4
 sys.path.insert(0, str(ROOT / "src"))
-from grafo_mst import GrafoMST
+from ponderacion import convertir_y_ponderar
 
 # Proyecto 1
 P1_SRC = ROOT / "lib" / "Biblioteca-grafos" / "src"
@@ -16,22 +18,11 @@ import modelos
 
 OUT_GV = ROOT / "outputs" / "gv" / "generados"
 OUT_GV.mkdir(parents=True, exist_ok=True)
+OUT_GMS = ROOT / "outputs" / "gms" / "generados"
 
-def convertir_y_ponderar(g_base, seed: int, wmin: int = 1, wmax: int = 99) -> GrafoMST:
-    rng = random.Random(seed)
-    g = GrafoMST(dirigido=False)
-
-    for n in g_base.nodos():
-        g.add_nodo(n.id, x=n.x, y=n.y)
-
-    for (u, v) in g_base._aristas_key:
-        g.add_arista_peso(u, v, rng.randint(wmin, wmax))
-
-    return g
-
-def main():
+def casos():
     # (nombre, builder, seed)
-    casos = [
+    return [
         ("malla_pocos",  lambda: modelos.grafoMalla(6, 6, dirigido=False),               101),
         ("malla_muchos", lambda: modelos.grafoMalla(22, 22, dirigido=False),             102),
 
@@ -51,12 +42,46 @@ def main():
         ("dm_muchos",    lambda: modelos.grafoDorogovtsevMendes(500, False, seed=2),     602),
     ]
 
-    for nombre, builder, seed in casos:
-        base = builder()
-        g = convertir_y_ponderar(base, seed=seed, wmin=1, wmax=99)
-        out_path = OUT_GV / f"{nombre}.gv"
-        g.to_graphviz_ponderado(str(out_path))
-        print("[OK]", nombre, "->", out_path)
+def generar_caso(nombre: str, snapshot: bool = False):
+    """
+    Genera, pondera y escribe un caso; devuelve las rutas escritas. Cada
+    caso depende sólo de su builder y su semilla, así que el resultado es
+    el mismo en cualquier proceso y en cualquier orden.
+    """
+    builder, seed = next((b, s) for n, b, s in casos() if n == nombre)
+    g = convertir_y_ponderar(builder(), seed=seed, wmin=1, wmax=99)
+    rutas = [OUT_GV / f"{nombre}.gv"]
+    g.to_graphviz_ponderado(str(rutas[0]))
+    if snapshot:
+        rutas.append(OUT_GMS / f"{nombre}.gms")
+        g.guardar_snapshot(rutas[1])
+    return rutas
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Genera los grafos ponderados de cada caso.")
+    ap.add_argument("--snapshot", action="store_true",
+                    help="además del .gv, escribir un snapshot binario .gms por caso")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                    help="procesos trabajadores (default: número de CPUs; 1 = sin pool)")
+    args = ap.parse_args(argv)
+    if args.snapshot:
+        OUT_GMS.mkdir(parents=True, exist_ok=True)
+
+    nombres = [nombre for nombre, _, _ in casos()]
+    if args.workers <= 1:
+        resultados = (generar_caso(nombre, args.snapshot) for nombre in nombres)
+    else:
+        ex = ProcessPoolExecutor(max_workers=args.workers)
+        resultados = ex.map(generar_caso, nombres, [args.snapshot] * len(nombres))
+
+    try:
+        # se reporta en el orden de los casos aunque terminen en otro
+        for nombre, rutas in zip(nombres, resultados):
+            for ruta in rutas:
+                print("[OK]", nombre, "->", ruta)
+    finally:
+        if args.workers > 1:
+            ex.shutdown()
 
 if __name__ == "__main__":
     main()
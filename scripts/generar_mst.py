@@ -1,30 +1,74 @@
 from __future__ import annotations
 import sys
 from pathlib import Path
-import random
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from array import array
+from collections import deque
+from multiprocessing.connection import wait as esperar
 
 ROOT = Path(__file__).resolve().parents[1]
 
 sys.path.insert(0, str(ROOT / "src"))
-from grafo_mst import GrafoMST
+from grafo_mst import GrafoMST, ArbolMST
+from grafo_io import leer_graphviz_compacto, guardar_snapshot, cargar_snapshot
+from estadisticas_mst import EstadisticasMST
+from cache_mst import CacheMST, VARIABLE_ENTORNO
+from certificado_mst import verificar_mst
+from ponderacion import convertir_y_ponderar
 
 P1_SRC = ROOT / "lib" / "Biblioteca-grafos" / "src"
 sys.path.insert(0, str(P1_SRC))
 import modelos
 
+OUT_GV_GEN = ROOT / "outputs" / "gv" / "generados"
+OUT_GMS_GEN = ROOT / "outputs" / "gms" / "generados"
 OUT_GV_MST = ROOT / "outputs" / "gv" / "mst"
 OUT_TXT    = ROOT / "outputs" / "mst_valores"
+CACHE_DIR  = ROOT / ".cache" / "mst"
 OUT_GV_MST.mkdir(parents=True, exist_ok=True)
 OUT_TXT.mkdir(parents=True, exist_ok=True)
 
-def convertir_y_ponderar(g_base, seed: int, wmin: int = 1, wmax: int = 99) -> GrafoMST:
-    rng = random.Random(seed)
-    g = GrafoMST(False)
-    for n in g_base.nodos():
-        g.add_nodo(n.id, x=n.x, y=n.y)
-    for (u, v) in g_base._aristas_key:
-        g.add_arista_peso(u, v, rng.randint(wmin, wmax))
-    return g
+# (método de GrafoMST, sufijo de archivo); sin sufijo el método sólo se
+# usa para la verificación cruzada y no escribe archivos
+ALGORITMOS = [
+    ("KruskalD", "kruskalD"),
+    ("KruskalI", "kruskalI"),
+    ("Prim",     "prim"),
+    ("Boruvka",  None),
+]
+
+ABREVIATURAS = {"KruskalD": "KD", "KruskalI": "KI", "Prim": "PR", "Boruvka": "BO"}
+
+def configurar_cache(directorio):
+    """
+    Caché de resultados de GrafoMST (ver cache_mst) en `directorio`, o
+    ninguno si es None. Se fija también la variable de entorno para que lo
+    usen los procesos trabajadores que se creen después.
+    """
+    if directorio is None:
+        os.environ.pop(VARIABLE_ENTORNO, None)
+        GrafoMST.CACHE = None
+    else:
+        os.environ[VARIABLE_ENTORNO] = str(directorio)
+        GrafoMST.CACHE = CacheMST(directorio)
+
+def agregar_opciones_cache(ap: argparse.ArgumentParser):
+    grupo = ap.add_mutually_exclusive_group()
+    grupo.add_argument("--cache", nargs="?", const=str(CACHE_DIR), default=None, metavar="DIR",
+                       help=f"reutilizar resultados de MST guardados en DIR (default: {CACHE_DIR}); "
+                            f"sin la opción se usa ${VARIABLE_ENTORNO} si está definida")
+    grupo.add_argument("--sin-cache", action="store_true",
+                       help=f"no usar caché aunque ${VARIABLE_ENTORNO} esté definida")
+
+def aplicar_opciones_cache(args):
+    if args.sin_cache:
+        configurar_cache(None)
+    elif args.cache is not None:
+        configurar_cache(args.cache)
 
 def guardar_valor(path: Path, titulo: str, total: float):
     path.write_text(f"{titulo}\nTOTAL_MST = {total}\n", encoding="utf-8")
@@ -50,30 +94,242 @@ def casos():
         ("dm_muchos",    lambda: modelos.grafoDorogovtsevMendes(500, False, seed=2),     602),
     ]
 
-def main():
-    for nombre, builder, seed in casos():
-        base = builder()
-        g = convertir_y_ponderar(base, seed=seed, wmin=1, wmax=99)
+# ============================================================
+# Trabajo en procesos (caso × algoritmo)
+# ============================================================
+
+# Vistas compactas ya abiertas en este proceso trabajador, por caso. Son
+# snapshots abiertos con mmap: tener varios abiertos no copia nada, y los
+# trabajos de casos distintos pueden llegar intercalados.
+_CACHE_TRABAJADOR = {}
+
+def _resolver(nombre: str, ruta: str, metodo: str, medir: bool = False,
+              certificar: bool = False):
+    # ruta: snapshot .gms del caso, que cada trabajador abre con mmap una
+    # sola vez compartiendo la caché de páginas; el certificado se calcula
+    # aquí, fuera del tiempo medido
+    stats = EstadisticasMST() if medir else None
+    t0 = time.perf_counter()
+    c = _CACHE_TRABAJADOR.get(nombre)
+    if c is None:
+        c = _CACHE_TRABAJADOR[nombre] = cargar_snapshot(ruta)
+    if stats is not None:
+        stats.tiempos["construccion"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    sel, total = GrafoMST.mst_compacto(c, metodo, stats=stats)
+    seg = time.perf_counter() - t0
+    cert = verificar_mst(c, sel, total) if certificar else None
+    return array("i", sel), total, seg, stats, cert
+
+def _trabajador(conn):
+    # bucle de un proceso trabajador: recibe los argumentos de _resolver
+    # por su tubería y responde (error, resultado); None lo termina
+    while True:
+        try:
+            trabajo = conn.recv()
+        except EOFError:
+            return
+        if trabajo is None:
+            return
+        try:
+            respuesta = (None, _resolver(*trabajo))
+        except Exception as e:
+            respuesta = (e, None)
+        try:
+            conn.send(respuesta)
+        except Exception as e:
+            # excepción o resultado que no se puede serializar
+            conn.send((RuntimeError(repr(e)), None))
+
+class Trabajador:
+    """
+    Proceso trabajador propio, con una tubería sólo suya: si un trabajo
+    excede su tiempo se termina ese proceso y nada más (ni los otros
+    trabajadores ni una cola compartida se ven afectados).
+    """
+
+    __slots__ = ("proceso", "conn", "job", "inicio")
+
+    def __init__(self):
+        self.conn, hijo = multiprocessing.Pipe()
+        self.proceso = multiprocessing.Process(target=_trabajador, args=(hijo,), daemon=True)
+        self.proceso.start()
+        hijo.close()
+        self.job = None       # trabajo en curso
+        self.inicio = 0.0     # instante en que se le envió
+
+    def enviar(self, job: int, trabajo):
+        self.conn.send(trabajo)
+        self.job = job
+        self.inicio = time.monotonic()
+
+    def terminar(self, forzar: bool = False):
+        if forzar:
+            self.proceso.terminate()
+        else:
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+        self.proceso.join()
+        self.conn.close()
+
+def escribir_resultado(c, nombre: str, metodo: str, sufijo: str, sel, total: float):
+    T = ArbolMST(c, sel, total)
+    T.to_graphviz_ponderado(str(OUT_GV_MST / f"{nombre}_{sufijo}.gv"))
+    guardar_valor(OUT_TXT / f"{nombre}_{sufijo}.txt", f"{nombre} {metodo}", total)
+    return T
+
+def cargar_caso(nombre: str, builder, seed: int, dir_gv=None):
+    """Vista compacta del caso: leída de <dir_gv>/<nombre>.gv o regenerada."""
+    if dir_gv is not None:
+        return leer_graphviz_compacto(Path(dir_gv) / f"{nombre}.gv")
+    return convertir_y_ponderar(builder(), seed=seed, wmin=1, wmax=99).compacto()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Calcula los MST de todos los casos en paralelo.")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                    help="procesos trabajadores (default: número de CPUs)")
+    ap.add_argument("--timeout", type=float, default=None,
+                    help="segundos máximos por trabajo (caso × algoritmo)")
+    ap.add_argument("--estadisticas", action="store_true",
+                    help="contar operaciones y medir fases; escribe <caso>_<algoritmo>.stats.json "
+                         "junto a los .txt de outputs/mst_valores")
+    fuente = ap.add_mutually_exclusive_group()
+    fuente.add_argument("--desde-gv", nargs="?", const=str(OUT_GV_GEN), default=None, metavar="DIR",
+                        help="leer los grafos ya generados (<DIR>/<caso>.gv) en lugar de regenerarlos")
+    fuente.add_argument("--desde-snapshot", nargs="?", const=str(OUT_GMS_GEN), default=None, metavar="DIR",
+                        help="leer snapshots binarios (<DIR>/<caso>.gms); los trabajadores los abren con mmap")
+    ap.add_argument("--verificacion", choices=["ambas", "certificado", "cruzada"], default="ambas",
+                    help="certificado: verificar cada árbol (acíclico, de expansión y mínimo por la "
+                         "propiedad del ciclo) sin correr Borůvka; cruzada: sólo comparar los totales "
+                         "de todos los métodos; ambas (default)")
+    agregar_opciones_cache(ap)
+    args = ap.parse_args(argv)
+    aplicar_opciones_cache(args)
+
+    certificar = args.verificacion != "cruzada"
+    # los métodos sin archivo de salida sólo sirven a la verificación cruzada
+    algoritmos = [(m, s) for m, s in ALGORITMOS if s is not None or args.verificacion != "certificado"]
+
+    grafos = {}       # nombre -> GrafoCompacto
+    totales = {}      # nombre -> {metodo: total}
+    certificados = {} # nombre -> {metodo: CertificadoMST}
+    componentes = {}  # nombre -> c
+    pendientes = {}   # job -> (nombre, metodo, sufijo)
+    cola = deque()    # (job, argumentos de _resolver) aún sin trabajador
+    njobs = 0
+    completo = False
+
+    def repartir():
+        for t in trabajadores:
+            if not cola:
+                return
+            if t.job is None:
+                t.enviar(*cola.popleft())
+
+    def registrar(job, error, resultado):
+        nombre, metodo, sufijo = pendientes.pop(job)
+        if error is not None:
+            print("[ERROR]", nombre, metodo, repr(error))
+            totales[nombre][metodo] = None
+        else:
+            sel, total, seg, stats, cert = resultado
+            if sufijo is not None and stats is not None:
+                with stats.fase("exportacion"):
+                    escribir_resultado(grafos[nombre], nombre, metodo, sufijo, sel, total)
+                stats.guardar(OUT_TXT / f"{nombre}_{sufijo}.stats.json")
+            elif sufijo is not None:
+                escribir_resultado(grafos[nombre], nombre, metodo, sufijo, sel, total)
+            totales[nombre][metodo] = total
+            if cert is not None:
+                certificados[nombre][metodo] = cert
+            print(f"  {nombre} {metodo} = {total} ({seg:.3f} s)")
+        reportar_caso(nombre, totales[nombre], componentes[nombre],
+                      certificados[nombre], algoritmos)
 
-        kd, tkd = g.KruskalD()
-        ki, tki = g.KruskalI()
-        pr, tpr = g.Prim()
+    temporal = tempfile.TemporaryDirectory(prefix="generar_mst_")
+    trabajadores = [Trabajador() for _ in range(max(1, args.workers))]
+    try:
+        # Cada grafo llega a los trabajadores una sola vez, como snapshot
+        # en disco que abren con mmap; los trabajos sólo llevan la ruta
+        for nombre, builder, seed in casos():
+            if args.desde_snapshot is not None:
+                ruta = str(Path(args.desde_snapshot) / f"{nombre}.gms")
+                c = cargar_snapshot(ruta)
+            else:
+                c = cargar_caso(nombre, builder, seed, args.desde_gv)
+                ruta = str(Path(temporal.name) / f"{nombre}.gms")
+                guardar_snapshot(c, ruta, adyacencia=True)
+            grafos[nombre] = c
+            totales[nombre] = {}
+            certificados[nombre] = {}
+            componentes[nombre] = c.componentes()[1]
+            for metodo, sufijo in algoritmos:
+                job = njobs
+                njobs += 1
+                pendientes[job] = (nombre, metodo, sufijo)
+                cola.append((job, (nombre, ruta, metodo, args.estadisticas, certificar)))
+            repartir()
 
-        kd_gv = OUT_GV_MST / f"{nombre}_kruskalD.gv"
-        ki_gv = OUT_GV_MST / f"{nombre}_kruskalI.gv"
-        pr_gv = OUT_GV_MST / f"{nombre}_prim.gv"
+        # Los resultados se escriben conforme terminan
+        while pendientes:
+            repartir()
+            ocupados = [t for t in trabajadores if t.job is not None]
+            listos = esperar([t.conn for t in ocupados], timeout=0.5)
+            for t in ocupados:
+                if t.conn not in listos:
+                    continue
+                job, t.job = t.job, None
+                try:
+                    error, resultado = t.conn.recv()
+                except (EOFError, OSError):
+                    # el proceso murió (p. ej. sin memoria): se reemplaza
+                    error, resultado = RuntimeError("el proceso trabajador terminó"), None
+                    t.terminar(forzar=True)
+                    trabajadores[trabajadores.index(t)] = Trabajador()
+                registrar(job, error, resultado)
 
-        kd.to_graphviz_ponderado(str(kd_gv))
-        ki.to_graphviz_ponderado(str(ki_gv))
-        pr.to_graphviz_ponderado(str(pr_gv))
+            if args.timeout is not None:
+                ahora = time.monotonic()
+                for i, t in enumerate(trabajadores):
+                    if t.job is None or ahora - t.inicio <= args.timeout:
+                        continue
+                    # sólo se termina el proceso de ese trabajo; los demás
+                    # siguen con lo suyo y uno nuevo toma su lugar
+                    nombre, metodo, _ = pendientes.pop(t.job)
+                    t.terminar(forzar=True)
+                    trabajadores[i] = Trabajador()
+                    print("[TIMEOUT]", nombre, metodo, f"> {args.timeout} s")
+                    totales[nombre][metodo] = None
+                    reportar_caso(nombre, totales[nombre], componentes[nombre],
+                                  certificados[nombre], algoritmos)
+        completo = True
+    finally:
+        for t in trabajadores:
+            t.terminar(forzar=not completo)
+        temporal.cleanup()
 
-        guardar_valor(OUT_TXT / f"{nombre}_kruskalD.txt", f"{nombre} KruskalD", tkd)
-        guardar_valor(OUT_TXT / f"{nombre}_kruskalI.txt", f"{nombre} KruskalI", tki)
-        guardar_valor(OUT_TXT / f"{nombre}_prim.txt",     f"{nombre} Prim",     tpr)
+def reportar_caso(nombre: str, t: dict, componentes: int, certificados: dict = None,
+                  algoritmos=ALGORITMOS):
+    if len(t) < len(algoritmos):
+        return
+    totales = [t[m] for m, _ in algoritmos]
+    columnas = []
+    for (metodo, _), total in zip(algoritmos, totales):
+        columnas += [ABREVIATURAS[metodo] + "=", total]
+    if None in totales:
+        print("[WARN]", nombre, *columnas, "(incompleto)")
+        return
 
-        # sanity check
-        ok = (abs(tkd - tki) < 1e-9) and (abs(tkd - tpr) < 1e-9)
-        print("[OK]" if ok else "[WARN]", nombre, "KD=", tkd, "KI=", tki, "PR=", tpr)
+    # sanity check (en grafos no conexos todos dan el bosque mínimo) y
+    # certificado de cada árbol, si se pidió
+    ok = all(abs(totales[0] - x) < 1e-9 for x in totales[1:])
+    fallas = [(m, cert) for m, cert in (certificados or {}).items() if not cert]
+    print("[OK]" if ok and not fallas else "[WARN]", nombre, *columnas, "componentes=", componentes)
+    for metodo, cert in fallas:
+        print("   ", metodo, "no certificado:", cert.motivo)
 
 if __name__ == "__main__":
     main()
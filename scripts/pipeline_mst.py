@@ -0,0 +1,239 @@
+from __future__ import annotations
+import sys
+from pathlib import Path
+import argparse
+import asyncio
+import os
+import pickle
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+ROOT = Path(__file__).resolve().parents[1]
+
+sys.path.insert(0, str(ROOT / "src"))
+from grafo_mst import GrafoMST, ArbolMST
+from grafo_io import escribir_graphviz_compacto
+from ponderacion import convertir_y_ponderar
+
+from generar_mst import (
+    ALGORITMOS, OUT_GV_GEN, OUT_GV_MST, OUT_TXT, casos, guardar_valor, reportar_caso,
+    agregar_opciones_cache, aplicar_opciones_cache,
+)
+
+# ============================================================
+# Pipeline de una sola pasada
+#   generar + ponderar  ->  MST (4 métodos)  ->  escribir .gv/.txt
+#
+# Las etapas de CPU corren en un pool de procesos y la escritura en un
+# pool de hilos; entre etapas hay colas acotadas, así que si la escritura
+# se atrasa la generación se detiene (contrapresión) en lugar de acumular
+# grafos en memoria. Los archivos son los mismos que producen
+# generar_grafos.py y generar_mst.py.
+# ============================================================
+
+_FIN = object()
+
+# ------------------ Trabajo en procesos ------------------
+
+# Vista compacta ya deserializada en este proceso trabajador (los cuatro
+# métodos de un caso suelen caer en el mismo proceso)
+_CACHE_TRABAJADOR = {}
+
+def _generar(nombre: str) -> bytes:
+    # los builders son lambdas: se buscan por nombre dentro del trabajador
+    builder, seed = next((b, s) for n, b, s in casos() if n == nombre)
+    c = convertir_y_ponderar(builder(), seed=seed, wmin=1, wmax=99).compacto()
+    # el orden por peso viaja con la vista: no se ordena en cada método
+    c.orden_por_peso()
+    return pickle.dumps(c, protocol=pickle.HIGHEST_PROTOCOL)
+
+def _resolver(nombre: str, datos: bytes, metodo: str):
+    c = _CACHE_TRABAJADOR.get(nombre)
+    if c is None:
+        _CACHE_TRABAJADOR.clear()
+        c = _CACHE_TRABAJADOR[nombre] = pickle.loads(datos)
+    t0 = time.perf_counter()
+    sel, total = GrafoMST.mst_compacto(c, metodo)
+    return array("i", sel), total, time.perf_counter() - t0
+
+# ------------------ Hilos (fuera del bucle de eventos) ------------------
+
+def _cargar(datos: bytes):
+    c = pickle.loads(datos)
+    c.componentes()
+    return c
+
+def _escribir_generado(nombre: str, c):
+    escribir_graphviz_compacto(c, str(OUT_GV_GEN / f"{nombre}.gv"))
+
+def _escribir_mst(nombre: str, metodo: str, sufijo: str, c, sel, total: float):
+    ArbolMST(c, sel, total).to_graphviz_ponderado(str(OUT_GV_MST / f"{nombre}_{sufijo}.gv"))
+    guardar_valor(OUT_TXT / f"{nombre}_{sufijo}.txt", f"{nombre} {metodo}", total)
+
+# ============================================================
+# Progreso
+# ============================================================
+
+class Progreso:
+    """Contadores por etapa; `linea()` resume avance y ocupación de colas."""
+
+    def __init__(self, casos: int, colas: dict):
+        self.esperado = {
+            "generados": casos,
+            "mst": casos * len(ALGORITMOS),
+            "escritos": casos * (1 + sum(1 for _, s in ALGORITMOS if s is not None)),
+        }
+        self.hechos = dict.fromkeys(self.esperado, 0)
+        self.errores = 0
+        self.colas = colas
+        self.t0 = time.perf_counter()
+
+    def avanzar(self, etapa: str):
+        self.hechos[etapa] += 1
+
+    def linea(self) -> str:
+        partes = [f"{k} {self.hechos[k]}/{n}" for k, n in self.esperado.items()]
+        colas = " ".join(f"{k}={q.qsize()}/{q.maxsize}" for k, q in self.colas.items())
+        return f"[{time.perf_counter() - self.t0:7.2f} s] " + ", ".join(partes) + f" | colas {colas}"
+
+async def _reportar(progreso: Progreso, intervalo: float):
+    while True:
+        await asyncio.sleep(intervalo)
+        print(progreso.linea(), flush=True)
+
+# ============================================================
+# Etapas
+# ============================================================
+
+async def _etapa(entrada: asyncio.Queue, procesar, tareas: int):
+    # `tareas` consumidores de la misma cola; cada uno termina al recibir
+    # su propio _FIN
+    async def consumidor():
+        while True:
+            item = await entrada.get()
+            if item is _FIN:
+                return
+            await procesar(item)
+
+    await asyncio.gather(*(consumidor() for _ in range(tareas)))
+
+async def pipeline(nombres, workers: int, escritores: int, capacidad: int,
+                   intervalo: float = 1.0) -> dict:
+    """
+    Corre el pipeline sobre los casos `nombres` y devuelve
+    {nombre: {metodo: total o None}}.
+    """
+    loop = asyncio.get_running_loop()
+    q_grafos = asyncio.Queue(capacidad)       # (nombre, datos)
+    q_escritura = asyncio.Queue(capacidad)    # (función, argumentos)
+    progreso = Progreso(len(nombres), {"grafos": q_grafos, "escritura": q_escritura})
+    totales = {nombre: {} for nombre in nombres}
+    componentes = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as cpu, \
+         ThreadPoolExecutor(max_workers=escritores, thread_name_prefix="escritor") as hilos:
+
+        async def generar(nombre):
+            try:
+                datos = await loop.run_in_executor(cpu, _generar, nombre)
+            except Exception as e:
+                print("[ERROR]", nombre, "generación", repr(e), flush=True)
+                progreso.errores += 1
+                for metodo, _ in ALGORITMOS:
+                    totales[nombre][metodo] = None
+                return
+            progreso.avanzar("generados")
+            # put() espera si la cola está llena: contrapresión hacia atrás
+            await q_grafos.put((nombre, datos))
+
+        async def mst(item):
+            nombre, datos = item
+            c = await loop.run_in_executor(hilos, _cargar, datos)
+            componentes[nombre] = c.componentes()[1]
+            await q_escritura.put((_escribir_generado, (nombre, c)))
+            # los cuatro métodos del caso se lanzan a la vez
+            trabajos = [loop.run_in_executor(cpu, _resolver, nombre, datos, metodo)
+                        for metodo, _ in ALGORITMOS]
+            for (metodo, sufijo), fut in zip(ALGORITMOS, trabajos):
+                try:
+                    sel, total, seg = await fut
+                except Exception as e:
+                    print("[ERROR]", nombre, metodo, repr(e), flush=True)
+                    progreso.errores += 1
+                    totales[nombre][metodo] = None
+                    continue
+                progreso.avanzar("mst")
+                totales[nombre][metodo] = total
+                print(f"  {nombre} {metodo} = {total} ({seg:.3f} s)", flush=True)
+                if sufijo is not None:
+                    await q_escritura.put((_escribir_mst, (nombre, metodo, sufijo, c, sel, total)))
+            reportar_caso(nombre, totales[nombre], componentes[nombre])
+
+        async def escribir(item):
+            funcion, argumentos = item
+            try:
+                await loop.run_in_executor(hilos, funcion, *argumentos)
+            except Exception as e:
+                print("[ERROR] escritura", argumentos[0], repr(e), flush=True)
+                progreso.errores += 1
+                return
+            progreso.avanzar("escritos")
+
+        async def productor():
+            # a lo más `workers` generaciones en vuelo
+            cupo = asyncio.Semaphore(workers)
+
+            async def una(nombre):
+                async with cupo:
+                    await generar(nombre)
+
+            await asyncio.gather(*(una(nombre) for nombre in nombres))
+            for _ in range(workers):
+                await q_grafos.put(_FIN)
+
+        async def calculo():
+            await _etapa(q_grafos, mst, workers)
+            for _ in range(escritores):
+                await q_escritura.put(_FIN)
+
+        reporte = asyncio.create_task(_reportar(progreso, intervalo)) if intervalo > 0 else None
+        try:
+            await asyncio.gather(productor(), calculo(), _etapa(q_escritura, escribir, escritores))
+        finally:
+            if reporte is not None:
+                reporte.cancel()
+        print(progreso.linea(), flush=True)
+
+    return totales
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        description="Genera, calcula y escribe todos los casos en una sola pasada (asyncio).")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                    help="procesos para generación y MST (default: número de CPUs)")
+    ap.add_argument("--escritores", type=int, default=2,
+                    help="hilos de escritura de .gv/.txt (default: 2)")
+    ap.add_argument("--capacidad", type=int, default=None,
+                    help="tamaño de cada cola entre etapas (default: 2 × workers)")
+    ap.add_argument("--intervalo", type=float, default=1.0,
+                    help="segundos entre líneas de progreso (0 = sólo al final)")
+    ap.add_argument("casos", nargs="*", metavar="CASO",
+                    help="casos a procesar (default: todos)")
+    agregar_opciones_cache(ap)
+    args = ap.parse_args(argv)
+    aplicar_opciones_cache(args)
+
+    todos = [nombre for nombre, _, _ in casos()]
+    nombres = args.casos or todos
+    desconocidos = [n for n in nombres if n not in todos]
+    if desconocidos:
+        ap.error(f"casos desconocidos: {', '.join(desconocidos)}")
+
+    workers = max(1, args.workers)
+    capacidad = args.capacidad if args.capacidad is not None else 2 * workers
+    OUT_GV_GEN.mkdir(parents=True, exist_ok=True)
+    asyncio.run(pipeline(nombres, workers, max(1, args.escritores), max(1, capacidad), args.intervalo))
+
+if __name__ == "__main__":
+    main()
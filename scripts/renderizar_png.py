@@ -0,0 +1,188 @@
+from __future__ import annotations
+import sys
+from pathlib import Path
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = Path(__file__).resolve().parents[1]
+
+sys.path.insert(0, str(ROOT / "src"))
+from grafo_io import leer_graphviz_compacto, escribir_graphviz_tabla
+from layout_fa2 import forceatlas2, posiciones_aleatorias, separar_traslapes, tamanos_por_grado, np
+from render_png import dibujar_png
+
+# ============================================================
+# Exportación de imágenes sin Gephi
+#   Mismo flujo que gephi_batch_export.py, en procesos y sin interfaz:
+#   posiciones aleatorias (semilla 1337) -> FA2 sin traslape ->
+#   tamaños -> FA2 con traslape -> PNG
+#
+#   El layout se calcula una vez por grafo base y se guarda en
+#   outputs/gv/layout/<caso>.gv (el grafo con pos="x,y!"). Los MST del
+#   caso (KruskalD, KruskalI, Prim) comparten sus nodos, así que se
+#   dibujan sobre esas posiciones fijadas, sólo separando los nodos que
+#   se traslapan con el tamaño fijo: las tres imágenes son comparables.
+# ============================================================
+
+GV_GENERADOS = ROOT / "outputs" / "gv" / "generados"
+GV_MST       = ROOT / "outputs" / "gv" / "mst"
+IMG_GENERADOS = ROOT / "outputs" / "img" / "generados"
+IMG_MST       = ROOT / "outputs" / "img" / "mst"
+GV_LAYOUT     = ROOT / "outputs" / "gv" / "layout"
+
+FA2_ITERS_1 = 400
+FA2_ITERS_2 = 400
+
+# pasadas de separar_traslapes sobre el layout fijado de un MST
+REFINAMIENTO = 50
+
+TAMANO_MST = 10.0
+
+def es_arbol(nombre: str) -> bool:
+    nombre = nombre.lower()
+    return ("_kruskal" in nombre) or ("_prim" in nombre) or ("_mst" in nombre)
+
+def caso_base(nombre: str) -> str:
+    """Caso del que sale un MST: "erdos_pocos_prim" -> "erdos_pocos"."""
+    return nombre.rpartition("_")[0] if es_arbol(nombre) else nombre
+
+def etiqueta_peso(w: float) -> str:
+    # como el label del .gv
+    return str(int(w) if abs(w - int(w)) < 1e-9 else w)
+
+def layout_completo(c, tamanos, iters=(FA2_ITERS_1, FA2_ITERS_2)):
+    """Posiciones aleatorias -> FA2 sin traslape -> FA2 con traslape."""
+    eu = np.frombuffer(c.eu, dtype=np.intc)
+    ev = np.frombuffer(c.ev, dtype=np.intc)
+    pos = posiciones_aleatorias(c.numero_nodos(), seed=1337, escala=1000.0)
+    pos = forceatlas2(pos, eu, ev, iters[0], evitar_traslape=False)
+    return forceatlas2(pos, eu, ev, iters[1], evitar_traslape=True, tamanos=tamanos)
+
+def ruta_layout(caso: str) -> Path:
+    return GV_LAYOUT / f"{caso}.gv"
+
+def layout_vigente(caso: str) -> bool:
+    """Hay layout guardado y no es más viejo que el .gv generado."""
+    lay, gv = ruta_layout(caso), GV_GENERADOS / f"{caso}.gv"
+    return lay.exists() and (not gv.exists() or lay.stat().st_mtime >= gv.stat().st_mtime)
+
+def guardar_layout(c, pos, destino: Path):
+    """El grafo `c` con las posiciones del layout (pos="x,y!")."""
+    ids = c.ids
+    escribir_graphviz_tabla(
+        destino, c.dirigido,
+        ((nid, float(x), float(y)) for nid, (x, y) in zip(ids, pos)),
+        ((ids[a], ids[b], w) for a, b, w in zip(c.eu, c.ev, c.ew)),
+    )
+
+def posiciones_fijadas(c, caso: str):
+    """Posiciones de los nodos de `c` en el layout guardado del caso."""
+    lay = leer_graphviz_compacto(ruta_layout(caso))
+    indice = {nid: i for i, nid in enumerate(lay.ids)}
+    try:
+        sel = np.fromiter((indice[nid] for nid in c.ids), dtype=np.intp, count=c.numero_nodos())
+    except KeyError as e:
+        raise ValueError(f"El layout de {caso} no tiene el nodo {e.args[0]!r}") from None
+    return np.stack((np.frombuffer(lay.x, dtype=np.float64)[sel],
+                     np.frombuffer(lay.y, dtype=np.float64)[sel]), axis=1)
+
+def renderizar(gv: Path, png, categoria: str, iters=(FA2_ITERS_1, FA2_ITERS_2),
+               refinamiento: int = REFINAMIENTO) -> float:
+    """
+    Layout + PNG de un .gv; devuelve los segundos empleados. Un grafo
+    generado guarda además su layout (png None: sólo el layout); un MST
+    usa el de su caso si existe y si no hace el layout completo.
+    """
+    t0 = time.perf_counter()
+    c = leer_graphviz_compacto(gv)
+    n = c.numero_nodos()
+    eu = np.frombuffer(c.eu, dtype=np.intc)
+    ev = np.frombuffer(c.ev, dtype=np.intc)
+    arbol = es_arbol(gv.stem)
+
+    if categoria == "generados":
+        tamanos = tamanos_por_grado(eu, ev, n, 5.0, 40.0)
+        pos = layout_completo(c, tamanos, iters)
+        GV_LAYOUT.mkdir(parents=True, exist_ok=True)
+        guardar_layout(c, pos, ruta_layout(gv.stem))
+        if png is None:
+            return time.perf_counter() - t0
+    else:
+        tamanos = np.full(n, TAMANO_MST)
+        caso = caso_base(gv.stem)
+        if ruta_layout(caso).exists():
+            pos = separar_traslapes(posiciones_fijadas(c, caso), tamanos, refinamiento)
+        else:
+            pos = layout_completo(c, tamanos, iters)
+
+    # generados: sólo pesos; mst: nodos + pesos
+    dibujar_png(
+        png, pos, tamanos, eu, ev,
+        etiquetas_nodos=None if categoria == "generados" else [str(i) for i in c.ids],
+        etiquetas_aristas=[etiqueta_peso(w) for w in c.ew],
+        curvas=not arbol, grosor=0.9 if arbol else 0.3,
+    )
+    return time.perf_counter() - t0
+
+def trabajos(categorias):
+    carpetas = {"generados": (GV_GENERADOS, IMG_GENERADOS), "mst": (GV_MST, IMG_MST)}
+    for categoria in categorias:
+        gv_dir, img_dir = carpetas[categoria]
+        if not gv_dir.is_dir():
+            print("No existe:", gv_dir)
+            continue
+        img_dir.mkdir(parents=True, exist_ok=True)
+        for gv in sorted(gv_dir.glob("*.gv"), key=lambda p: p.name.lower()):
+            yield gv, img_dir / (gv.stem + ".png"), categoria
+
+def layouts_pendientes(lista):
+    """Layouts que faltan o quedaron viejos de casos cuyo grafo no se dibuja."""
+    generados = {gv.stem for gv, _, categoria in lista if categoria == "generados"}
+    casos = sorted({caso_base(gv.stem) for gv, _, categoria in lista if categoria == "mst"} - generados)
+    for caso in casos:
+        gv = GV_GENERADOS / f"{caso}.gv"
+        if gv.exists() and not layout_vigente(caso):
+            yield gv, None, "generados"
+
+def ejecutar(lista, ex, iters, refinamiento):
+    if not lista:
+        return
+    gvs, pngs, categorias = zip(*lista)
+    args = (gvs, pngs, categorias, [iters] * len(lista), [refinamiento] * len(lista))
+    resultados = map(renderizar, *args) if ex is None else ex.map(renderizar, *args)
+    for (gv, png, categoria), seg in zip(lista, resultados):
+        destino = png if png is not None else ruta_layout(gv.stem)
+        print(f"[{categoria}] {gv.name} -> {destino} ({seg:.2f} s)")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Layout ForceAtlas2 y PNG de los .gv, sin Gephi.")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                    help="procesos (default: número de CPUs; 1 = sin pool)")
+    ap.add_argument("--iteraciones", type=int, nargs=2, default=[FA2_ITERS_1, FA2_ITERS_2],
+                    metavar=("SIN_TRASLAPE", "CON_TRASLAPE"),
+                    help=f"iteraciones de cada pasada de FA2 (default: {FA2_ITERS_1} {FA2_ITERS_2})")
+    ap.add_argument("--solo", choices=["generados", "mst"], default=None,
+                    help="procesar sólo una de las dos carpetas; con mst se calculan antes "
+                         "los layouts de caso que falten")
+    ap.add_argument("--refinamiento", type=int, default=REFINAMIENTO, metavar="N",
+                    help=f"pasadas para separar nodos traslapados en los MST (default: {REFINAMIENTO})")
+    args = ap.parse_args(argv)
+
+    lista = list(trabajos([args.solo] if args.solo else ["generados", "mst"]))
+    # primero los grafos base (y su layout), después los MST que lo usan
+    base = [t for t in lista if t[2] == "generados"] + list(layouts_pendientes(lista))
+    arboles = [t for t in lista if t[2] == "mst"]
+    iters = tuple(args.iteraciones)
+    ex = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
+    try:
+        ejecutar(base, ex, iters, args.refinamiento)
+        ejecutar(arboles, ex, iters, args.refinamiento)
+    finally:
+        if ex is not None:
+            ex.shutdown()
+    print("DONE.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+from __future__ import annotations
+from array import array
+from pathlib import Path
+import hashlib
+import os
+import struct
+import sys
+import tempfile
+
+from grafo_compacto import GrafoCompacto
+
+
+# ============================================================
+# Caché en disco de resultados de MST
+# ============================================================
+#
+# Una entrada por (huella del grafo ponderado, método, opciones). La
+# huella (GrafoCompacto.huella) cubre ids, extremos y pesos en orden, que
+# es todo lo que decide el árbol, desempates incluidos; VERSION_CACHE se
+# incrementa si algún método cambia de desempate. Cada entrada guarda los
+# índices de las aristas del árbol y el total en un formato binario fijo
+# (nunca pickle: el directorio puede ser compartido y un pickle ajeno
+# ejecutaría código al cargarse):
+#
+#     cabecera "<4sHBxQQ": magic "MSTC", versión, tipo del total
+#         (0 = float64, 1 = int), número de aristas, bytes del total
+#     total: float64 little-endian, o el int con signo little-endian
+#     índices: int32 little-endian
+#
+# Una entrada que no cumple exactamente ese formato se descarta.
+#
+# Varias escrituras concurrentes (procesos de un pool, corridas en
+# paralelo) son seguras: cada entrada se escribe en un temporal del mismo
+# directorio y se publica con os.replace, que es atómico; un lector ve la
+# entrada completa o no la ve. Dos escritores de la misma clave escriben
+# el mismo contenido.
+#
+# Expulsión LRU por tamaño: cada acierto actualiza la fecha de
+# modificación de la entrada y, si el directorio pasa de `max_bytes`, se
+# borran las menos usadas hasta quedar en 90 %. Escribir no recorre el
+# directorio: cada instancia lleva la cuenta de los bytes ocupados (medida
+# una vez, en la primera escritura, y actualizada con cada una) y sólo lo
+# recorre cuando esa cuenta pasa de `max_bytes`; el recorrido vuelve a
+# medir, así que lo que escriben otros procesos se incorpora entonces.
+# Con escritores concurrentes de la misma clave la cuenta puede sobrar
+# (nunca faltar respecto de lo escrito por la instancia): sólo adelanta
+# el siguiente recorrido.
+
+VERSION_CACHE = 2
+
+MAGIC = b"MSTC"
+
+# variable de entorno con el directorio del caché por omisión de GrafoMST;
+# así lo heredan también los procesos trabajadores
+VARIABLE_ENTORNO = "MST_CACHE_DIR"
+
+MAX_BYTES = 256 << 20
+
+_SUFIJO = ".mst"
+
+_CABECERA = struct.Struct("<4sHBxQQ")
+_TOTAL_FLOAT = 0
+_TOTAL_INT = 1
+
+# opciones que no cambian el resultado y no forman parte de la clave
+_OPCIONES_IGNORADAS = frozenset({"procesos"})
+
+
+class CacheMST:
+    """
+    Caché de (índices de aristas, total) por grafo, método y opciones.
+
+        cache = CacheMST("~/.cache/mst")
+        r = cache.obtener(clave)        # None si no está
+        cache.guardar(clave, sel, total)
+
+    GrafoMST.mst_compacto lo consulta por sí solo si GrafoMST.CACHE no es
+    None. `aciertos` y `fallos` cuentan las consultas de esta instancia.
+    """
+
+    def __init__(self, directorio, max_bytes: int = MAX_BYTES):
+        self.directorio = Path(directorio).expanduser()
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.aciertos = 0
+        self.fallos = 0
+        self._ocupado = None      # bytes ocupados; None hasta medirlos
+
+    @staticmethod
+    def clave(c: GrafoCompacto, metodo: str, opciones: dict = None) -> str:
+        """Clave de la entrada: huella del grafo + método + opciones."""
+        partes = [c.huella(), metodo, f"v{VERSION_CACHE}"]
+        for nombre, valor in sorted((opciones or {}).items()):
+            if nombre not in _OPCIONES_IGNORADAS:
+                partes.append(f"{nombre}={valor!r}")
+        return "-".join(partes[:3]) + ("-" + _resumen(partes[3:]) if len(partes) > 3 else "")
+
+    def _ruta(self, clave: str) -> Path:
+        return self.directorio / clave[:2] / (clave + _SUFIJO)
+
+    def obtener(self, clave: str):
+        """(array de índices, total) o None si no hay entrada válida."""
+        ruta = self._ruta(clave)
+        datos = b""
+        try:
+            datos = ruta.read_bytes()
+            sel, total = _decodificar(datos)
+        except FileNotFoundError:
+            self.fallos += 1
+            return None
+        except (OSError, ValueError):
+            # entrada ilegible, truncada o de otra versión: se descarta
+            _borrar(ruta)
+            if self._ocupado is not None:
+                self._ocupado -= len(datos)
+            self.fallos += 1
+            return None
+        try:
+            os.utime(ruta)     # LRU: la fecha de modificación es el último uso
+        except OSError:
+            pass
+        self.aciertos += 1
+        return sel, total
+
+    def guardar(self, clave: str, sel, total):
+        ruta = self._ruta(clave)
+        ruta.parent.mkdir(exist_ok=True)
+        datos = _codificar(sel, total)
+        try:
+            anterior = ruta.stat().st_size
+        except FileNotFoundError:
+            anterior = 0
+        fd, tmp = tempfile.mkstemp(prefix=".tmp_", suffix=_SUFIJO, dir=ruta.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(datos)
+            os.replace(tmp, ruta)
+        except BaseException:
+            _borrar(Path(tmp))
+            raise
+        if self._ocupado is None:
+            self._ocupado = self.tamano()
+        else:
+            self._ocupado += len(datos) - anterior
+        if self._ocupado > self.max_bytes:
+            self._expulsar()
+
+    def _entradas(self):
+        # (mtime, tamaño, ruta) de cada entrada publicada; las que otro
+        # proceso borra mientras se recorre simplemente no aparecen
+        for sub in self.directorio.iterdir():
+            if not sub.is_dir():
+                continue
+            for ruta in sub.glob("*" + _SUFIJO):
+                if ruta.name.startswith(".tmp_"):
+                    continue
+                try:
+                    st = ruta.stat()
+                except FileNotFoundError:
+                    continue
+                yield st.st_mtime, st.st_size, ruta
+
+    def tamano(self) -> int:
+        """Bytes ocupados por las entradas."""
+        return sum(tam for _, tam, _ in self._entradas())
+
+    def _expulsar(self):
+        entradas = list(self._entradas())
+        total = sum(tam for _, tam, _ in entradas)
+        if total > self.max_bytes:
+            objetivo = self.max_bytes * 9 // 10
+            entradas.sort()
+            for _, tam, ruta in entradas:
+                if total <= objetivo:
+                    break
+                _borrar(ruta)
+                total -= tam
+        self._ocupado = total
+
+    def limpiar(self):
+        """Borra todas las entradas."""
+        for _, _, ruta in list(self._entradas()):
+            _borrar(ruta)
+        self._ocupado = 0
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._entradas())
+
+    def __repr__(self):
+        return f"CacheMST({str(self.directorio)!r}, aciertos={self.aciertos}, fallos={self.fallos})"
+
+
+def cache_por_omision():
+    """CacheMST en $MST_CACHE_DIR, o None si la variable no está definida."""
+    directorio = os.environ.get(VARIABLE_ENTORNO)
+    return CacheMST(directorio) if directorio else None
+
+
+def _codificar(sel, total) -> bytes:
+    indices = array("i", sel)
+    if sys.byteorder == "big":
+        indices.byteswap()
+    if isinstance(total, int):
+        # totales enteros exactos (KruskalD modo "enteros"), sin límite
+        tipo = _TOTAL_INT
+        crudo = total.to_bytes(total.bit_length() // 8 + 1, "little", signed=True)
+    else:
+        tipo = _TOTAL_FLOAT
+        crudo = struct.pack("<d", total)
+    return _CABECERA.pack(MAGIC, VERSION_CACHE, tipo, len(indices), len(crudo)) + crudo + indices.tobytes()
+
+
+def _decodificar(datos: bytes):
+    if len(datos) < _CABECERA.size:
+        raise ValueError("entrada truncada")
+    magic, version, tipo, m, largo = _CABECERA.unpack_from(datos)
+    if magic != MAGIC or version != VERSION_CACHE:
+        raise ValueError("no es una entrada de esta versión")
+    ini = _CABECERA.size
+    fin = ini + largo
+    if len(datos) != fin + 4 * m:
+        raise ValueError("tamaño de entrada inválido")
+    if tipo == _TOTAL_FLOAT and largo == 8:
+        total = struct.unpack_from("<d", datos, ini)[0]
+    elif tipo == _TOTAL_INT and largo > 0:
+        total = int.from_bytes(datos[ini:fin], "little", signed=True)
+    else:
+        raise ValueError("tipo de total inválido")
+    sel = array("i")
+    sel.frombytes(datos[fin:])
+    if sys.byteorder == "big":
+        sel.byteswap()
+    return sel, total
+
+
+def _resumen(partes) -> str:
+    return hashlib.blake2b("\n".join(partes).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _borrar(ruta: Path):
+    try:
+        ruta.unlink()
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,220 @@
+from __future__ import annotations
+from math import fsum
+
+from grafo_compacto import GrafoCompacto, _raiz, _unir
+
+try:
+    import numpy as np
+except ImportError:   # NumPy es opcional: sin él se usa el modo puro
+    np = None
+
+
+# ============================================================
+# Certificado de un árbol (bosque) de expansión mínima
+# ============================================================
+#
+# Verifica un resultado sin volver a calcular el MST con otro método:
+#
+#   1) cada arista existe y aparece una sola vez;
+#   2) acíclico (DSU sobre las aristas del árbol);
+#   3) n - (número de componentes) aristas: con 2), un bosque acíclico
+#      de aristas del grafo con ese tamaño abarca cada componente;
+#   4) el total declarado es la suma de los pesos;
+#   5) propiedad del ciclo: toda arista fuera del árbol pesa al menos lo
+#      mismo que la arista más pesada del camino entre sus extremos en el
+#      árbol. Con 2) y 3) eso equivale a que el bosque sea mínimo.
+#
+# El máximo por camino se consulta con LCA por binary lifting: up[k][v]
+# es el ancestro 2^k de v y mx[k][v] el peso máximo en ese tramo, así que
+# cada consulta cuesta O(log n) y el total O(n log n + m log n). El modo
+# numpy resuelve todas las consultas a la vez, nivel por nivel.
+#
+# Las aristas se toman sin dirección, como en los métodos de MST.
+
+class CertificadoMST:
+    """
+    Resultado de verificar_mst. Es verdadero si el árbol es válido.
+
+        valido   bool
+        motivo   descripción de la primera falla ("" si es válido)
+        arista   índice de la arista involucrada en la falla, o None
+    """
+
+    __slots__ = ("valido", "motivo", "arista")
+
+    def __init__(self, valido: bool, motivo: str = "", arista=None):
+        self.valido = valido
+        self.motivo = motivo
+        self.arista = arista
+
+    def __bool__(self) -> bool:
+        return self.valido
+
+    def __repr__(self):
+        if self.valido:
+            return "CertificadoMST(valido)"
+        return f"CertificadoMST({self.motivo!r}, arista={self.arista})"
+
+
+def verificar_mst(c: GrafoCompacto, sel, total=None, modo: str = "auto",
+                  tol: float = 1e-9) -> CertificadoMST:
+    """
+    Certifica que las aristas `sel` (índices de arista de `c`) forman un
+    bosque de expansión mínima de `c` y, si se da, que suman `total`
+    (con tolerancia relativa `tol`).
+
+    modo: "auto" (numpy desde 10 000 aristas, si está instalado), "puro"
+    o "numpy".
+    """
+    if modo == "auto":
+        modo = "numpy" if np is not None and c.numero_aristas() >= 10_000 else "puro"
+    if modo not in ("puro", "numpy"):
+        raise ValueError(f"Modo de verificación desconocido: {modo!r}")
+    if modo == "numpy" and np is None:
+        raise ImportError("El modo 'numpy' requiere NumPy")
+
+    n, m = c.numero_nodos(), c.numero_aristas()
+    eu, ev, ew = c.eu, c.ev, c.ew
+    sel = list(sel)
+
+    en_arbol = bytearray(m)
+    for e in sel:
+        if not 0 <= e < m:
+            return CertificadoMST(False, f"la arista {e} no existe", e)
+        if en_arbol[e]:
+            return CertificadoMST(False, f"la arista {e} aparece dos veces", e)
+        en_arbol[e] = 1
+
+    padre = list(range(n))
+    tam = [1] * n
+    for e in sel:
+        ra, rb = _raiz(padre, eu[e]), _raiz(padre, ev[e])
+        if ra == rb:
+            return CertificadoMST(False, f"la arista {e} cierra un ciclo", e)
+        _unir(padre, tam, ra, rb)
+
+    objetivo = c.tamano_bosque()
+    if len(sel) != objetivo:
+        return CertificadoMST(
+            False, f"{len(sel)} aristas; un bosque de expansión tiene {objetivo}")
+
+    if total is not None:
+        suma = fsum(ew[e] for e in sel)
+        if abs(suma - total) > tol * max(1.0, abs(suma)):
+            return CertificadoMST(False, f"el total declarado {total} no es la suma {suma}")
+
+    if modo == "numpy":
+        e = _violacion_ciclo_numpy(c, sel, en_arbol)
+    else:
+        e = _violacion_ciclo(c, sel, en_arbol)
+    if e is not None:
+        return CertificadoMST(
+            False, f"la arista {e} (peso {ew[e]}) pesa menos que el máximo de su ciclo", e)
+    return CertificadoMST(True)
+
+
+def _bosque_enraizado(c: GrafoCompacto, sel):
+    # padre, peso hacia el padre y profundidad de cada nodo, con BFS desde
+    # el primer nodo de cada árbol; las raíces son su propio padre
+    n = c.numero_nodos()
+    eu, ev, ew = c.eu, c.ev, c.ew
+    vecinos = [[] for _ in range(n)]
+    for e in sel:
+        vecinos[eu[e]].append(e)
+        vecinos[ev[e]].append(e)
+
+    padre = list(range(n))
+    peso = [float("-inf")] * n
+    prof = [-1] * n
+    for s in range(n):
+        if prof[s] != -1:
+            continue
+        prof[s] = 0
+        cola = [s]
+        for u in cola:
+            for e in vecinos[u]:
+                v = ev[e] if eu[e] == u else eu[e]
+                if prof[v] == -1:
+                    prof[v] = prof[u] + 1
+                    padre[v] = u
+                    peso[v] = ew[e]
+                    cola.append(v)
+    return padre, peso, prof
+
+
+def _violacion_ciclo(c: GrafoCompacto, sel, en_arbol):
+    n = c.numero_nodos()
+    eu, ev, ew = c.eu, c.ev, c.ew
+    padre, peso, prof = _bosque_enraizado(c, sel)
+
+    up, mx = [padre], [peso]
+    for _ in range(1, max(1, (n - 1).bit_length())):
+        u0, m0 = up[-1], mx[-1]
+        up.append([u0[u0[v]] for v in range(n)])
+        mx.append([a if a >= b else b for a, b in zip(m0, (m0[u0[v]] for v in range(n)))])
+    niveles = len(up)
+
+    for e in range(len(ew)):
+        if en_arbol[e]:
+            continue
+        a, b = eu[e], ev[e]
+        if a == b:
+            continue
+        if prof[a] < prof[b]:
+            a, b = b, a
+        maximo = float("-inf")
+        dif, k = prof[a] - prof[b], 0
+        while dif:
+            if dif & 1:
+                if mx[k][a] > maximo:
+                    maximo = mx[k][a]
+                a = up[k][a]
+            dif >>= 1
+            k += 1
+        if a != b:
+            for k in range(niveles - 1, -1, -1):
+                if up[k][a] != up[k][b]:
+                    maximo = max(maximo, mx[k][a], mx[k][b])
+                    a, b = up[k][a], up[k][b]
+            maximo = max(maximo, mx[0][a], mx[0][b])
+        if maximo > ew[e]:
+            return e
+    return None
+
+
+def _violacion_ciclo_numpy(c: GrafoCompacto, sel, en_arbol):
+    n = c.numero_nodos()
+    padre, peso, prof = _bosque_enraizado(c, sel)
+    up = [np.array(padre, dtype=np.intp)]
+    mx = [np.array(peso, dtype=np.float64)]
+    for _ in range(1, max(1, (n - 1).bit_length())):
+        up.append(up[-1][up[-1]])
+        mx.append(np.maximum(mx[-1], mx[-1][up[-2]]))
+    prof = np.array(prof, dtype=np.intp)
+
+    fuera = np.flatnonzero(np.frombuffer(bytes(en_arbol), dtype=np.uint8) == 0)
+    a = np.asarray(c.eu, dtype=np.intp)[fuera]
+    b = np.asarray(c.ev, dtype=np.intp)[fuera]
+    w = np.asarray(c.ew, dtype=np.float64)[fuera]
+
+    # a queda como el extremo más profundo y sube hasta la altura de b
+    cambio = prof[a] < prof[b]
+    a[cambio], b[cambio] = b[cambio], a[cambio]
+    dif = prof[a] - prof[b]
+    maximo = np.full(len(a), -np.inf)
+    for k in range(len(up)):
+        sube = ((dif >> k) & 1).astype(bool)
+        maximo[sube] = np.maximum(maximo[sube], mx[k][a[sube]])
+        a[sube] = up[k][a[sube]]
+    # después suben juntos mientras sus ancestros difieran
+    for k in range(len(up) - 1, -1, -1):
+        sube = up[k][a] != up[k][b]
+        maximo[sube] = np.maximum(maximo[sube], np.maximum(mx[k][a[sube]], mx[k][b[sube]]))
+        a[sube] = up[k][a[sube]]
+        b[sube] = up[k][b[sube]]
+    distintos = a != b
+    maximo[distintos] = np.maximum(maximo[distintos],
+                                   np.maximum(mx[0][a[distintos]], mx[0][b[distintos]]))
+
+    malas = np.flatnonzero(maximo > w)
+    return int(fuera[malas[0]]) if len(malas) else None
@@ -0,0 +1,87 @@
+from __future__ import annotations
+from contextlib import contextmanager
+import json
+import time
+
+
+# ============================================================
+# Contadores y tiempos de una corrida de MST
+# ============================================================
+
+class EstadisticasMST:
+    """
+    Contadores de una corrida de MST, llenados sólo si se pide.
+
+    Se pasa como `stats=` a los métodos de GrafoMST (o a mst_compacto),
+    que lo entregan a los núcleos de grafo_compacto: los Kruskal usan
+    `raiz` como find y todos cuentan el resto dentro de su bucle (nada se
+    deduce del resultado). Sin él corren los mismos núcleos sin ningún
+    contador. Sólo los modos con contadores aceptan `stats`.
+
+        aristas_examinadas      aristas sacadas del orden / del heap
+        finds, uniones          operaciones del union-find
+        pasos_compresion        saltos de path halving (suma de todos los find)
+        profundidad_max         saltos del find más largo
+        heap_push               inserciones al heap
+        heap_decrementos        decrease-key (Prim indexado)
+        heap_pop                extracciones del heap
+        heap_obsoletos          extracciones descartadas (Prim perezoso)
+        verificaciones_conectividad
+                                consultas "¿siguen conectados?" de KruskalI
+        tiempos                 segundos por fase: construccion, orden,
+                                bucle, resultado, exportacion
+    """
+
+    __slots__ = (
+        "metodo",
+        "aristas_examinadas", "finds", "uniones", "pasos_compresion", "profundidad_max",
+        "heap_push", "heap_decrementos", "heap_pop", "heap_obsoletos",
+        "verificaciones_conectividad",
+        "tiempos",
+    )
+
+    CONTADORES = __slots__[1:-1]
+
+    def __init__(self, metodo: str = ""):
+        self.metodo = metodo
+        for nombre in self.CONTADORES:
+            setattr(self, nombre, 0)
+        self.tiempos = {}
+
+    @contextmanager
+    def fase(self, nombre: str):
+        """Acumula en tiempos[nombre] el tiempo del bloque `with`."""
+        t0 = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.tiempos[nombre] = self.tiempos.get(nombre, 0.0) + time.perf_counter() - t0
+
+    def raiz(self, padre, a):
+        """find con path halving (el de grafo_compacto._raiz), contado."""
+        pasos = 0
+        while padre[a] != a:
+            padre[a] = padre[padre[a]]
+            a = padre[a]
+            pasos += 1
+        self.finds += 1
+        self.pasos_compresion += pasos
+        if pasos > self.profundidad_max:
+            self.profundidad_max = pasos
+        return a
+
+    def como_dict(self) -> dict:
+        d = {"metodo": self.metodo}
+        for nombre in self.CONTADORES:
+            d[nombre] = getattr(self, nombre)
+        d["tiempos"] = dict(self.tiempos)
+        return d
+
+    def guardar(self, path):
+        """Escribe las estadísticas como JSON."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.como_dict(), f, indent=2)
+            f.write("\n")
+
+    def __repr__(self):
+        return f"EstadisticasMST({self.como_dict()!r})"
@@ -0,0 +1,1182 @@
+from __future__ import annotations
+from array import array
+from contextlib import nullcontext
+import hashlib
+import heapq
+
+try:
+    import numpy as np
+except ImportError:   # NumPy es opcional: sin él se usan los modos puros
+    np = None
+
+
+# ============================================================
+# Vista compacta (CSR) de un GrafoMST
+# ============================================================
+
+class GrafoCompacto:
+    """
+    Vista inmutable tipo CSR de un GrafoMST.
+
+    Los nodos se numeran 0..n-1 en el orden de g.nodos() y las aristas
+    0..m-1 en el orden de g.aristas_con_peso(). Todo vive en arreglos planos
+    de `array`, sin tuplas ni diccionarios por arista:
+
+        eu, ev, ew            extremos y peso de cada arista
+        inicio                desplazamientos (n + 1) de la adyacencia
+        ady_nodo, ady_peso    vecino y peso de cada entrada de adyacencia
+        ady_arista            índice de arista de cada entrada de adyacencia
+        rango                 posición de cada nodo al ordenar los ids
+                              (reproduce el desempate de Prim por id)
+
+    Los arreglos pueden ser `array` o memoryviews tipados (p. ej. sobre un
+    snapshot mapeado con mmap, ver grafo_io); la adyacencia y el rango se
+    reciben ya calculados o se construyen aquí. Las componentes conexas y
+    el orden de las aristas por peso se calculan la primera vez que se
+    piden y se reutilizan en todas las llamadas sobre la misma vista.
+    """
+
+    __slots__ = (
+        "dirigido", "ids", "indice", "x", "y",
+        "eu", "ev", "ew",
+        "inicio", "ady_nodo", "ady_peso", "ady_arista",
+        "rango", "_componentes", "_orden", "_orden_inverso", "_enteros", "_huella",
+    )
+
+    def __init__(self, dirigido, ids, x, y, eu, ev, ew, adyacencia=None, rango=None, orden=None):
+        self.dirigido = dirigido
+        self.ids = ids
+        self.indice = {nid: i for i, nid in enumerate(ids)}
+        self.x = x
+        self.y = y
+        self.eu = eu
+        self.ev = ev
+        self.ew = ew
+        if adyacencia is None:
+            self._construir_adyacencia()
+        else:
+            self.inicio, self.ady_nodo, self.ady_peso, self.ady_arista = adyacencia
+        if rango is None:
+            self._construir_rango()
+        else:
+            self.rango = rango
+        self._componentes = None
+        self._orden = orden
+        self._orden_inverso = None
+        self._enteros = False   # False = no calculado; None = pesos no enteros
+        self._huella = None
+
+    @classmethod
+    def desde_grafo(cls, g) -> "GrafoCompacto":
+        ids = []
+        x = array("d")
+        y = array("d")
+        for n in g.nodos():
+            ids.append(n.id)
+            x.append(float("nan") if n.x is None else n.x)
+            y.append(float("nan") if n.y is None else n.y)
+
+        indice = {nid: i for i, nid in enumerate(ids)}
+        eu = array("i")
+        ev = array("i")
+        ew = array("d")
+        peso = g._peso
+        for (u, v) in g._aristas_key:
+            eu.append(indice[u])
+            ev.append(indice[v])
+            ew.append(peso[g._key(u, v)])
+
+        return cls(g.dirigido, ids, x, y, eu, ev, ew)
+
+    def __reduce__(self):
+        # Al serializar (p. ej. hacia otro proceso) sólo viajan los arreglos
+        # de nodos y aristas, y el orden por peso si ya se calculó; la
+        # adyacencia se reconstruye al cargar.
+        orden = None if self._orden is None else _como_array(self._orden, "i")
+        return (GrafoCompacto, (
+            self.dirigido, self.ids,
+            _como_array(self.x, "d"), _como_array(self.y, "d"),
+            _como_array(self.eu, "i"), _como_array(self.ev, "i"), _como_array(self.ew, "d"),
+            None, None, orden,
+        ))
+
+    # ------------------ Construcción interna ------------------
+
+    def _construir_adyacencia(self):
+        n = len(self.ids)
+        m = len(self.eu)
+        eu, ev, ew = self.eu, self.ev, self.ew
+        if np is not None and m >= 10_000:
+            self._construir_adyacencia_numpy(n, m)
+            return
+
+        grado = array("q", bytes(8 * (n + 1)))
+        for e in range(m):
+            grado[eu[e] + 1] += 1
+            if not self.dirigido:
+                grado[ev[e] + 1] += 1
+        for i in range(n):
+            grado[i + 1] += grado[i]
+        self.inicio = grado
+
+        total = grado[n]
+        ady_nodo = array("i", bytes(4 * total))
+        ady_peso = array("d", bytes(8 * total))
+        ady_arista = array("i", bytes(4 * total))
+        pos = array("q", grado)
+
+        for e in range(m):
+            a, b, w = eu[e], ev[e], ew[e]
+            k = pos[a]
+            ady_nodo[k] = b
+            ady_peso[k] = w
+            ady_arista[k] = e
+            pos[a] = k + 1
+            if not self.dirigido:
+                k = pos[b]
+                ady_nodo[k] = a
+                ady_peso[k] = w
+                ady_arista[k] = e
+                pos[b] = k + 1
+
+        self.ady_nodo = ady_nodo
+        self.ady_peso = ady_peso
+        self.ady_arista = ady_arista
+
+    def _construir_adyacencia_numpy(self, n: int, m: int):
+        # Mismo resultado que el recorrido en Python: las entradas de cada
+        # nodo quedan en orden de arista (argsort estable sobre el origen).
+        eu = np.frombuffer(self.eu, dtype=np.intc)
+        ev = np.frombuffer(self.ev, dtype=np.intc)
+        ew = np.frombuffer(self.ew, dtype=np.float64)
+        e = np.arange(m, dtype=np.intc)
+        if self.dirigido:
+            origen, destino, arista, peso = eu, ev, e, ew
+        else:
+            origen = np.empty(2 * m, dtype=np.intc)
+            origen[0::2], origen[1::2] = eu, ev
+            destino = np.empty(2 * m, dtype=np.intc)
+            destino[0::2], destino[1::2] = ev, eu
+            arista = np.repeat(e, 2)
+            peso = np.repeat(ew, 2)
+
+        # argsort estable vía una clave única (origen << 32 | posición):
+        # ordenar int64 es varias veces más rápido que el mergesort estable
+        clave = (origen.astype(np.int64) << 32) | np.arange(len(origen), dtype=np.int64)
+        clave.sort()
+        orden = clave & 0xFFFFFFFF
+        inicio = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(origen, minlength=n), out=inicio[1:])
+
+        self.inicio = array("q", inicio.tobytes())
+        self.ady_nodo = array("i", destino[orden].tobytes())
+        self.ady_peso = array("d", peso[orden].tobytes())
+        self.ady_arista = array("i", arista[orden].tobytes())
+
+    def _construir_rango(self):
+        n = len(self.ids)
+        try:
+            orden = sorted(range(n), key=self.ids.__getitem__)
+        except TypeError:
+            # ids no comparables entre sí: se desempata por orden de inserción
+            orden = range(n)
+        rango = array("i", bytes(4 * n))
+        for r, i in enumerate(orden):
+            rango[i] = r
+        self.rango = rango
+
+    # ------------------ Consultas ------------------
+
+    def numero_nodos(self) -> int:
+        return len(self.ids)
+
+    def numero_aristas(self) -> int:
+        return len(self.eu)
+
+    def componentes(self):
+        """
+        (etiquetas, c): etiqueta de componente por nodo, numeradas en orden
+        de aparición del primer nodo de cada una, y número de componentes.
+        En grafos dirigidos sólo sigue aristas salientes.
+        """
+        if self._componentes is None:
+            n = len(self.ids)
+            inicio, ady_nodo = self.inicio, self.ady_nodo
+            etiqueta = array("i", [-1]) * n
+            k = 0
+            for s in range(n):
+                if etiqueta[s] != -1:
+                    continue
+                etiqueta[s] = k
+                pila = [s]
+                while pila:
+                    u = pila.pop()
+                    for j in range(inicio[u], inicio[u + 1]):
+                        v = ady_nodo[j]
+                        if etiqueta[v] == -1:
+                            etiqueta[v] = k
+                            pila.append(v)
+                k += 1
+            self._componentes = (etiqueta, k)
+        return self._componentes
+
+    def orden_por_peso(self) -> array:
+        """
+        Índices de arista ordenados por peso ascendente, con los empates en
+        orden de arista (orden estable). Se calcula una vez por vista.
+
+        Con pesos enteros de rango W = wmax - wmin acotado no se compara:
+        radix sort de NumPy desde 10 000 aristas y, por debajo (o sin
+        NumPy), cubetas por w - wmin si W <= max(m, 65 535), en O(m + W).
+        """
+        if self._orden is None:
+            m = len(self.ew)
+            if np is not None and m >= 10_000:
+                self._orden = array("i", self._orden_numpy().astype(np.intc).tobytes())
+            else:
+                orden = self._orden_cubetas()
+                if orden is None:
+                    orden = array("i", sorted(range(m), key=self.ew.__getitem__))
+                self._orden = orden
+        return self._orden
+
+    def _orden_cubetas(self):
+        # conteo por cubetas para pesos enteros de rango chico; cada cubeta
+        # conserva el orden de arista, así que el resultado es estable
+        enteros = self.pesos_enteros()
+        if enteros is None:
+            return None
+        wmin, wmax = enteros
+        if wmax - wmin > max(len(self.ew), 0xFFFF):
+            return None
+        cubetas = [[] for _ in range(wmax - wmin + 1)]
+        for e, w in enumerate(self.ew):
+            cubetas[int(w) - wmin].append(e)
+        orden = array("i")
+        for cubeta in cubetas:
+            orden.extend(cubeta)
+        return orden
+
+    def _orden_numpy(self):
+        ew = np.frombuffer(self.ew, dtype=np.float64)
+        enteros = self.pesos_enteros()
+        if enteros is None:
+            return np.argsort(ew, kind="stable")
+
+        # pesos enteros acotados: se ordena el desplazamiento w - wmin. Con
+        # 8 o 16 bits el argsort estable de NumPy es un radix sort, O(m);
+        # con rangos mayores, una clave única (w << 32 | posición).
+        wmin, wmax = enteros
+        rango = wmax - wmin
+        if rango < 1 << 8:
+            return np.argsort((ew - wmin).astype(np.uint8), kind="stable")
+        if rango < 1 << 16:
+            return np.argsort((ew - wmin).astype(np.uint16), kind="stable")
+        if rango < 1 << 31:
+            clave = ((ew - wmin).astype(np.int64) << 32) | np.arange(len(ew), dtype=np.int64)
+            clave.sort()
+            return clave & 0xFFFFFFFF
+        return np.argsort(ew, kind="stable")
+
+    def pesos_enteros(self):
+        """
+        (wmin, wmax) como int si todos los pesos son enteros (y hay al menos
+        una arista); None en otro caso. Se calcula una vez por vista.
+        """
+        if self._enteros is False:
+            ew = self.ew
+            if len(ew) == 0:
+                self._enteros = None
+            elif np is not None and len(ew) >= 10_000:
+                w = np.frombuffer(ew, dtype=np.float64)
+                ok = bool(np.isfinite(w).all()) and bool((w == np.floor(w)).all())
+                self._enteros = (int(w.min()), int(w.max())) if ok else None
+            else:
+                try:
+                    ok = all(map(float.is_integer, ew))
+                except (OverflowError, ValueError):
+                    ok = False
+                self._enteros = (int(min(ew)), int(max(ew))) if ok else None
+        return self._enteros
+
+    def orden_inverso(self) -> array:
+        """
+        Orden por peso ascendente con los empates de la última arista a la
+        primera: el orden estable descendente recorrido al revés (el que
+        usa KruskalI). Se obtiene de orden_por_peso() invirtiendo cada
+        tramo de pesos iguales, sin volver a ordenar.
+        """
+        if self._orden_inverso is None:
+            orden = self.orden_por_peso()
+            ew = self.ew
+            m = len(orden)
+            if np is not None and m >= 10_000:
+                o = np.frombuffer(orden, dtype=np.intc)
+                ws = np.frombuffer(ew, dtype=np.float64)[o]
+                cortes = np.flatnonzero(ws[1:] != ws[:-1]) + 1
+                ini = np.concatenate(([0], cortes))
+                fin = np.concatenate((cortes, [m]))
+                tramo = np.repeat(np.arange(len(ini)), fin - ini)
+                p = ini[tramo] + fin[tramo] - 1 - np.arange(m)
+                self._orden_inverso = array("i", o[p].tobytes())
+            else:
+                inv = array("i")
+                i = 0
+                while i < m:
+                    j = i + 1
+                    w = ew[orden[i]]
+                    while j < m and ew[orden[j]] == w:
+                        j += 1
+                    inv.extend(reversed(orden[i:j]))
+                    i = j
+                self._orden_inverso = inv
+        return self._orden_inverso
+
+    def huella(self) -> str:
+        """
+        Hash (BLAKE2b, hex) del grafo ponderado: dirección, ids en orden y
+        extremos y pesos de cada arista en orden. Dos vistas con la misma
+        huella dan el mismo árbol con cualquier método (los desempates
+        dependen sólo de eso). Las coordenadas no entran. Se calcula una
+        vez por vista.
+        """
+        if self._huella is None:
+            h = hashlib.blake2b(digest_size=20)
+            h.update(b"D" if self.dirigido else b"N")
+            h.update(len(self.ids).to_bytes(8, "little"))
+            h.update("\n".join(map(repr, self.ids)).encode("utf-8"))
+            for datos in (self.eu, self.ev, self.ew):
+                h.update(len(datos).to_bytes(8, "little"))
+                h.update(datos)
+            self._huella = h.hexdigest()
+        return self._huella
+
+    def tamano_bosque(self) -> int:
+        """Aristas de un bosque de expansión: n - (número de componentes)."""
+        return self.numero_nodos() - self.componentes()[1]
+
+    def coordenadas(self, i):
+        x, y = self.x[i], self.y[i]
+        return (None if x != x else x), (None if y != y else y)
+
+
+def _como_array(datos, tipo: str) -> array:
+    # memoryviews (mmap) no se pueden serializar: se copian a un array
+    if isinstance(datos, array):
+        return datos
+    a = array(tipo)
+    a.frombytes(bytes(datos))
+    return a
+
+
+# ============================================================
+# MST sobre la vista compacta
+#   Cada función devuelve (índices de aristas aceptadas, total).
+#   En grafos no conexos el resultado es el bosque de expansión
+#   mínima y todas se detienen al llegar a n - c aristas.
+# ============================================================
+
+# Union-find de todos los núcleos (y de DSU en grafo_mst): padre y tam
+# son listas planas de enteros; find con path halving iterativo y unión
+# por tamaño.
+
+def _raiz(padre, a):
+    # path halving iterativo
+    while padre[a] != a:
+        padre[a] = padre[padre[a]]
+        a = padre[a]
+    return a
+
+
+def _unir(padre, tam, ra, rb):
+    # une dos raíces distintas por tamaño; devuelve la raíz nueva
+    if tam[ra] < tam[rb]:
+        ra, rb = rb, ra
+    padre[rb] = ra
+    tam[ra] += tam[rb]
+    return ra
+
+
+# Instrumentación opcional (ver estadisticas_mst): los núcleos que aceptan
+# `stats` usan stats.raiz como find (cuenta finds y saltos), miden sus
+# fases y cuentan el resto dentro del bucle, en contadores locales bajo
+# `if contar:` que se vuelcan a `stats` al terminar. Con stats=None el
+# costo es sólo esa comprobación.
+
+def _fase(stats, nombre: str):
+    return nullcontext() if stats is None else stats.fase(nombre)
+
+
+def kruskal_directo(c: GrafoCompacto, stats=None):
+    n = c.numero_nodos()
+    eu, ev, ew = c.eu, c.ev, c.ew
+    padre = list(range(n))
+    tam = [1] * n
+    raiz = _raiz if stats is None else stats.raiz
+
+    objetivo = c.tamano_bosque()
+    sel = []
+    total = 0.0
+    if objetivo == 0:
+        return sel, total
+    contar = stats is not None
+    examinadas = uniones = 0
+    with _fase(stats, "orden"):
+        orden = c.orden_por_peso()
+    with _fase(stats, "bucle"):
+        for e in orden:
+            if contar:
+                examinadas += 1
+            ra, rb = raiz(padre, eu[e]), raiz(padre, ev[e])
+            if ra == rb:
+                continue
+            _unir(padre, tam, ra, rb)
+            if contar:
+                uniones += 1
+            sel.append(e)
+            total += ew[e]
+            if len(sel) == objetivo:
+                break
+    if contar:
+        stats.aristas_examinadas += examinadas
+        stats.uniones += uniones
+    return sel, total
+
+
+def _raices_np(padre, x):
+    # find vectorizado: salto de punteros hasta el punto fijo + compresión
+    r = padre[x]
+    while True:
+        rr = padre[r]
+        if np.array_equal(rr, r):
+            break
+        r = rr
+    padre[x] = r
+    return r
+
+
+def kruskal_directo_numpy(c: GrafoCompacto, bloque: int = 1 << 16):
+    """
+    KruskalD con NumPy: un solo argsort estable de los pesos y un DSU sobre
+    índices enteros (path halving iterativo + unión por tamaño).
+
+    Las aristas se procesan por bloques. En cada bloque se descartan de forma
+    vectorizada las que ya unen nodos de la misma componente, y sólo las
+    sobrevivientes pasan por el DSU secuencial. Se detiene al aceptar n-c.
+    Mismo orden (estable) que kruskal_directo, por lo tanto mismo árbol.
+    """
+    if np is None:
+        raise ImportError("El modo numpy de KruskalD requiere NumPy")
+
+    n = c.numero_nodos()
+    m = c.numero_aristas()
+    objetivo = c.tamano_bosque()
+    sel = []
+    total = 0.0
+    if objetivo == 0:
+        return sel, total
+
+    eu = np.frombuffer(c.eu, dtype=np.intc)
+    ev = np.frombuffer(c.ev, dtype=np.intc)
+    orden = np.frombuffer(c.orden_por_peso(), dtype=np.intc)
+
+    # El DSU secuencial vive en listas (acceso escalar barato); antes de cada
+    # bloque se toma una copia en NumPy para el filtro vectorizado.
+    padre = list(range(n))
+    tam = [1] * n
+    pesos = c.ew
+    bloque = max(bloque, n)
+
+    for ini in range(0, m, bloque):
+        idx = orden[ini:ini + bloque]
+        padre_np = np.array(padre, dtype=np.int64)
+        ra = _raices_np(padre_np, eu[idx])
+        rb = _raices_np(padre_np, ev[idx])
+        distintas = ra != rb
+        vivos = idx[distintas]
+
+        for e, a, b in zip(vivos.tolist(), ra[distintas].tolist(), rb[distintas].tolist()):
+            a, b = _raiz(padre, a), _raiz(padre, b)
+            if a == b:
+                continue
+            _unir(padre, tam, a, b)
+            sel.append(e)
+            total += pesos[e]
+            if len(sel) == objetivo:
+                return sel, total
+
+    return sel, total
+
+
+def kruskal_enteros(c: GrafoCompacto, stats=None):
+    """
+    KruskalD para pesos enteros: el orden sale de cubetas por peso (o del
+    radix sort de NumPy con muchas aristas), O(m + W) con W = wmax - wmin,
+    salvo que W supere max(m, 65 535), donde se vuelve a un ordenamiento
+    por comparación (ver GrafoCompacto.orden_por_peso). El total se
+    acumula como int, sin redondeo aunque la suma supere 2**53. Mismo árbol
+    que kruskal_directo. Con `stats` el bucle es siempre el de
+    kruskal_directo (el que cuenta).
+    """
+    enteros = c.pesos_enteros()
+    if enteros is None and c.numero_aristas():
+        raise ValueError("El modo enteros requiere pesos enteros")
+
+    if stats is None and np is not None and c.numero_aristas() >= 10_000:
+        sel, _ = kruskal_directo_numpy(c)
+    else:
+        sel, _ = kruskal_directo(c, stats)
+    ew = c.ew
+    return sel, sum(int(ew[e]) for e in sel)
+
+
+def _euclidianos(c: GrafoCompacto, eu, ev, ew):
+    # x, y (float64) si todos los nodos tienen coordenadas y cada peso es la
+    # distancia euclidiana entre sus extremos; None en otro caso
+    x = np.frombuffer(c.x, dtype=np.float64)
+    y = np.frombuffer(c.y, dtype=np.float64)
+    if np.isnan(x).any() or np.isnan(y).any():
+        return None
+    d = np.hypot(x[eu] - x[ev], y[eu] - y[ev])
+    if not np.allclose(ew, d, rtol=1e-9, atol=1e-12):
+        return None
+    return x, y
+
+
+def _radios_rejilla(x, y, k: int):
+    # radio de k vecinos de cada nodo con una rejilla de cubetas de ~2
+    # nodos: se buscan los k más cercanos entre los nodos de las 3 x 3
+    # celdas alrededor, así que el radio nunca es menor que el verdadero
+    # (y es exacto si no pasa del lado de la celda); inf si esas celdas no
+    # tienen k vecinos. O(n·k) en promedio.
+    n = len(x)
+    lado = max(1, int((n / 2) ** 0.5))
+    x0, y0 = float(x.min()), float(y.min())
+    celda = max(float(x.max()) - x0, float(y.max()) - y0) / lado or 1.0
+    cx = np.minimum(((x - x0) / celda).astype(np.int64), lado - 1)
+    cy = np.minimum(((y - y0) / celda).astype(np.int64), lado - 1)
+    cid = cx * lado + cy
+    orden = np.argsort(cid, kind="stable")
+    cortes = np.searchsorted(cid[orden], np.arange(lado * lado + 1))
+
+    radio = np.full(n, np.inf)
+    for a in range(lado):
+        for b in range(lado):
+            propios = orden[cortes[a * lado + b]:cortes[a * lado + b + 1]]
+            if not len(propios):
+                continue
+            vecinos = np.concatenate([
+                orden[cortes[i * lado + max(b - 1, 0)]:cortes[i * lado + min(b + 1, lado - 1) + 1]]
+                for i in range(max(a - 1, 0), min(a + 1, lado - 1) + 1)
+            ])
+            if len(vecinos) <= k:   # la distancia 0 es el propio nodo
+                continue
+            d = np.hypot(x[propios, None] - x[None, vecinos], y[propios, None] - y[None, vecinos])
+            radio[propios] = np.partition(d, k, axis=1)[:, k]
+    return radio
+
+
+def kruskal_geometrico(c: GrafoCompacto, k: int = 8):
+    """
+    KruskalD con poda espacial de candidatas para grafos con coordenadas y
+    pesos euclidianos (p. ej. grafos geográficos de radio grande, casi
+    completos).
+
+    Con una rejilla de cubetas sobre las coordenadas se obtiene el radio
+    de k vecinos de cada nodo, en O(n·k), y las candidatas son las aristas
+    que no superan el percentil 90 de esos radios (sin contar los nodos
+    sin k vecinos en su entorno de la rejilla): unas n·k, que son las
+    únicas que se ordenan y pasan por el bucle de Kruskal. El árbol
+    euclidiano mínimo está en la triangulación de Delaunay (grado medio
+    < 6), así que casi todas sus aristas están entre ellas. El umbral es
+    uno solo, así que las candidatas son las más ligeras del grafo y el
+    orden de Kruskal se respeta. Después se descartan de forma vectorizada
+    las aristas restantes que ya quedan dentro de una componente y, si
+    alguna aún cruza (nodos aislados de la nube, por ejemplo), se procesa
+    el siguiente tramo de pesos (unas n·k aristas) hasta que ninguna cruce.
+
+    La lista de aristas de la vista sí se recorre entera en cada vuelta,
+    pero sólo con operaciones de NumPy (comparar pesos, buscar raíces);
+    lo que ahorra es el ordenamiento y el bucle en Python, de O(m log m)
+    a O(n·k log(n·k)).
+
+    Las aristas descartadas unen nodos ya conectados y Kruskal las
+    rechazaría, así que el resultado es exacto con cualquier peso: mismo
+    árbol y mismo total que kruskal_directo, en el mismo orden. Si algún
+    nodo no tiene coordenadas o los pesos no son las distancias, no hay
+    poda espacial: el primer tramo son las n·k aristas más ligeras (un
+    cuantil de los pesos).
+    """
+    if np is None:
+        raise ImportError("El modo geométrico de KruskalD requiere NumPy")
+
+    n, m = c.numero_nodos(), c.numero_aristas()
+    sel = []
+    total = 0.0
+    if n < 2 or m == 0:
+        return sel, total
+
+    eu = np.frombuffer(c.eu, dtype=np.intc)
+    ev = np.frombuffer(c.ev, dtype=np.intc)
+    ew = np.frombuffer(c.ew, dtype=np.float64)
+    pesos = c.ew
+    lote = max(n * k, 1024)
+
+    padre = list(range(n))
+    tam = [1] * n
+    pendientes = np.arange(m, dtype=np.int64)
+    coordenadas = _euclidianos(c, eu, ev, ew)
+    if coordenadas is not None:
+        radio = _radios_rejilla(*coordenadas, k)
+        radio = radio[np.isfinite(radio)]
+        umbral = float(np.percentile(radio, 90)) if len(radio) else 0.0
+    else:
+        umbral = 0.0    # sin poda espacial: sólo el cuantil de abajo
+
+    while len(pendientes):
+        wp = ew[pendientes]
+        if len(pendientes) > lote:
+            # el tramo llega al umbral de la rejilla (primera vuelta) o a
+            # las `lote` aristas más ligeras de lo que queda
+            umbral = max(umbral, float(np.partition(wp, lote - 1)[lote - 1]))
+            en_tramo = wp <= umbral
+        else:
+            en_tramo = np.ones(len(pendientes), dtype=bool)
+        tramo = pendientes[en_tramo]
+        tramo = tramo[np.argsort(ew[tramo], kind="stable")]
+
+        for e, a, b in zip(tramo.tolist(), eu[tramo].tolist(), ev[tramo].tolist()):
+            a, b = _raiz(padre, a), _raiz(padre, b)
+            if a == b:
+                continue
+            _unir(padre, tam, a, b)
+            sel.append(e)
+            total += pesos[e]
+
+        resto = pendientes[~en_tramo]
+        if not len(resto):
+            break
+        raiz = np.array(padre, dtype=np.int64)
+        raiz = _raices_np(raiz, np.arange(n))
+        pendientes = resto[raiz[eu[resto]] != raiz[ev[resto]]]
+        umbral = 0.0
+
+    return sel, total
+
+
+def kruskal_inverso(c: GrafoCompacto, stats=None):
+    # Ver GrafoMST.KruskalI: el orden de borrado recorrido al revés con un
+    # DSU decide qué aristas son puente al momento de revisarlas.
+    n = c.numero_nodos()
+    eu, ev, ew = c.eu, c.ev, c.ew
+    padre = list(range(n))
+    tam = [1] * n
+    raiz = _raiz if stats is None else stats.raiz
+
+    objetivo = c.tamano_bosque()
+    contar = stats is not None
+    examinadas = verificaciones = uniones = 0
+    with _fase(stats, "orden"):
+        orden = c.orden_inverso()
+    conservar = bytearray(len(orden))
+    nconservadas = 0
+    with _fase(stats, "bucle"):
+        for e in orden:
+            if nconservadas == objetivo:
+                break   # todo lo que queda se borraría
+
+            # ¿los extremos ya están conectados por las más ligeras?
+            # (equivale a "¿es puente al borrarla?")
+            if contar:
+                examinadas += 1
+                verificaciones += 1
+            ra, rb = raiz(padre, eu[e]), raiz(padre, ev[e])
+            if ra == rb:
+                continue
+            _unir(padre, tam, ra, rb)
+            if contar:
+                uniones += 1
+            conservar[e] = 1
+            nconservadas += 1
+    if contar:
+        stats.aristas_examinadas += examinadas
+        stats.verificaciones_conectividad += verificaciones
+        stats.uniones += uniones
+
+    sel = [e for e in range(len(conservar)) if conservar[e]]
+    total = 0.0
+    for e in sel:
+        total += ew[e]
+    return sel, total
+
+
+# ------------------ Borůvka ------------------
+#
+# Cada ronda elige, para cada componente, su arista de salida más barata y
+# contrae. Las aristas se comparan por su posición en el orden estable por
+# peso (clave única), así que no se forman ciclos y el árbol es el mismo
+# que el de KruskalD. Las aristas elegidas se devuelven en ese orden.
+
+def boruvka(c: GrafoCompacto):
+    """Borůvka en Python puro (listas + DSU); referencia sin NumPy."""
+    n, m = c.numero_nodos(), c.numero_aristas()
+    eu, ev, ew = c.eu, c.ev, c.ew
+    orden = c.orden_por_peso()
+    su = [eu[e] for e in orden]
+    sv = [ev[e] for e in orden]
+
+    padre = list(range(n))
+    tam = [1] * n
+    vivas = list(range(m))
+    elegidas = []
+
+    while vivas:
+        mejor = {}
+        siguen = []
+        for k in vivas:
+            a, b = _raiz(padre, su[k]), _raiz(padre, sv[k])
+            if a == b:
+                continue
+            siguen.append(k)
+            if mejor.get(a, m) > k:
+                mejor[a] = k
+            if mejor.get(b, m) > k:
+                mejor[b] = k
+        vivas = siguen
+
+        for k in set(mejor.values()):
+            a, b = _raiz(padre, su[k]), _raiz(padre, sv[k])
+            if a != b:
+                _unir(padre, tam, a, b)
+                elegidas.append(k)
+
+    elegidas.sort()
+    sel = [orden[k] for k in elegidas]
+    total = 0.0
+    for e in sel:
+        total += ew[e]
+    return sel, total
+
+
+# Memoria compartida de los procesos trabajadores de boruvka_numpy
+_BORUVKA_SHM = {}
+
+
+def _boruvka_inicializar(nombre_u: str, nombre_v: str, m: int):
+    from multiprocessing import shared_memory
+    shm_u = shared_memory.SharedMemory(name=nombre_u)
+    shm_v = shared_memory.SharedMemory(name=nombre_v)
+    _BORUVKA_SHM["shm"] = (shm_u, shm_v)
+    _BORUVKA_SHM["su"] = np.ndarray(m, dtype=np.intc, buffer=shm_u.buf)
+    _BORUVKA_SHM["sv"] = np.ndarray(m, dtype=np.intc, buffer=shm_v.buf)
+
+
+def _mejor_por_componente(comp, su, sv, k0: int, n: int, m: int):
+    # clave mínima de arista de salida por componente en su[k0:], sv[k0:]
+    cu = comp[su]
+    cv = comp[sv]
+    viva = cu != cv
+    k = np.flatnonzero(viva) + k0
+    mejor = np.full(n, m, dtype=np.int64)
+    np.minimum.at(mejor, cu[viva], k)
+    np.minimum.at(mejor, cv[viva], k)
+    return mejor
+
+
+def _boruvka_bloque(comp, a: int, b: int, n: int, m: int):
+    su = _BORUVKA_SHM["su"][a:b]
+    sv = _BORUVKA_SHM["sv"][a:b]
+    return _mejor_por_componente(comp, su, sv, a, n, m)
+
+
+def boruvka_numpy(c: GrafoCompacto, procesos: int = 1):
+    """
+    Borůvka vectorizado: cada ronda es un mínimo por componente sobre los
+    arreglos de aristas (np.minimum.at) y una contracción por salto de
+    punteros, en O(log n) rondas.
+
+    Con procesos > 1 la búsqueda de la arista mínima se reparte por bloques
+    de aristas entre procesos que leen los extremos desde memoria compartida;
+    en cada ronda sólo viajan las etiquetas de componente y los mínimos.
+    """
+    if np is None:
+        raise ImportError("El modo numpy de Borůvka requiere NumPy")
+
+    n, m = c.numero_nodos(), c.numero_aristas()
+    if n == 0 or m == 0:
+        return [], 0.0
+
+    orden = np.frombuffer(c.orden_por_peso(), dtype=np.intc)
+    su = np.frombuffer(c.eu, dtype=np.intc)[orden]
+    sv = np.frombuffer(c.ev, dtype=np.intc)[orden]
+
+    comp = np.arange(n, dtype=np.int64)
+    elegidas = []
+
+    ex = None
+    shms = ()
+    if procesos > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import shared_memory
+        shms = tuple(shared_memory.SharedMemory(create=True, size=max(1, a.nbytes)) for a in (su, sv))
+        np.ndarray(m, dtype=np.intc, buffer=shms[0].buf)[:] = su
+        np.ndarray(m, dtype=np.intc, buffer=shms[1].buf)[:] = sv
+        ex = ProcessPoolExecutor(max_workers=procesos, initializer=_boruvka_inicializar,
+                                 initargs=(shms[0].name, shms[1].name, m))
+        cortes = [m * i // procesos for i in range(procesos + 1)]
+
+    try:
+        while True:
+            if ex is None:
+                mejor = _mejor_por_componente(comp, su, sv, 0, n, m)
+            else:
+                parciales = [ex.submit(_boruvka_bloque, comp, cortes[i], cortes[i + 1], n, m)
+                             for i in range(procesos)]
+                mejor = parciales[0].result()
+                for f in parciales[1:]:
+                    np.minimum(mejor, f.result(), out=mejor)
+
+            # componentes (sólo representantes) con arista de salida
+            comps = np.flatnonzero((mejor < m) & (comp == np.arange(n)))
+            if len(comps) == 0:
+                break
+            k = mejor[comps]
+            a, b = comp[su[k]], comp[sv[k]]
+            otro = np.where(a == comps, b, a)
+
+            # cada componente apunta a la del otro extremo; los pares que se
+            # eligen mutuamente (misma arista) se rompen quedándose el menor
+            padre = np.arange(n, dtype=np.int64)
+            padre[comps] = otro
+            mutuo = (padre[otro] == comps) & (comps < otro)
+            padre[comps[mutuo]] = comps[mutuo]
+            while True:
+                pp = padre[padre]
+                if np.array_equal(pp, padre):
+                    break
+                padre = pp
+            comp = padre[comp]
+            elegidas.append(np.unique(k))
+    finally:
+        if ex is not None:
+            ex.shutdown()
+        for shm in shms:
+            shm.close()
+            shm.unlink()
+
+    if not elegidas:
+        return [], 0.0
+    claves = np.sort(np.concatenate(elegidas))
+    sel = orden[claves].tolist()
+    total = 0.0
+    for e in sel:
+        total += c.ew[e]
+    return sel, total
+
+
+# ------------------ Prim ------------------
+#
+# Todas las variantes empiezan en s y, si se quedan sin candidatos con
+# nodos por visitar, se reinician desde el primero de ellos (orden de
+# nodos), así en un grafo no conexo se obtiene el bosque completo.
+# El candidato de cada nodo v se compara por (w, rango[u], rango[v]),
+# el mismo desempate que la versión original con (w, u, v) en el heap,
+# por lo que las tres devuelven el mismo árbol.
+
+# densidad 2m / (n(n-1)) a partir de la cual "auto" usa la variante densa
+DENSIDAD_PRIM_DENSO = 0.05
+
+
+MODOS_PRIM = ("auto", "indexado", "denso", "perezoso")
+
+
+def prim(c: GrafoCompacto, s: int, modo: str = "auto", stats=None):
+    """
+    modo:
+      - "indexado": heap d-ario indexado con decrease-key (<= n entradas)
+      - "denso":    arreglo de distancias en NumPy, O(n²) vectorizado
+      - "perezoso": heapq con entradas obsoletas (heap O(m))
+      - "auto":     denso si hay NumPy y el grafo es casi completo;
+                    indexado en otro caso (siempre indexado con `stats`)
+
+    Con `stats` sólo "indexado" y "perezoso" (los que tienen contadores).
+    """
+    if modo not in MODOS_PRIM:
+        raise ValueError(f"Modo de Prim desconocido: {modo}")
+    if stats is not None and modo == "denso":
+        raise ValueError("El modo denso de Prim no tiene contadores; use 'indexado' o 'perezoso'")
+    if modo == "auto":
+        n, m = c.numero_nodos(), c.numero_aristas()
+        denso = n > 1 and 2 * m >= DENSIDAD_PRIM_DENSO * n * (n - 1)
+        modo = "denso" if (stats is None and np is not None and denso) else "indexado"
+
+    if modo == "indexado":
+        return prim_indexado(c, s, stats=stats)
+    if modo == "denso":
+        return prim_denso(c, s)
+    return prim_perezoso(c, s, stats=stats)
+
+
+class HeapIndexado:
+    """
+    Heap d-ario de nodos 0..n-1 con decrease-key. Cada nodo aparece a lo más
+    una vez; `clave[v]` es cualquier valor comparable (aquí una tupla).
+    `decrementos` cuenta los decrease-key efectivos.
+    """
+
+    __slots__ = ("d", "heap", "pos", "clave", "decrementos")
+
+    def __init__(self, n: int, d: int = 4):
+        self.d = d
+        self.heap = []
+        self.pos = array("i", [-1]) * n
+        self.clave = [None] * n
+        self.decrementos = 0
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __contains__(self, v) -> bool:
+        return self.pos[v] >= 0
+
+    def empujar_o_decrementar(self, v: int, clave) -> bool:
+        """Inserta v o baja su clave; False si la clave actual ya es menor o igual."""
+        i = self.pos[v]
+        if i < 0:
+            self.heap.append(v)
+            i = len(self.heap) - 1
+        elif not clave < self.clave[v]:
+            return False
+        else:
+            self.decrementos += 1
+        self.clave[v] = clave
+        self._subir(i, v)
+        return True
+
+    def extraer_min(self):
+        heap, pos, clave = self.heap, self.pos, self.clave
+        v = heap[0]
+        ultimo = heap.pop()
+        pos[v] = -1
+        if heap:
+            self._bajar(0, ultimo)
+        return v, clave[v]
+
+    def _subir(self, i: int, v: int):
+        heap, pos, clave, d = self.heap, self.pos, self.clave, self.d
+        cv = clave[v]
+        while i > 0:
+            p = (i - 1) // d
+            u = heap[p]
+            if not cv < clave[u]:
+                break
+            heap[i] = u
+            pos[u] = i
+            i = p
+        heap[i] = v
+        pos[v] = i
+
+    def _bajar(self, i: int, v: int):
+        heap, pos, clave, d = self.heap, self.pos, self.clave, self.d
+        n = len(heap)
+        cv = clave[v]
+        while True:
+            h = d * i + 1
+            if h >= n:
+                break
+            mejor = h
+            cm = clave[heap[h]]
+            for j in range(h + 1, min(h + d, n)):
+                cj = clave[heap[j]]
+                if cj < cm:
+                    mejor, cm = j, cj
+            if not cm < cv:
+                break
+            u = heap[mejor]
+            heap[i] = u
+            pos[u] = i
+            i = mejor
+        heap[i] = v
+        pos[v] = i
+
+
+def prim_indexado(c: GrafoCompacto, s: int, d: int = 4, stats=None):
+    n = c.numero_nodos()
+    inicio, ady_nodo, ady_peso, ady_arista = c.inicio, c.ady_nodo, c.ady_peso, c.ady_arista
+    rango = c.rango
+
+    visit = bytearray(n)
+    arista = array("i", [-1]) * n   # arista del mejor candidato de cada nodo
+    heap = HeapIndexado(n, d)
+    sel = []
+    total = 0.0
+    contar = stats is not None
+    examinadas = empujes = extracciones = 0
+
+    def visitar(u):
+        nonlocal examinadas, empujes
+        visit[u] = 1
+        ru = rango[u]
+        for k in range(inicio[u], inicio[u + 1]):
+            v = ady_nodo[k]
+            if contar:
+                examinadas += 1
+                if not visit[v] and v not in heap:
+                    empujes += 1
+            if not visit[v] and heap.empujar_o_decrementar(v, (ady_peso[k], ru, rango[v])):
+                arista[v] = ady_arista[k]
+
+    with _fase(stats, "bucle"):
+        visitar(s)
+        nvisit = 1
+        siguiente = 0
+
+        while nvisit < n:
+            if not heap:
+                while visit[siguiente]:
+                    siguiente += 1
+                visitar(siguiente)
+                nvisit += 1
+                continue
+            v, (w, _, _) = heap.extraer_min()
+            if contar:
+                extracciones += 1
+            sel.append(arista[v])
+            total += w
+            visitar(v)
+            nvisit += 1
+
+    if contar:
+        stats.aristas_examinadas += examinadas
+        stats.heap_push += empujes
+        stats.heap_pop += extracciones
+        stats.heap_decrementos += heap.decrementos
+    return sel, total
+
+
+def prim_denso(c: GrafoCompacto, s: int):
+    """
+    Prim O(n²) para grafos casi completos: la mejor distancia de cada nodo
+    vive en un arreglo de NumPy y cada paso es un mínimo vectorizado más la
+    relajación de la fila CSR del nodo recién visitado. Sin heap.
+    """
+    if np is None:
+        raise ImportError("El modo denso de Prim requiere NumPy")
+
+    n = c.numero_nodos()
+    sel = []
+    total = 0.0
+    if n == 0:
+        return sel, total
+
+    inicio = np.frombuffer(c.inicio, dtype=np.int64)
+    ady_nodo = np.frombuffer(c.ady_nodo, dtype=np.intc)
+    ady_peso = np.frombuffer(c.ady_peso, dtype=np.float64)
+    ady_arista = np.frombuffer(c.ady_arista, dtype=np.intc)
+    rango = np.frombuffer(c.rango, dtype=np.intc)
+
+    inf = np.inf
+    dist = np.full(n, inf)                       # peso del mejor candidato
+    dist_u = np.full(n, n, dtype=np.int64)       # rango de su extremo visitado
+    arista = np.full(n, -1, dtype=np.int64)
+    visit = np.zeros(n, dtype=bool)
+
+    def visitar(u):
+        visit[u] = True
+        dist[u] = inf
+        a, b = inicio[u], inicio[u + 1]
+        vec = ady_nodo[a:b]
+        w = ady_peso[a:b]
+        ru = rango[u]
+        mejora = ~visit[vec] & ((w < dist[vec]) | ((w == dist[vec]) & (ru < dist_u[vec])))
+        vec = vec[mejora]
+        dist[vec] = w[mejora]
+        dist_u[vec] = ru
+        arista[vec] = ady_arista[a:b][mejora]
+
+    visitar(s)
+    for _ in range(n - 1):
+        mn = dist.min()
+        if mn == inf:
+            visitar(int(np.flatnonzero(~visit)[0]))
+            continue
+        empatados = np.flatnonzero(dist == mn)
+        if len(empatados) > 1:
+            # desempate por (rango[u], rango[v]) como en el heap
+            empatados = empatados[dist_u[empatados] == dist_u[empatados].min()]
+            v = int(empatados[np.argmin(rango[empatados])])
+        else:
+            v = int(empatados[0])
+        sel.append(int(arista[v]))
+        total += float(mn)
+        visitar(v)
+
+    return sel, total
+
+
+def prim_perezoso(c: GrafoCompacto, s: int, stats=None):
+    """
+    Prim con heapq y borrado perezoso: se empuja una entrada por arista
+    incidente y las obsoletas se descartan al sacarlas (heap O(m)).
+    """
+    n = c.numero_nodos()
+    inicio, ady_nodo, ady_peso, ady_arista = c.inicio, c.ady_nodo, c.ady_peso, c.ady_arista
+    rango = c.rango
+    por_rango = array("i", bytes(4 * n))
+    for i in range(n):
+        por_rango[rango[i]] = i
+
+    visit = bytearray(n)
+    visit[s] = 1
+    nvisit = 1
+    heap = []
+    sel = []
+    total = 0.0
+    contar = stats is not None
+    examinadas = empujes = extracciones = obsoletos = 0
+
+    def push(u):
+        nonlocal examinadas, empujes
+        ru = rango[u]
+        for k in range(inicio[u], inicio[u + 1]):
+            v = ady_nodo[k]
+            if contar:
+                examinadas += 1
+            if not visit[v]:
+                # (w, id_u, id_v) en rango: mismo desempate que con los ids
+                heapq.heappush(heap, (ady_peso[k], ru, rango[v], ady_arista[k]))
+                if contar:
+                    empujes += 1
+
+    with _fase(stats, "bucle"):
+        push(s)
+        siguiente = 0   # candidato a raíz para reiniciar
+
+        while nvisit < n:
+            if not heap:
+                while visit[siguiente]:
+                    siguiente += 1
+                visit[siguiente] = 1
+                nvisit += 1
+                push(siguiente)
+                continue
+            w, _, rv, e = heapq.heappop(heap)
+            v = por_rango[rv]
+            if contar:
+                extracciones += 1
+            if visit[v]:
+                if contar:
+                    obsoletos += 1
+                continue
+            visit[v] = 1
+            nvisit += 1
+            sel.append(e)
+            total += w
+            push(v)
+
+    if contar:
+        stats.aristas_examinadas += examinadas
+        stats.heap_push += empujes
+        stats.heap_pop += extracciones
+        stats.heap_obsoletos += obsoletos
+    return sel, total
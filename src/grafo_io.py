@@ -0,0 +1,409 @@
+from __future__ import annotations
+from array import array
+from pathlib import Path
+import ast
+import gzip
+import io
+import mmap
+import struct
+import sys
+
+from grafo_compacto import GrafoCompacto
+
+
+# ============================================================
+# Escritura DOT (Graphviz) en streaming
+# ============================================================
+
+# líneas acumuladas antes de cada write() al archivo
+LINEAS_POR_BLOQUE = 4096
+
+
+def _abrir_escritura(destino, comprimir, tam_buffer: int):
+    """
+    Devuelve (archivo de texto, cerrar, desacoplar).
+
+    - Ruta: mismo modo que Path.write_text (texto utf-8, saltos de línea
+      de la plataforma) para que la salida sea idéntica a la anterior.
+    - Ruta *.gz o comprimir=True: gzip con saltos "\\n".
+    - Manejador binario abierto: se escribe utf-8 con "\\n" y no se cierra.
+    """
+    if isinstance(destino, (str, Path)):
+        destino = Path(destino)
+        if comprimir is None:
+            comprimir = destino.suffix == ".gz"
+        if comprimir:
+            crudo = gzip.open(destino, "wb")
+            buf = io.BufferedWriter(crudo, buffer_size=tam_buffer)
+            return io.TextIOWrapper(buf, encoding="utf-8", newline="\n"), True, False
+        return open(destino, "w", encoding="utf-8", buffering=tam_buffer), True, False
+
+    crudo = destino
+    if comprimir:
+        crudo = gzip.GzipFile(fileobj=destino, mode="wb")
+    return io.TextIOWrapper(crudo, encoding="utf-8", newline="\n", write_through=True), False, not comprimir
+
+
+def escribir_graphviz_ponderado(g, destino, comprimir=None, tam_buffer: int = 1 << 20):
+    """
+    Escribe el grafo ponderado `g` en DOT directamente desde sus nodos y
+    aristas, por bloques, sin construir la cadena completa ni la lista
+    de aristas en memoria. El formato es byte a byte el de siempre.
+    """
+    peso, key = g._peso, g._key
+    escribir_graphviz_tabla(
+        destino, g.dirigido,
+        ((n.id, n.x, n.y) for n in g.nodos()),
+        ((u, v, peso[key(u, v)]) for (u, v) in g._aristas_key),
+        comprimir=comprimir, tam_buffer=tam_buffer,
+    )
+
+
+def escribir_graphviz_compacto(c: GrafoCompacto, destino, comprimir=None, tam_buffer: int = 1 << 20):
+    """
+    DOT de la vista compacta completa. Nodos y aristas de `c` guardan el
+    orden del grafo del que salió (GrafoCompacto.desde_grafo), así que el
+    archivo es el mismo que escribiría ese GrafoMST, sin necesitarlo.
+    """
+    ids, eu, ev, ew = c.ids, c.eu, c.ev, c.ew
+    escribir_graphviz_tabla(
+        destino, c.dirigido,
+        ((nid,) + c.coordenadas(i) for i, nid in enumerate(ids)),
+        ((ids[a], ids[b], w) for a, b, w in zip(eu, ev, ew)),
+        comprimir=comprimir, tam_buffer=tam_buffer,
+    )
+
+
+def escribir_graphviz_tabla(destino, dirigido: bool, nodos, aristas, comprimir=None,
+                            tam_buffer: int = 1 << 20):
+    """
+    Mismo DOT que escribir_graphviz_ponderado a partir de tablas: `nodos`
+    genera (id, x, y) (None sin coordenadas) y `aristas` genera (u, v, w),
+    en el orden en que se escriben. No requiere un objeto grafo.
+    """
+    sep = "->" if dirigido else "--"
+    header = "digraph G {" if dirigido else "graph G {"
+
+    f, cerrar, desacoplar = _abrir_escritura(destino, comprimir, tam_buffer)
+    try:
+        bloque = [header]
+
+        for nid, x, y in nodos:
+            if x is not None and y is not None:
+                bloque.append(f'"{nid}" [pos="{x},{y}!"];')
+            else:
+                bloque.append(f'"{nid}";')
+            if len(bloque) >= LINEAS_POR_BLOQUE:
+                f.write("\n".join(bloque))
+                f.write("\n")
+                bloque.clear()
+
+        for u, v, w in aristas:
+            wlab = int(w) if abs(w - int(w)) < 1e-9 else w
+            bloque.append(f'"{u}" {sep} "{v}" [label="{wlab}"];')
+            if len(bloque) >= LINEAS_POR_BLOQUE:
+                f.write("\n".join(bloque))
+                f.write("\n")
+                bloque.clear()
+
+        bloque.append("}")
+        f.write("\n".join(bloque))
+        f.flush()
+    finally:
+        if cerrar:
+            f.close()
+        elif desacoplar:
+            f.detach()
+        else:
+            # gzip sobre un manejador ajeno: cerrar el GzipFile escribe el
+            # final del flujo sin cerrar el manejador subyacente
+            f.detach().close()
+
+
+# ============================================================
+# Lectura DOT (el dialecto que escribe to_graphviz_ponderado)
+# ============================================================
+
+def id_natural(texto: str):
+    """
+    Recupera el tipo original de un id escrito con str(): enteros ("17")
+    y tuplas ("(0, 3)", p. ej. grafoMalla) vuelven a su tipo; lo demás
+    queda como cadena. Así Prim desempata igual que con el grafo original.
+    """
+    t = texto[1:] if texto[:1] == "-" else texto
+    if t.isdigit():
+        return int(texto)
+    if texto[:1] == "(" and texto[-1:] == ")":
+        try:
+            return ast.literal_eval(texto)
+        except (ValueError, SyntaxError):
+            pass
+    return texto
+
+
+def _abrir_lectura(origen):
+    if isinstance(origen, (str, Path)):
+        origen = Path(origen)
+        if origen.suffix == ".gz":
+            return gzip.open(origen, "rt", encoding="utf-8"), True
+        return open(origen, "r", encoding="utf-8", buffering=1 << 20), True
+    return io.TextIOWrapper(origen, encoding="utf-8"), False
+
+
+def leer_graphviz_compacto(origen, convertir_id=id_natural) -> GrafoCompacto:
+    """
+    Lee un .gv (ruta, *.gv.gz o manejador binario) en una sola pasada y
+    construye directamente la vista compacta, sin objetos por nodo/arista.
+
+    Sólo entiende las formas que produce escribir_graphviz_ponderado:
+        "id";
+        "id" [pos="x,y!"];
+        "u" -- "v" [label="w"];     (o -> en digrafos)
+    Se analiza con operaciones de cadena, sin expresiones regulares.
+    """
+    f, cerrar = _abrir_lectura(origen)
+    try:
+        cabecera = f.readline().strip()
+        if cabecera == "graph G {":
+            dirigido = False
+        elif cabecera == "digraph G {":
+            dirigido = True
+        else:
+            raise ValueError(f"Cabecera DOT no soportada: {cabecera!r}")
+
+        ids = []
+        indice = {}   # texto del id -> índice
+        x = array("d")
+        y = array("d")
+        eu = array("i")
+        ev = array("i")
+        ew = array("d")
+        nan = float("nan")
+
+        def nodo(texto):
+            i = indice.get(texto)
+            if i is None:
+                i = indice[texto] = len(ids)
+                ids.append(convertir_id(texto))
+                x.append(nan)
+                y.append(nan)
+            return i
+
+        for num, linea in enumerate(f, start=2):
+            linea = linea.rstrip("\r\n")
+            if linea[:1] != '"':
+                if linea.strip() in ("}", ""):
+                    continue
+                raise ValueError(f"Línea {num} no soportada: {linea!r}")
+
+            fin = linea.index('"', 1)
+            a = linea[1:fin]
+            resto = linea[fin + 1:]
+
+            if resto == ";":
+                nodo(a)
+            elif resto[:7] == ' [pos="':
+                i = nodo(a)
+                px, _, py = resto[7:resto.index("!", 7)].partition(",")
+                x[i] = float(px)
+                y[i] = float(py)
+            elif resto[:5] in (' -- "', ' -> "'):
+                fin_b = resto.index('"', 5)
+                b = resto[5:fin_b]
+                k = fin_b + 10   # '" [label="'
+                if resto[fin_b:k] != '" [label="':
+                    k = resto.index('label="', fin_b) + 7
+                # los extremos casi siempre ya se declararon como nodos
+                i = indice.get(a)
+                eu.append(nodo(a) if i is None else i)
+                i = indice.get(b)
+                ev.append(nodo(b) if i is None else i)
+                ew.append(float(resto[k:resto.index('"', k)]))
+            else:
+                raise ValueError(f"Línea {num} no soportada: {linea!r}")
+    finally:
+        if cerrar:
+            f.close()
+        else:
+            f.detach()
+
+    return GrafoCompacto(dirigido, ids, x, y, eu, ev, ew)
+
+
+# ============================================================
+# Snapshot binario (.gms) con carga por mmap
+# ============================================================
+#
+# Cabecera (little-endian):
+#     magic "GMST", versión u16, banderas u16, tipo de ids u32, n u64, m u64
+#     y una tabla (offset u64, bytes u64) por sección, en el orden SECCIONES.
+# Cada sección empieza alineada a 8 bytes; una sección ausente tiene 0 bytes.
+#
+#     ids         según el tipo de ids (ver IDS_*)
+#     x, y        float64 por nodo (NaN = sin coordenada)
+#     eu, ev      int32 por arista
+#     ew          float64 por arista
+#     inicio, ady_nodo, ady_peso, ady_arista, rango
+#                 opcionales: la vista CSR ya construida
+
+MAGIC = b"GMST"
+VERSION_SNAPSHOT = 1
+
+BANDERA_DIRIGIDO = 1
+BANDERA_COORDS = 2
+
+IDS_RANGO = 0    # ids = 0..n-1, no se guarda nada
+IDS_INT64 = 1    # int64 por nodo
+IDS_TEXTO = 2    # cadenas utf-8 separadas por "\n"
+IDS_REPR = 3     # repr() de cada id separado por "\n" (tuplas, mixtos)
+
+SECCIONES = (
+    ("ids", "B"), ("x", "d"), ("y", "d"),
+    ("eu", "i"), ("ev", "i"), ("ew", "d"),
+    ("inicio", "q"), ("ady_nodo", "i"), ("ady_peso", "d"), ("ady_arista", "i"),
+    ("rango", "i"),
+)
+
+_CABECERA = struct.Struct("<4sHHIQQ")
+_ENTRADA = struct.Struct("<QQ")
+_TAM_CABECERA = _CABECERA.size + _ENTRADA.size * len(SECCIONES)
+
+
+def _codificar_ids(ids):
+    if all(type(i) is int for i in ids):
+        if all(i == k for k, i in enumerate(ids)):
+            return IDS_RANGO, b""
+        if all(-(1 << 63) <= i < (1 << 63) for i in ids):
+            a = array("q", ids)
+            if sys.byteorder != "little":
+                a.byteswap()
+            return IDS_INT64, a.tobytes()
+    if all(type(i) is str and "\n" not in i for i in ids):
+        return IDS_TEXTO, "\n".join(ids).encode("utf-8")
+    return IDS_REPR, "\n".join(repr(i) for i in ids).encode("utf-8")
+
+
+def _decodificar_ids(tipo: int, datos, n: int):
+    if tipo == IDS_RANGO:
+        return list(range(n))
+    if tipo == IDS_INT64:
+        a = array("q", bytes(datos))
+        if sys.byteorder != "little":
+            a.byteswap()
+        return a.tolist()
+    texto = bytes(datos).decode("utf-8")
+    partes = texto.split("\n") if n else []
+    if tipo == IDS_TEXTO:
+        return partes
+    return [ast.literal_eval(p) for p in partes]
+
+
+def _bytes_le(datos, tipo: str):
+    # las secciones numéricas se guardan little-endian
+    if tipo == "B" or sys.byteorder == "little":
+        return memoryview(datos).cast("B")
+    a = array(tipo, datos)
+    a.byteswap()
+    return memoryview(a).cast("B")
+
+
+def guardar_snapshot(c: GrafoCompacto, destino, adyacencia: bool = False):
+    """
+    Escribe la vista compacta `c` como snapshot binario. Con adyacencia=True
+    también se guarda la CSR (archivo ~3x mayor, pero abrirlo no cuesta nada).
+    """
+    n, m = c.numero_nodos(), c.numero_aristas()
+    tipo_ids, ids = _codificar_ids(c.ids)
+
+    tiene_coords = any(v == v for v in c.x) or any(v == v for v in c.y)
+    datos = {
+        "ids": ids,
+        "x": c.x if tiene_coords else b"",
+        "y": c.y if tiene_coords else b"",
+        "eu": c.eu, "ev": c.ev, "ew": c.ew,
+    }
+    if adyacencia:
+        datos.update(inicio=c.inicio, ady_nodo=c.ady_nodo, ady_peso=c.ady_peso,
+                     ady_arista=c.ady_arista, rango=c.rango)
+
+    banderas = (BANDERA_DIRIGIDO if c.dirigido else 0) | (BANDERA_COORDS if tiene_coords else 0)
+
+    tabla = []
+    cuerpo = []
+    pos = _TAM_CABECERA
+    for nombre, tipo in SECCIONES:
+        if nombre not in datos or len(datos[nombre]) == 0:
+            tabla.append((0, 0))
+            continue
+        relleno = (-pos) % 8
+        bloque = _bytes_le(datos[nombre], tipo)
+        cuerpo.append(b"\0" * relleno)
+        cuerpo.append(bloque)
+        pos += relleno
+        tabla.append((pos, bloque.nbytes))
+        pos += bloque.nbytes
+
+    with open(destino, "wb") as f:
+        f.write(_CABECERA.pack(MAGIC, VERSION_SNAPSHOT, banderas, tipo_ids, n, m))
+        for off, tam in tabla:
+            f.write(_ENTRADA.pack(off, tam))
+        for bloque in cuerpo:
+            f.write(bloque)
+
+
+def cargar_snapshot(origen) -> GrafoCompacto:
+    """
+    Abre un snapshot con mmap. Los arreglos de aristas (y la CSR, si se
+    guardó) son vistas directas sobre el archivo: no se copian ni se
+    analizan, y varios procesos que abren el mismo archivo comparten las
+    páginas en caché del sistema operativo.
+    """
+    with open(origen, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    buf = memoryview(mm)
+    magic, version, banderas, tipo_ids, n, m = _CABECERA.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{origen}: no es un snapshot de grafo")
+    if version != VERSION_SNAPSHOT:
+        raise ValueError(f"{origen}: versión de snapshot no soportada ({version})")
+
+    secciones = {}
+    for k, (nombre, tipo) in enumerate(SECCIONES):
+        off, tam = _ENTRADA.unpack_from(buf, _CABECERA.size + k * _ENTRADA.size)
+        if tam == 0:
+            secciones[nombre] = None
+            continue
+        vista = buf[off:off + tam]
+        if tipo != "B":
+            if sys.byteorder == "little":
+                vista = vista.cast(tipo)
+            else:
+                a = array(tipo, bytes(vista))
+                a.byteswap()
+                vista = a
+        secciones[nombre] = vista
+
+    ids = _decodificar_ids(tipo_ids, secciones["ids"], n)
+    if banderas & BANDERA_COORDS:
+        x, y = secciones["x"], secciones["y"]
+    else:
+        x = array("d", [float("nan")]) * n
+        y = array("d", [float("nan")]) * n
+
+    vacio = {"i": array("i"), "d": array("d")}
+    eu = secciones["eu"] if m else vacio["i"]
+    ev = secciones["ev"] if m else vacio["i"]
+    ew = secciones["ew"] if m else vacio["d"]
+
+    ady = None
+    if secciones["inicio"] is not None:
+        ady = (
+            secciones["inicio"],
+            secciones["ady_nodo"] or vacio["i"],
+            secciones["ady_peso"] or vacio["d"],
+            secciones["ady_arista"] or vacio["i"],
+        )
+
+    return GrafoCompacto(bool(banderas & BANDERA_DIRIGIDO), ids, x, y, eu, ev, ew,
+                         adyacencia=ady, rango=secciones["rango"])
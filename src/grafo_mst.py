@@ -1,5 +1,6 @@
 from __future__ import annotations
 import sys
+from array import array
 from pathlib import Path
 import heapq
 
@@ -12,6 +13,16 @@ P1_SRC = ROOT / "lib" / "Biblioteca-grafos" / "src"
 sys.path.insert(0, str(P1_SRC))
 
 from grafo import Grafo
+from grafo_io import (
+    escribir_graphviz_ponderado, escribir_graphviz_tabla, leer_graphviz_compacto,
+    guardar_snapshot, cargar_snapshot,
+)
+from grafo_compacto import (
+    GrafoCompacto, _raiz, _unir,
+    kruskal_directo, kruskal_directo_numpy, kruskal_enteros, kruskal_geometrico, kruskal_inverso, prim,
+    boruvka, boruvka_numpy, np,
+)
+from cache_mst import cache_por_omision
 
 
 # ============================================================
@@ -19,26 +30,197 @@ from grafo import Grafo
 # ============================================================
 
 class DSU:
-    def __init__(self, items):
-        self.parent = {x: x for x in items}
-        self.rank = {x: 0 for x in items}
+    """
+    Union-find iterativo sobre enteros densos.
+
+    `items` puede ser un iterable de ids (se numeran 0..n-1 en orden de
+    aparición) o un entero n, y entonces los elementos son 0..n-1 sin
+    diccionario de por medio. padre y tam son listas planas de enteros
+    sobre las que trabajan los mismos _raiz/_unir (path halving iterativo,
+    unión por tamaño) que los núcleos de grafo_compacto. find devuelve el
+    id del representante.
+    """
+
+    __slots__ = ("ids", "indice", "padre", "tam", "_componentes")
+
+    def __init__(self, items=0):
+        if isinstance(items, int):
+            self.ids = None
+            self.indice = None
+            n = items
+        else:
+            self.ids = list(items)
+            self.indice = {x: i for i, x in enumerate(self.ids)}
+            n = len(self.ids)
+        self.padre = list(range(n))
+        self.tam = [1] * n
+        self._componentes = n
+
+    def __len__(self) -> int:
+        return len(self.padre)
+
+    def agregar(self, x) -> bool:
+        """Agrega un elemento nuevo como conjunto propio; False si ya existe."""
+        if self.indice is None:
+            raise TypeError("Un DSU denso (creado con n) no admite ids nuevos")
+        if x in self.indice:
+            return False
+        self.indice[x] = len(self.ids)
+        self.ids.append(x)
+        self.padre.append(len(self.padre))
+        self.tam.append(1)
+        self._componentes += 1
+        return True
+
+    def _posicion(self, x) -> int:
+        return x if self.indice is None else self.indice[x]
 
     def find(self, x):
-        if self.parent[x] != x:
-            self.parent[x] = self.find(self.parent[x])
-        return self.parent[x]
+        r = _raiz(self.padre, self._posicion(x))
+        return r if self.ids is None else self.ids[r]
 
     def union(self, a, b) -> bool:
-        ra, rb = self.find(a), self.find(b)
+        ra = _raiz(self.padre, self._posicion(a))
+        rb = _raiz(self.padre, self._posicion(b))
         if ra == rb:
             return False
-        if self.rank[ra] < self.rank[rb]:
-            ra, rb = rb, ra
-        self.parent[rb] = ra
-        if self.rank[ra] == self.rank[rb]:
-            self.rank[ra] += 1
+        _unir(self.padre, self.tam, ra, rb)
+        self._componentes -= 1
         return True
 
+    def find_many(self, xs) -> list:
+        """Representante de cada elemento de `xs`."""
+        padre, indice, ids = self.padre, self.indice, self.ids
+        if indice is None:
+            return [_raiz(padre, x) for x in xs]
+        return [ids[_raiz(padre, indice[x])] for x in xs]
+
+    def union_many(self, pares) -> int:
+        """Une cada par (a, b) de `pares`; devuelve cuántas uniones hubo."""
+        padre, tam, indice = self.padre, self.tam, self.indice
+        unidas = 0
+        for a, b in pares:
+            if indice is not None:
+                a, b = indice[a], indice[b]
+            ra, rb = _raiz(padre, a), _raiz(padre, b)
+            if ra != rb:
+                _unir(padre, tam, ra, rb)
+                unidas += 1
+        self._componentes -= unidas
+        return unidas
+
+    def conectados(self, a, b) -> bool:
+        return _raiz(self.padre, self._posicion(a)) == _raiz(self.padre, self._posicion(b))
+
+    def tamano(self, x) -> int:
+        """Tamaño del conjunto que contiene a x."""
+        return self.tam[_raiz(self.padre, self._posicion(x))]
+
+    def numero_componentes(self) -> int:
+        return self._componentes
+
+
+# ============================================================
+# Bosque de expansión mínima (resultado por componente)
+# ============================================================
+
+class BosqueMST:
+    """
+    Resultado de GrafoMST.bosque_expansion_minima.
+
+        arboles     un GrafoMST por componente conexa
+        totales     peso total de cada árbol
+        componente  id de nodo -> índice de su componente
+        total       suma de todos los árboles
+    """
+
+    __slots__ = ("arboles", "totales", "componente", "total")
+
+    def __init__(self, arboles, totales, componente):
+        self.arboles = arboles
+        self.totales = totales
+        self.componente = componente
+        self.total = sum(totales)
+
+    def numero_componentes(self) -> int:
+        return len(self.arboles)
+
+    def es_conexo(self) -> bool:
+        return len(self.arboles) <= 1
+
+
+# ============================================================
+# Resultado ligero (arreglos de aristas + total)
+# ============================================================
+
+class ArbolMST:
+    """
+    Árbol (o bosque) mínimo sin GrafoMST: los métodos de MST lo devuelven
+    con ligero=True, para quien sólo necesita las aristas y el total.
+
+        vista   GrafoCompacto del grafo original (ids y coordenadas)
+        eu, ev  índices densos de los extremos de cada arista (array "i")
+        ew      pesos (array "d")
+        total   peso total
+
+    Las aristas quedan en el orden en que el algoritmo las aceptó.
+    to_graphviz_ponderado escribe el mismo .gv que el GrafoMST equivalente
+    y grafo() lo materializa sólo si hace falta.
+    """
+
+    __slots__ = ("vista", "eu", "ev", "ew", "total")
+
+    def __init__(self, c: GrafoCompacto, sel, total):
+        self.vista = c
+        eu, ev, ew = c.eu, c.ev, c.ew
+        self.eu = array("i", [eu[e] for e in sel])
+        self.ev = array("i", [ev[e] for e in sel])
+        self.ew = array("d", [ew[e] for e in sel])
+        self.total = total
+
+    def __len__(self) -> int:
+        return len(self.eu)
+
+    def numero_aristas(self) -> int:
+        return len(self.eu)
+
+    def numero_nodos(self) -> int:
+        return self.vista.numero_nodos()
+
+    def _nodos(self):
+        c = self.vista
+        for nid, x, y in zip(c.ids, c.x, c.y):
+            yield nid, (None if x != x else x), (None if y != y else y)
+
+    def aristas_con_peso(self):
+        ids = self.vista.ids
+        return [(ids[a], ids[b], w) for a, b, w in zip(self.eu, self.ev, self.ew)]
+
+    def grafo(self) -> "GrafoMST":
+        """GrafoMST con todos los nodos del grafo original y estas aristas."""
+        return GrafoMST.desde_tabla(self._nodos(), self.aristas_con_peso(), self.vista.dirigido)
+
+    def to_graphviz_ponderado(self, path, comprimir=None):
+        """Mismo DOT que self.grafo().to_graphviz_ponderado(...), sin construirlo."""
+        # las aristas se recorren como las recorrería el GrafoMST: un
+        # conjunto de claves llenado en el mismo orden de inserción
+        ids = self.vista.ids
+        claves = set()
+        agregar = claves.add
+        peso = {}
+        for a, b, w in zip(self.eu, self.ev, self.ew):
+            k = (ids[a], ids[b])
+            agregar(k)
+            peso[k] = w
+        escribir_graphviz_tabla(
+            path, self.vista.dirigido, self._nodos(),
+            ((u, v, peso[(u, v)]) for (u, v) in claves),
+            comprimir=comprimir,
+        )
+
+    def __repr__(self):
+        return f"ArbolMST(nodos={self.numero_nodos()}, aristas={len(self)}, total={self.total})"
+
 
 # ============================================================
 # GrafoMST (extiende Grafo del Proyecto 1)
@@ -53,6 +235,8 @@ class GrafoMST(Grafo):
     def __init__(self, dirigido: bool = False):
         super().__init__(dirigido=dirigido)
         self._peso = {}   # (u, v) -> w (normalizado)
+        self._version = 0         # cambia con cada arista agregada
+        self._compacto = None     # (sello, GrafoCompacto) de la última vista
 
     # ------------------ Pesos ------------------
 
@@ -65,6 +249,7 @@ class GrafoMST(Grafo):
         ok = super().add_arista(u, v)
         if ok:
             self._peso[self._key(u, v)] = float(w)
+            self._version += 1
         return ok
 
     def peso_arista(self, u, v) -> float:
@@ -73,141 +258,374 @@ class GrafoMST(Grafo):
     def aristas_con_peso(self):
         return [(u, v, self._peso[self._key(u, v)]) for (u, v) in self._aristas_key]
 
-    # ------------------ Exportación DOT ------------------
-
-    def to_graphviz_ponderado(self, path: str):
-        sep = "->" if self.dirigido else "--"
-        header = "digraph G {" if self.dirigido else "graph G {"
-        lines = [header]
+    # ------------------ Vista compacta ------------------
+
+    def _sello(self):
+        # el número de nodos y aristas detecta también cambios hechos con
+        # los métodos de Grafo (add_nodo, add_arista) que no pasan por aquí
+        return (self._version, self.numero_nodos(), self.numero_aristas())
+
+    def compacto(self) -> GrafoCompacto:
+        """
+        Vista CSR inmutable (índices enteros + arreglos planos).
+
+        Se construye la primera vez y se reutiliza mientras el grafo no
+        cambie, junto con lo que la vista calcula de forma perezosa (orden
+        de aristas por peso, componentes). Así varias llamadas a KruskalD,
+        KruskalI, Prim o Boruvka sobre el mismo grafo ordenan una sola vez.
+        """
+        sello = self._sello()
+        if self._compacto is None or self._compacto[0] != sello:
+            self._compacto = (sello, GrafoCompacto.desde_grafo(self))
+        return self._compacto[1]
+
+    def invalidar_compacto(self):
+        """Descarta la vista compacta en caché (p. ej. para medir en frío)."""
+        self._compacto = None
+
+    @classmethod
+    def desde_compacto(cls, c: GrafoCompacto, sel=None) -> "GrafoMST":
+        """
+        GrafoMST con todos los nodos de `c` y las aristas de índices `sel`
+        (todas si es None). Los ids sólo se materializan aquí, al final.
+        """
+        ids, eu, ev, ew = c.ids, c.eu, c.ev, c.ew
+        nodos = ((nid,) + c.coordenadas(i) for i, nid in enumerate(ids))
+        aristas = ((ids[eu[e]], ids[ev[e]], ew[e]) for e in (range(len(eu)) if sel is None else sel))
+        return cls.desde_tabla(nodos, aristas, c.dirigido)
+
+    @classmethod
+    def desde_tabla(cls, nodos, aristas, dirigido: bool = False) -> "GrafoMST":
+        """
+        Carga masiva de datos de confianza: `nodos` genera (id, x, y) y
+        `aristas` genera (u, v, w) sin repetidas, sin lazos y con extremos
+        en `nodos` (p. ej. las aristas de un MST tomadas de la vista
+        compacta). Cada arista entra a la adyacencia con Grafo.add_arista
+        y su peso directo al diccionario, sin pasar por add_arista_peso
+        ni convertir el peso; la vista compacta se invalida una sola vez.
+        El resultado es el mismo que agregarlas una por una.
+        """
+        g = cls(dirigido)
+        add_nodo = g.add_nodo
+        for nid, x, y in nodos:
+            add_nodo(nid, x=x, y=y)
+
+        add_arista = Grafo.add_arista
+        peso = g._peso
+        key = g._key
+        for u, v, w in aristas:
+            add_arista(g, u, v)
+            peso[key(u, v)] = w
+        g._version = 1
+        return g
+
+    @classmethod
+    def desde_base(cls, g_base, pesos) -> "GrafoMST":
+        """
+        Carga masiva: convierte un Grafo no dirigido recién generado en
+        GrafoMST con `pesos[i]` para la i-ésima arista de g_base._aristas_key,
+        sin pasar arista por arista por Grafo.add_arista.
+
+        Toma posesión de g_base (nodos y adyacencia se reutilizan, no se
+        copian): no debe usarse después. El resultado es el mismo que
+        agregar nodos y aristas uno por uno en ese orden, incluido el orden
+        en que se recorren las aristas.
+        """
+        if g_base.dirigido:
+            raise ValueError("desde_base requiere un grafo no dirigido")
+
+        claves = list(g_base._aristas_key)
+        if len(pesos) != len(claves):
+            raise ValueError(f"Se esperaban {len(claves)} pesos, hay {len(pesos)}")
+
+        g = cls.__new__(cls)
+        g.__dict__.update(g_base.__dict__)
+        # el conjunto de aristas se rehace en el orden de inserción que
+        # habría tenido con add_arista_peso, para recorrerse igual
+        if isinstance(g_base._aristas_key, set):
+            g._aristas_key = set()
+            agregar = g._aristas_key.add
+            for k in claves:
+                agregar(k)
+        key = g._key
+        g._peso = {key(u, v): float(w) for (u, v), w in zip(claves, pesos)}
+        g._version = 1
+        g._compacto = None
+        return g
+
+    @classmethod
+    def desde_graphviz(cls, origen) -> "GrafoMST":
+        """Lee un .gv escrito por to_graphviz_ponderado (ver grafo_io)."""
+        return cls.desde_compacto(leer_graphviz_compacto(origen))
+
+    # ------------------ Snapshot binario ------------------
+
+    def guardar_snapshot(self, path, adyacencia: bool = False):
+        """Snapshot binario (.gms) de la vista compacta (ver grafo_io)."""
+        guardar_snapshot(self.compacto(), path, adyacencia=adyacencia)
+
+    @classmethod
+    def desde_snapshot(cls, path) -> "GrafoMST":
+        return cls.desde_compacto(cargar_snapshot(path))
 
-        for n in self.nodos():
-            if n.x is not None and n.y is not None:
-                lines.append(f'"{n.id}" [pos="{n.x},{n.y}!"];')
-            else:
-                lines.append(f'"{n.id}";')
-
-        for u, v, w in self.aristas_con_peso():
-            wlab = int(w) if abs(w - int(w)) < 1e-9 else w
-            lines.append(f'"{u}" {sep} "{v}" [label="{wlab}"];')
+    # ------------------ Exportación DOT ------------------
 
-        lines.append("}")
-        Path(path).write_text("\n".join(lines), encoding="utf-8")
+    def to_graphviz_ponderado(self, path, comprimir=None):
+        """
+        Exporta a DOT con pesos como label. `path` puede ser una ruta o un
+        manejador binario abierto; con comprimir=True (o ruta *.gz) se
+        escribe gzip. La salida se genera en streaming (ver grafo_io).
+        """
+        escribir_graphviz_ponderado(self, path, comprimir=comprimir)
 
     # =====================================================
     # KRUSKAL DIRECTO
     # =====================================================
 
-    def KruskalD(self):
-        if self.dirigido:
-            raise ValueError("Kruskal requiere grafo no dirigido")
-
-        T = GrafoMST(False)
-        for n in self.nodos():
-            T.add_nodo(n.id, x=n.x, y=n.y)
-
-        dsu = DSU([n.id for n in self.nodos()])
-        total = 0.0
-
-        for u, v, w in sorted(self.aristas_con_peso(), key=lambda e: e[2]):
-            if dsu.union(u, v):
-                T.add_arista_peso(u, v, w)
-                total += w
-                if T.numero_aristas() == T.numero_nodos() - 1:
-                    break
-
+    # a partir de este número de aristas "auto" usa el modo numpy
+    UMBRAL_NUMPY = 20_000
+
+    MODOS_KRUSKAL_D = ("auto", "compacto", "numpy", "enteros", "geometrico")
+
+    # CacheMST que consulta mst_compacto (None = sin caché); por omisión el
+    # de $MST_CACHE_DIR si está definida
+    CACHE = cache_por_omision()
+
+    def _mst(self, metodo: str, stats=None, ligero: bool = False, **opciones):
+        # vista compacta -> índices de aristas -> GrafoMST (o ArbolMST con
+        # ligero=True); con `stats` (EstadisticasMST) se cuentan
+        # operaciones y se mide cada fase
+        if stats is None:
+            c = self.compacto()
+            sel, total = self.mst_compacto(c, metodo, **opciones)
+            if ligero:
+                return ArbolMST(c, sel, total), total
+            return self.desde_compacto(c, sel), total
+
+        with stats.fase("construccion"):
+            c = self.compacto()
+        sel, total = self.mst_compacto(c, metodo, stats=stats, **opciones)
+        with stats.fase("resultado"):
+            T = ArbolMST(c, sel, total) if ligero else self.desde_compacto(c, sel)
         return T, total
 
+    def KruskalD(self, modo: str = "auto", stats=None, ligero: bool = False):
+        """
+        modo:
+          - "compacto": DSU sobre listas de Python
+          - "numpy":    argsort único + DSU entero por bloques (requiere NumPy)
+          - "enteros":  pesos enteros; orden por cubetas/radix y total int exacto
+          - "geometrico": nodos con x, y y pesos euclidianos; una rejilla
+                        de cubetas da el radio de k vecinos y sólo se
+                        ordenan las aristas bajo ese umbral; el resto se
+                        filtra de forma vectorizada. Sin coordenadas o con
+                        pesos que no son distancias, el umbral es un
+                        cuantil de los pesos (requiere NumPy)
+          - "auto":     numpy si está instalado y el grafo es grande
+        Todos los modos devuelven el mismo árbol (bosque si no es conexo).
+        Con pesos enteros de rango acotado el orden por peso sale de
+        cubetas (o del radix sort de NumPy), O(m + W), en cualquier modo;
+        "enteros" exige pesos enteros y sólo cambia el tipo del total.
+
+        Con stats=EstadisticasMST() se cuentan operaciones del bucle de
+        "compacto" (también el de "enteros"; "auto" lo elige); "numpy" y
+        "geometrico" no tienen contadores y lanzan ValueError.
+        Con ligero=True devuelve un ArbolMST en lugar de un GrafoMST.
+        """
+        return self._mst("KruskalD", stats, ligero, modo=modo)
+
+    @classmethod
+    def _sel_kruskal_d(cls, c: GrafoCompacto, modo: str = "auto", stats=None):
+        if c.dirigido:
+            raise ValueError("Kruskal requiere grafo no dirigido")
+        if modo not in cls.MODOS_KRUSKAL_D:
+            raise ValueError(f"Modo de KruskalD desconocido: {modo}")
+        if stats is not None and modo in ("numpy", "geometrico"):
+            raise ValueError(f"El modo {modo} de KruskalD no tiene contadores; "
+                             "use 'compacto' o 'enteros'")
+
+        if modo == "auto":
+            grande = stats is None and np is not None and c.numero_aristas() >= cls.UMBRAL_NUMPY
+            modo = "numpy" if grande else "compacto"
+
+        if modo == "numpy":
+            return kruskal_directo_numpy(c)
+        if modo == "compacto":
+            return kruskal_directo(c, stats)
+        if modo == "enteros":
+            return kruskal_enteros(c, stats)
+        return kruskal_geometrico(c)
+
     # =====================================================
     # KRUSKAL INVERSO (Reverse Delete)
     # =====================================================
 
-    def KruskalI(self):
-        if self.dirigido:
+    def KruskalI(self, stats=None, ligero: bool = False):
+        """
+        Reverse-delete sin copias del grafo.
+
+        Se recorren las aristas de la más pesada a la más ligera y se elimina
+        cada una si su borrado no desconecta a sus extremos. En ese momento
+        siguen presentes todas las aristas más ligeras, y la arista es puente
+        si y sólo si sus extremos no están ya conectados por esas aristas
+        posteriores en el orden de borrado (propiedad del ciclo). Por eso la
+        pregunta "¿desconecta?" se responde recorriendo el orden de borrado al
+        revés con un DSU incremental: O(m log m) en lugar de O(m·(n+m)).
+        Con el mismo desempate produce el mismo árbol que el borrado explícito.
+        Con ligero=True devuelve un ArbolMST en lugar de un GrafoMST.
+        """
+        return self._mst("KruskalI", stats, ligero)
+
+    @staticmethod
+    def _sel_kruskal_i(c: GrafoCompacto, stats=None):
+        if c.dirigido:
             raise ValueError("Kruskal requiere grafo no dirigido")
-
-        # Copia completa
-        H = GrafoMST(False)
-        for n in self.nodos():
-            H.add_nodo(n.id, x=n.x, y=n.y)
-        for u, v, w in self.aristas_con_peso():
-            H.add_arista_peso(u, v, w)
-
-        def conectado(g: "GrafoMST") -> bool:
-            nodos = [n.id for n in g.nodos()]
-            if not nodos:
-                return True
-            visit = {nodos[0]}
-            stack = [nodos[0]]
-
-            while stack:
-                u = stack.pop()
-                for nb in g.vecinos(u):
-                    if nb.id not in visit:
-                        visit.add(nb.id)
-                        stack.append(nb.id)
-
-            return len(visit) == len(nodos)
-
-        # eliminar aristas más pesadas si no desconectan
-        for u, v, w in sorted(H.aristas_con_peso(), key=lambda e: e[2], reverse=True):
-            tmp = GrafoMST(False)
-            for n in H.nodos():
-                tmp.add_nodo(n.id, x=n.x, y=n.y)
-
-            for a, b, ww in H.aristas_con_peso():
-                if (a == u and b == v) or (a == v and b == u):
-                    continue
-                tmp.add_arista_peso(a, b, ww)
-
-            if conectado(tmp):
-                H = tmp
-
-            if H.numero_aristas() == H.numero_nodos() - 1:
-                break
-
-        total = sum(w for _, _, w in H.aristas_con_peso())
-        return H, total
+        return kruskal_inverso(c, stats)
 
     # =====================================================
     # PRIM
     # =====================================================
 
-    def Prim(self, start=None):
+    def Prim(self, start=None, modo: str = "auto", stats=None, ligero: bool = False):
+        """
+        Prim desde `start` (por omisión el primer nodo). En grafos no conexos
+        se reinicia desde nodos no visitados y devuelve el bosque.
+
+        modo: "indexado" (heap d-ario con decrease-key, a lo más n entradas),
+        "denso" (O(n²) con NumPy, para grafos casi completos), "perezoso"
+        (heapq con entradas obsoletas) o "auto" (elige según n y m).
+        Todos los modos devuelven el mismo árbol. Con `stats` se cuentan
+        operaciones de "indexado" (el que elige "auto") o "perezoso";
+        "denso" no tiene contadores y lanza ValueError.
+        Con ligero=True devuelve un ArbolMST en lugar de un GrafoMST.
+        """
         if self.dirigido:
             raise ValueError("Prim requiere grafo no dirigido")
 
-        nodos = [n.id for n in self.nodos()]
-        if not nodos:
+        if self.numero_nodos() == 0 and not ligero:
             return GrafoMST(False), 0.0
 
+        return self._mst("Prim", stats, ligero, start=start, modo=modo)
+
+    @staticmethod
+    def _sel_prim(c: GrafoCompacto, start=None, modo: str = "auto", stats=None):
+        if c.dirigido:
+            raise ValueError("Prim requiere grafo no dirigido")
+        if c.numero_nodos() == 0:
+            return [], 0.0
+
         if start is None:
-            start = nodos[0]
-        if start not in self._nodos:
+            start = c.ids[0]
+        if start not in c.indice:
             raise KeyError(f"El nodo fuente {start} no existe")
+        return prim(c, c.indice[start], modo=modo, stats=stats)
 
-        T = GrafoMST(False)
-        for n in self.nodos():
-            T.add_nodo(n.id, x=n.x, y=n.y)
+    # =====================================================
+    # BORŮVKA
+    # =====================================================
 
-        visit = {start}
-        heap = []
-        total = 0.0
+    def Boruvka(self, modo: str = "auto", procesos: int = 1, stats=None, ligero: bool = False):
+        """
+        Borůvka por rondas: cada componente elige su arista de salida más
+        barata y se contraen todas a la vez.
+
+        modo: "numpy" (rondas vectorizadas), "compacto" (Python puro) o
+        "auto". Con procesos > 1 (sólo modo numpy) la búsqueda de mínimos se
+        reparte entre procesos sobre memoria compartida.
+        Los empates se rompen como en KruskalD, así que el árbol es el mismo.
+        Con `stats` sólo se miden los tiempos de las fases.
+        Con ligero=True devuelve un ArbolMST en lugar de un GrafoMST.
+        """
+        return self._mst("Boruvka", stats, ligero, modo=modo, procesos=procesos)
+
+    @classmethod
+    def _sel_boruvka(cls, c: GrafoCompacto, modo: str = "auto", procesos: int = 1, stats=None):
+        if c.dirigido:
+            raise ValueError("Borůvka requiere grafo no dirigido")
+
+        if stats is not None:
+            with stats.fase("orden"):
+                c.orden_por_peso()
+            with stats.fase("bucle"):
+                return cls._sel_boruvka(c, modo=modo, procesos=procesos)
+
+        if modo == "auto":
+            grande = c.numero_aristas() >= cls.UMBRAL_NUMPY or procesos > 1
+            modo = "numpy" if (np is not None and grande) else "compacto"
+
+        if modo == "numpy":
+            return boruvka_numpy(c, procesos=procesos)
+        if modo == "compacto":
+            return boruvka(c)
+        raise ValueError(f"Modo de Borůvka desconocido: {modo}")
 
-        def push(u):
-            for nb in self.vecinos(u):
-                v = nb.id
-                if v not in visit:
-                    heapq.heappush(heap, (self.peso_arista(u, v), u, v))
+    # =====================================================
+    # MST SOBRE LA VISTA COMPACTA
+    # =====================================================
 
-        push(start)
+    @classmethod
+    def mst_compacto(cls, c: GrafoCompacto, metodo: str, stats=None, **opciones):
+        """
+        (índices de aristas, total) del bosque mínimo de `c` con el método
+        indicado. No necesita el GrafoMST original: sirve en procesos
+        trabajadores que sólo reciben la vista compacta. `stats`
+        (EstadisticasMST) activa los contadores.
+
+        Si GrafoMST.CACHE tiene un CacheMST, el resultado se busca ahí
+        antes de calcularlo y se guarda después. Los índices son siempre
+        una lista, venga o no del caché. Las corridas con `stats` no usan
+        el caché.
+        """
+        selectores = {
+            "KruskalD": cls._sel_kruskal_d,
+            "KruskalI": cls._sel_kruskal_i,
+            "Prim": cls._sel_prim,
+            "Boruvka": cls._sel_boruvka,
+        }
+        if metodo not in selectores:
+            raise ValueError(f"Método de MST desconocido: {metodo}")
+        if stats is not None:
+            stats.metodo = metodo
+            opciones["stats"] = stats
+            return selectores[metodo](c, **opciones)
+
+        cache = cls.CACHE
+        if cache is None:
+            return selectores[metodo](c, **opciones)
+        clave = cache.clave(c, metodo, opciones)
+        r = cache.obtener(clave)
+        if r is None:
+            r = selectores[metodo](c, **opciones)
+            cache.guardar(clave, *r)
+            return r
+        sel, total = r
+        return sel.tolist(), total
 
-        while heap and len(visit) < len(nodos):
-            w, u, v = heapq.heappop(heap)
-            if v in visit:
-                continue
-            visit.add(v)
-            T.add_arista_peso(u, v, w)
-            total += w
-            push(v)
+    # =====================================================
+    # BOSQUE DE EXPANSIÓN MÍNIMA
+    # =====================================================
 
-        return T, total
+    def bosque_expansion_minima(self, metodo: str = "KruskalD", **opciones) -> BosqueMST:
+        """
+        Bosque de expansión mínima separado por componente conexa.
+
+        metodo: "KruskalD", "KruskalI" o "Prim"; `opciones` se pasan al
+        método (p. ej. modo="numpy" o start=...).
+        """
+        c = self.compacto()
+        sel, _ = self.mst_compacto(c, metodo, **opciones)
+        etiqueta, k = c.componentes()
+
+        arboles = [GrafoMST(False) for _ in range(k)]
+        totales = [0.0] * k
+        for i, n in enumerate(self.nodos()):
+            arboles[etiqueta[i]].add_nodo(n.id, x=n.x, y=n.y)
+
+        ids, eu, ev, ew = c.ids, c.eu, c.ev, c.ew
+        for e in sel:
+            j = etiqueta[eu[e]]
+            arboles[j].add_arista_peso(ids[eu[e]], ids[ev[e]], ew[e])
+            totales[j] += ew[e]
+
+        componente = {ids[i]: etiqueta[i] for i in range(len(ids))}
+        return BosqueMST(arboles, totales, componente)
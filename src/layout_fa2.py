@@ -0,0 +1,376 @@
+from __future__ import annotations
+import math
+
+try:
+    import numpy as np
+except ImportError:   # NumPy es opcional para el resto del proyecto, no aquí
+    np = None
+
+
+# ============================================================
+# Posiciones iniciales (java.util.Random, como el script de Gephi)
+# ============================================================
+
+class RandomJava:
+    """
+    Generador congruencial de java.util.Random (48 bits). Con la misma
+    semilla da la misma secuencia que el `JRandom(seed)` del script de
+    Gephi, así que las posiciones iniciales coinciden con las de Gephi.
+    """
+
+    __slots__ = ("estado",)
+
+    _MULT = 0x5DEECE66D
+    _MASCARA = (1 << 48) - 1
+
+    def __init__(self, seed: int):
+        self.estado = (seed ^ self._MULT) & self._MASCARA
+
+    def _siguiente(self, bits: int) -> int:
+        self.estado = (self.estado * self._MULT + 0xB) & self._MASCARA
+        return self.estado >> (48 - bits)
+
+    def next_int(self) -> int:
+        r = self._siguiente(32)
+        return r - (1 << 32) if r >= 1 << 31 else r
+
+    def next_double(self) -> float:
+        return ((self._siguiente(26) << 27) + self._siguiente(27)) * (1.0 / (1 << 53))
+
+
+def posiciones_aleatorias(n: int, seed: int = 1337, escala: float = 1000.0):
+    """
+    (n, 2) posiciones en [-escala/2, escala/2)², en el orden de los nodos:
+    x e y de cada nodo, uno tras otro, como randomize_positions en Gephi.
+    """
+    _requiere_numpy()
+    rng = RandomJava(seed)
+    pos = np.empty((n, 2))
+    for i in range(n):
+        pos[i, 0] = (rng.next_double() - 0.5) * escala
+        pos[i, 1] = (rng.next_double() - 0.5) * escala
+    return pos
+
+
+# ============================================================
+# ForceAtlas2 (fuerzas lineales, sin LinLog ni gravedad fuerte)
+# ============================================================
+#
+# Las fuerzas y el control de velocidad siguen la implementación de Gephi
+# (ForceAtlas2.goAlgo): masa 1 + grado; repulsión kr·m1·m2/d; atracción
+# lineal con peso 1 (el importador DOT de Gephi no toma el label como
+# peso); gravedad g·m/d hacia el origen; paso adaptativo por nodo según
+# su "swinging". Con evitar_traslape (adjustSizes) las distancias se
+# miden entre bordes, usando `tamanos` como radios.
+#
+# La repulsión es O(n²) exacta con n < UMBRAL_BARNES_HUT y Barnes–Hut en
+# otro caso: un quadtree implícito por niveles, recorrido por todos los
+# nodos a la vez con arreglos de pares (nodo, celda). Con theta = 1.2 la
+# fuerza difiere ~2 % de la exacta; Gephi activa barnesHutOptimize desde
+# 1000 nodos, pero aquí la versión vectorizada ya gana desde unos 250.
+
+UMBRAL_BARNES_HUT = 256
+
+# profundidad máxima del quadtree (4**10 celdas en el último nivel)
+PROFUNDIDAD_MAX = 10
+
+
+def forceatlas2(pos, eu, ev, iteraciones: int, evitar_traslape: bool = False, tamanos=None,
+                escala: float = 2.0, gravedad: float = 1.0, theta: float = 1.2,
+                barnes_hut=None, fijos=None):
+    """
+    Corre `iteraciones` pasos de ForceAtlas2 sobre las posiciones `pos`
+    ((n, 2), se devuelve una copia) del grafo con aristas (eu[k], ev[k]).
+
+    Equivale a un initAlgo / goAlgo × iteraciones / endAlgo de Gephi: la
+    velocidad arranca de nuevo en cada llamada. `barnes_hut` None elige
+    según n; `fijos` (máscara booleana) marca nodos que no se mueven pero
+    sí ejercen fuerza, como los nodos fijos de Gephi.
+    """
+    _requiere_numpy()
+    pos = np.array(pos, dtype=np.float64)
+    n = len(pos)
+    if n == 0 or iteraciones <= 0:
+        return pos
+    eu = np.asarray(eu, dtype=np.intp)
+    ev = np.asarray(ev, dtype=np.intp)
+    masa = 1.0 + np.bincount(eu, minlength=n) + np.bincount(ev, minlength=n)
+    radios = None
+    if evitar_traslape:
+        radios = np.full(n, 10.0) if tamanos is None else np.asarray(tamanos, dtype=np.float64)
+    if barnes_hut is None:
+        barnes_hut = n >= UMBRAL_BARNES_HUT
+    moviles = None if fijos is None else ~np.asarray(fijos, dtype=bool)
+
+    fuerza_ant = np.zeros_like(pos)
+    velocidad = 1.0
+    eficiencia = 1.0
+    tolerancia = 1.0
+
+    for _ in range(iteraciones):
+        if barnes_hut:
+            f = _repulsion_barnes_hut(pos, masa, escala, theta, radios)
+        else:
+            f = _repulsion_exacta(pos, masa, escala, radios)
+        f += _atraccion(pos, eu, ev, radios)
+
+        d = np.hypot(pos[:, 0], pos[:, 1])
+        g = np.divide(masa * gravedad, d, out=np.zeros(n), where=d > 0)
+        f -= pos * g[:, None]
+
+        if moviles is not None:
+            f[~moviles] = 0.0
+
+        # velocidad global (adjustSpeedAndApplyForces)
+        swinging = masa * np.hypot(*(fuerza_ant - f).T)
+        traccion = masa * 0.5 * np.hypot(*(fuerza_ant + f).T)
+        total_sw = float(swinging.sum())
+        total_tr = float(traccion.sum())
+        if total_sw > 0 and total_tr > 0:
+            estimada = 0.05 * math.sqrt(n)
+            jt = tolerancia * max(math.sqrt(estimada), min(10.0, estimada * total_tr / (n * n)))
+            if total_sw / total_tr > 2.0:
+                if eficiencia > 0.05:
+                    eficiencia *= 0.5
+                jt = max(jt, tolerancia)
+            objetivo = jt * eficiencia * total_tr / total_sw
+            if total_sw > jt * total_tr:
+                if eficiencia > 0.05:
+                    eficiencia *= 0.7
+            elif velocidad < 1000:
+                eficiencia *= 1.3
+            velocidad += min(objetivo - velocidad, 0.5 * velocidad)
+
+        # paso por nodo
+        factor = velocidad / (1.0 + np.sqrt(velocidad * swinging))
+        if evitar_traslape:
+            df = np.hypot(f[:, 0], f[:, 1])
+            factor = np.divide(np.minimum(0.1 * factor * df, 10.0), df,
+                               out=np.zeros(n), where=df > 0)
+        pos += f * factor[:, None]
+        fuerza_ant = f
+
+    return pos
+
+
+def _atraccion(pos, eu, ev, radios):
+    # fuerza lineal -(p_u - p_v) con peso 1; sin efecto entre nodos que se
+    # traslapan cuando se evita el traslape
+    dx = pos[eu] - pos[ev]
+    if radios is not None:
+        d = np.hypot(dx[:, 0], dx[:, 1]) - radios[eu] - radios[ev]
+        dx = dx * (d > 0)[:, None]
+    n = len(pos)
+    f = np.empty_like(pos)
+    for k in range(2):
+        f[:, k] = np.bincount(ev, dx[:, k], minlength=n) - np.bincount(eu, dx[:, k], minlength=n)
+    return f
+
+
+def _factor_repulsion(d, mm, escala, ri=None, rj=None):
+    # Factor que multiplica al vector entre los nodos (Gephi linRepulsion y
+    # linRepulsion_antiCollision); 0 para nodos en el mismo punto.
+    if ri is None:
+        return np.divide(escala * mm, d * d, out=np.zeros_like(d), where=d > 0)
+    borde = d - ri - rj
+    f = np.where(borde < 0, 100.0 * escala * mm, 0.0)
+    np.divide(escala * mm, borde * borde, out=f, where=borde > 0)
+    f[d == 0] = 0.0
+    return f
+
+
+def _repulsion_exacta(pos, masa, escala, radios):
+    dx = np.subtract.outer(pos[:, 0], pos[:, 0])
+    dy = np.subtract.outer(pos[:, 1], pos[:, 1])
+    d2 = dx * dx
+    d2 += dy * dy
+    mm = np.multiply.outer(masa, masa)
+    if radios is None:
+        # kr·m1·m2/d², sin raíz cuadrada
+        mm *= escala
+        factor = np.divide(mm, d2, out=np.zeros_like(d2), where=d2 > 0)
+    else:
+        factor = _factor_repulsion(np.sqrt(d2), mm, escala, radios[:, None], radios[None, :])
+    return np.stack(((dx * factor).sum(axis=1), (dy * factor).sum(axis=1)), axis=1)
+
+
+def _repulsion_barnes_hut(pos, masa, escala, theta, radios):
+    n = len(pos)
+    lo = pos.min(axis=0)
+    lado = float((pos.max(axis=0) - lo).max()) or 1.0
+    lado *= 1.0 + 1e-9
+    prof = max(1, min(PROFUNDIDAD_MAX, math.ceil(math.log(max(n, 2), 4))))
+    u = (pos - lo) / lado          # en [0, 1)
+
+    # por nivel: celda (ix, iy) de cada nodo, masa y centro de masa de cada celda
+    celdas, masas, centros = [], [], []
+    for d in range(prof + 1):
+        k = 1 << d
+        ij = np.minimum((u * k).astype(np.intp), k - 1)
+        cid = ij[:, 0] * k + ij[:, 1]
+        m = np.bincount(cid, masa, minlength=k * k)
+        cx = np.bincount(cid, masa * pos[:, 0], minlength=k * k)
+        cy = np.bincount(cid, masa * pos[:, 1], minlength=k * k)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            centros.append(np.stack((cx / m, cy / m), axis=1))
+        celdas.append(ij)
+        masas.append(m)
+
+    f = np.zeros_like(pos)
+    # frontera: pares (nodo, celda del nivel d)
+    fi = np.arange(n)
+    fx = np.zeros(n, dtype=np.intp)
+    fy = np.zeros(n, dtype=np.intp)
+    hijos_x = np.array([0, 0, 1, 1], dtype=np.intp)
+    hijos_y = np.array([0, 1, 0, 1], dtype=np.intp)
+
+    for d in range(prof + 1):
+        k = 1 << d
+        cid = fx * k + fy
+        m = masas[d][cid]
+        vivas = m > 0
+        fi, fx, fy, cid, m = fi[vivas], fx[vivas], fy[vivas], cid[vivas], m[vivas]
+
+        propia = (celdas[d][fi, 0] == fx) & (celdas[d][fi, 1] == fy)
+        dif = pos[fi] - centros[d][cid]
+        dist = np.hypot(dif[:, 0], dif[:, 1])
+        # criterio de Gephi: distancia · theta > tamaño de la región
+        lejos = ~propia & (dist * theta > lado / k)
+        if lejos.any():
+            # región completa como un solo cuerpo (Gephi no usa los
+            # tamaños a este nivel)
+            factor = _factor_repulsion(dist[lejos], masa[fi[lejos]] * m[lejos], escala)
+            _acumular(f, fi[lejos], dif[lejos] * factor[:, None])
+
+        cerca = ~lejos
+        fi, fx, fy = fi[cerca], fx[cerca], fy[cerca]
+        if d == prof:
+            _repulsion_hojas(f, pos, masa, escala, radios, celdas[d], k, fi, fx * k + fy)
+            break
+        fi = np.repeat(fi, 4)
+        fx = np.repeat(2 * fx, 4) + np.tile(hijos_x, len(fx))
+        fy = np.repeat(2 * fy, 4) + np.tile(hijos_y, len(fy))
+
+    return f
+
+
+def _repulsion_hojas(f, pos, masa, escala, radios, ij, k, fi, hoja):
+    # interacción exacta del nodo fi[t] con cada nodo de la hoja hoja[t]
+    cid = ij[:, 0] * k + ij[:, 1]
+    orden = np.argsort(cid, kind="stable")
+    inicio = np.searchsorted(cid[orden], hoja, side="left")
+    cuantos = np.searchsorted(cid[orden], hoja, side="right") - inicio
+    i = np.repeat(fi, cuantos)
+    desde = np.repeat(inicio - np.cumsum(cuantos) + cuantos, cuantos)
+    j = orden[desde + np.arange(len(i))]
+    otro = i != j
+    i, j = i[otro], j[otro]
+
+    dif = pos[i] - pos[j]
+    dist = np.hypot(dif[:, 0], dif[:, 1])
+    mm = masa[i] * masa[j]
+    if radios is None:
+        factor = _factor_repulsion(dist, mm, escala)
+    else:
+        factor = _factor_repulsion(dist, mm, escala, radios[i], radios[j])
+    _acumular(f, i, dif * factor[:, None])
+
+
+def _acumular(f, idx, valores):
+    n = len(f)
+    f[:, 0] += np.bincount(idx, valores[:, 0], minlength=n)
+    f[:, 1] += np.bincount(idx, valores[:, 1], minlength=n)
+
+
+# ============================================================
+# Refinamiento sobre posiciones fijadas
+# ============================================================
+#
+# Los MST se dibujan sobre el layout de su grafo base. Correr ForceAtlas2
+# con las aristas del árbol lo deforma hacia el equilibrio del árbol (y
+# junta nodos), así que el refinamiento sólo separa los pares que se
+# traslapan con los tamaños nuevos: cada par se aleja la mitad del
+# traslape por lado, a lo largo de la recta que los une. Los nodos sin
+# traslape no se mueven.
+
+def separar_traslapes(pos, tamanos, iteraciones: int = 50, margen: float = 0.0):
+    """
+    Copia de `pos` ((n, 2)) sin nodos traslapados: la distancia entre
+    centros queda >= tamanos[i] + tamanos[j] + margen, o se detiene tras
+    `iteraciones` pasadas.
+    """
+    _requiere_numpy()
+    pos = np.array(pos, dtype=np.float64)
+    n = len(pos)
+    if n < 2:
+        return pos
+    radios = np.broadcast_to(np.asarray(tamanos, dtype=np.float64), (n,))
+    alcance = 2.0 * float(radios.max()) + margen
+    if alcance <= 0:
+        return pos
+
+    for _ in range(iteraciones):
+        i, j = _pares_cercanos(pos, alcance)
+        dif = pos[i] - pos[j]
+        d = np.hypot(dif[:, 0], dif[:, 1])
+        traslape = radios[i] + radios[j] + margen - d
+        hay = traslape > 1e-9
+        if not hay.any():
+            break
+        i, j, dif, d, traslape = i[hay], j[hay], dif[hay], d[hay], traslape[hay]
+        # nodos en el mismo punto: dirección fija por índice
+        cero = d == 0
+        dif[cero] = np.stack((np.cos(i[cero]), np.sin(i[cero])), axis=1)
+        d[cero] = 1.0
+        empuje = dif * (0.5 * traslape / d)[:, None]
+        desplazamiento = np.zeros_like(pos)
+        _acumular(desplazamiento, i, empuje)
+        _acumular(desplazamiento, j, -empuje)
+        pos += desplazamiento
+
+    return pos
+
+
+def _pares_cercanos(pos, alcance: float):
+    # pares (i, j), i != j, en celdas vecinas de una rejilla de lado
+    # `alcance`: contiene a todos los pares a distancia < alcance
+    c = np.floor((pos - pos.min(axis=0)) / alcance).astype(np.int64)
+    alto = int(c[:, 1].max()) + 3
+    clave = c[:, 0] * alto + c[:, 1] + 1
+    orden = np.argsort(clave, kind="stable")
+    ordenada = clave[orden]
+    pares_i, pares_j = [], []
+    # media vecindad: cada par de celdas se visita una vez
+    for dx, dy in ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1)):
+        destino = clave + dx * alto + dy
+        inicio = np.searchsorted(ordenada, destino, side="left")
+        cuantos = np.searchsorted(ordenada, destino, side="right") - inicio
+        i = np.repeat(np.arange(len(pos)), cuantos)
+        desde = np.repeat(inicio - np.cumsum(cuantos) + cuantos, cuantos)
+        j = orden[desde + np.arange(len(i))]
+        if dx == 0 and dy == 0:
+            i, j = i[i < j], j[i < j]
+        pares_i.append(i)
+        pares_j.append(j)
+    return np.concatenate(pares_i), np.concatenate(pares_j)
+
+
+# ============================================================
+# Tamaños
+# ============================================================
+
+def tamanos_por_grado(eu, ev, n: int, minimo: float = 5.0, maximo: float = 40.0):
+    """Ranking lineal de tamaño por grado en [minimo, maximo] (Gephi Ranking)."""
+    _requiere_numpy()
+    grado = np.bincount(np.asarray(eu, dtype=np.intp), minlength=n) \
+        + np.bincount(np.asarray(ev, dtype=np.intp), minlength=n)
+    if n == 0:
+        return np.zeros(0)
+    gmin, gmax = grado.min(), grado.max()
+    t = (grado - gmin) / float(gmax - gmin) if gmax != gmin else np.zeros(n)
+    return minimo + t * (maximo - minimo)
+
+
+def _requiere_numpy():
+    if np is None:
+        raise ImportError("El layout ForceAtlas2 requiere NumPy")
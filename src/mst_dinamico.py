@@ -0,0 +1,451 @@
+from __future__ import annotations
+from heapq import heapify, heappop, heappush
+from math import isfinite
+
+from grafo_mst import GrafoMST
+
+
+# ============================================================
+# Link-cut tree con máximo por camino
+# ============================================================
+
+class ArbolLinkCut:
+    """
+    Bosque de link-cut trees (Sleator–Tarjan) sobre nodos enteros 1..,
+    con el nodo 0 como nulo. Cada nodo guarda un valor comparable y el
+    splay mantiene el índice del nodo de valor máximo de su subárbol, así
+    que el máximo de un camino u–v cuesta O(log n) amortizado.
+
+    Las aristas del MST se representan como nodos propios entre sus dos
+    extremos; los vértices llevan un valor mínimo y nunca son el máximo.
+    """
+
+    __slots__ = ("izq", "der", "padre", "inv", "valor", "maximo", "_libres")
+
+    MINIMO = (float("-inf"), -1)
+
+    def __init__(self):
+        self.izq = [0]
+        self.der = [0]
+        self.padre = [0]
+        self.inv = [False]
+        self.valor = [self.MINIMO]
+        self.maximo = [0]
+        self._libres = []
+
+    def nuevo(self, valor=MINIMO) -> int:
+        if self._libres:
+            x = self._libres.pop()
+            self.izq[x] = self.der[x] = self.padre[x] = 0
+            self.inv[x] = False
+            self.valor[x] = valor
+            self.maximo[x] = x
+            return x
+        self.izq.append(0)
+        self.der.append(0)
+        self.padre.append(0)
+        self.inv.append(False)
+        self.valor.append(valor)
+        self.maximo.append(len(self.valor) - 1)
+        return len(self.valor) - 1
+
+    def liberar(self, x: int):
+        """Devuelve un nodo ya aislado (cortado de todo) para reutilizarlo."""
+        self._libres.append(x)
+
+    # ------------------ Splay ------------------
+
+    def _es_raiz(self, x: int) -> bool:
+        p = self.padre[x]
+        return self.izq[p] != x and self.der[p] != x
+
+    def _bajar(self, x: int):
+        if self.inv[x]:
+            izq, der, inv = self.izq, self.der, self.inv
+            a, b = izq[x], der[x]
+            izq[x], der[x] = b, a
+            if a:
+                inv[a] = not inv[a]
+            if b:
+                inv[b] = not inv[b]
+            inv[x] = False
+
+    def _actualizar(self, x: int):
+        valor, maximo = self.valor, self.maximo
+        m = x
+        a = maximo[self.izq[x]]
+        if a and valor[a] > valor[m]:
+            m = a
+        b = maximo[self.der[x]]
+        if b and valor[b] > valor[m]:
+            m = b
+        maximo[x] = m
+
+    def _rotar(self, x: int):
+        izq, der, padre = self.izq, self.der, self.padre
+        y = padre[x]
+        z = padre[y]
+        if not self._es_raiz(y):
+            if izq[z] == y:
+                izq[z] = x
+            else:
+                der[z] = x
+        padre[x] = z
+        if izq[y] == x:
+            b = der[x]
+            izq[y] = b
+            der[x] = y
+        else:
+            b = izq[x]
+            der[y] = b
+            izq[x] = y
+        if b:
+            padre[b] = y
+        padre[y] = x
+        self._actualizar(y)
+        self._actualizar(x)
+
+    def _splay(self, x: int):
+        # propaga las inversiones pendientes de la raíz del splay hacia x
+        pila = [x]
+        y = x
+        while not self._es_raiz(y):
+            y = self.padre[y]
+            pila.append(y)
+        for y in reversed(pila):
+            self._bajar(y)
+
+        izq, padre = self.izq, self.padre
+        while not self._es_raiz(x):
+            y = padre[x]
+            if not self._es_raiz(y):
+                z = padre[y]
+                if (izq[y] == x) == (izq[z] == y):
+                    self._rotar(y)
+                else:
+                    self._rotar(x)
+            self._rotar(x)
+
+    # ------------------ Operaciones ------------------
+
+    def _acceder(self, x: int):
+        ultimo = 0
+        y = x
+        while y:
+            self._splay(y)
+            self.der[y] = ultimo
+            self._actualizar(y)
+            ultimo = y
+            y = self.padre[y]
+        self._splay(x)
+
+    def _hacer_raiz(self, x: int):
+        self._acceder(x)
+        self.inv[x] = not self.inv[x]
+
+    def raiz(self, x: int) -> int:
+        self._acceder(x)
+        while True:
+            self._bajar(x)
+            if not self.izq[x]:
+                break
+            x = self.izq[x]
+        self._splay(x)
+        return x
+
+    def conectados(self, u: int, v: int) -> bool:
+        return u == v or self.raiz(u) == self.raiz(v)
+
+    def enlazar(self, u: int, v: int):
+        """Une u y v (deben estar en árboles distintos)."""
+        self._hacer_raiz(u)
+        self.padre[u] = v
+
+    def cortar(self, u: int, v: int):
+        """Quita el enlace u–v (deben ser adyacentes)."""
+        self._hacer_raiz(u)
+        self._acceder(v)
+        self.izq[v] = 0
+        self.padre[u] = 0
+        self._actualizar(v)
+
+    def maximo_camino(self, u: int, v: int) -> int:
+        """Nodo de valor máximo en el camino u–v (deben estar conectados)."""
+        self._hacer_raiz(u)
+        self._acceder(v)
+        return self.maximo[v]
+
+    def cambiar_valor(self, x: int, valor):
+        self._acceder(x)
+        self.valor[x] = valor
+        self._actualizar(x)
+
+
+# ============================================================
+# MST dinámico
+# ============================================================
+
+class MSTDinamico:
+    """
+    Bosque de expansión mínima mantenido bajo inserciones, borrados y
+    cambios de peso, sin recalcularlo desde cero.
+
+    Parte de las aristas de `g` (que no se modifica). Las aristas del árbol
+    viven en un ArbolLinkCut; las que quedan fuera, en un montículo por
+    peso con borrado perezoso: sacar una arista de fuera sólo invalida su
+    entrada, que se descarta al llegar a la cima (y el montículo se
+    reconstruye cuando las entradas inválidas superan a las válidas). Los
+    empates se rompen por un número de arista: las de `g` reciben su
+    posición en el orden estable de KruskalD (el bosque inicial es el
+    mismo) y las insertadas después, números crecientes.
+
+    Con m aristas, cada operación cuesta O(log n) amortizado en el
+    link-cut tree más O(log m) amortizado en el montículo, salvo la
+    búsqueda de reemplazo:
+
+    - Inserción: si los extremos ya están conectados, la arista entra sólo
+      si es más ligera que el máximo del camino, que sale.
+    - Borrado de una arista del árbol: se busca la arista de reemplazo más
+      ligera entre las que quedan fuera, en orden de peso, hasta la primera
+      que vuelva a unir las dos mitades. Cada prueba cuesta
+      O(log n + log m); en el peor caso se revisan todas las aristas fuera
+      del árbol.
+
+    `total` es la suma exacta de los pesos del árbol redondeada una sola
+    vez (como math.fsum): se acumula en un entero de punto fijo, así que
+    no deriva con la secuencia de cambios.
+    """
+
+    def __init__(self, g: GrafoMST):
+        if g.dirigido:
+            raise ValueError("El MST dinámico requiere grafo no dirigido")
+
+        self._key = g._key
+        self._lct = ArbolLinkCut()
+        self._nodo = {}          # id -> nodo del link-cut tree
+        self._coordenadas = {}   # id -> (x, y)
+        # clave (u, v) -> [u, v, w, número, nodo lct o 0, marca de fuera o 0]
+        self._aristas = {}
+        self._fuera = []         # montículo de (w, número, marca, arista)
+        self._vivas = 0          # entradas válidas en _fuera
+        self._marca = 0
+        self._por_nodo = {}      # nodo lct de una arista del árbol -> clave
+        self._suma = 0           # total del árbol en punto fijo (_fijo)
+
+        for n in g.nodos():
+            self._agregar_nodo(n.id, n.x, n.y)
+
+        c = g.compacto()
+        sel, _ = g._sel_kruskal_d(c)
+        en_arbol = set(sel)
+        orden = c.orden_por_peso()
+        ids, eu, ev, ew = c.ids, c.eu, c.ev, c.ew
+        for numero, e in enumerate(orden):
+            u, v, w = ids[eu[e]], ids[ev[e]], ew[e]
+            arista = [u, v, w, numero, 0, 0]
+            self._aristas[self._key(u, v)] = arista
+            if e in en_arbol:
+                self._enlazar(arista)
+            else:
+                self._marca += 1
+                arista[5] = self._marca
+                self._fuera.append((w, numero, self._marca, arista))
+        self._vivas = len(self._fuera)   # ya en orden: es un montículo
+        self._numero = len(orden)
+
+    @property
+    def total(self) -> float:
+        return self._suma / _ESCALA
+
+    # ------------------ Auxiliares ------------------
+
+    def _agregar_nodo(self, nid, x=None, y=None):
+        if nid not in self._nodo:
+            self._nodo[nid] = self._lct.nuevo()
+            self._coordenadas[nid] = (x, y)
+
+    def _enlazar(self, arista):
+        u, v, w, numero = arista[:4]
+        x = self._lct.nuevo((w, numero))
+        self._lct.enlazar(self._nodo[u], x)
+        self._lct.enlazar(x, self._nodo[v])
+        arista[4] = x
+        self._por_nodo[x] = self._key(u, v)
+        self._suma += _fijo(w)
+
+    def _cortar(self, arista):
+        u, v, w, _, x = arista[:5]
+        self._lct.cortar(self._nodo[u], x)
+        self._lct.cortar(x, self._nodo[v])
+        self._lct.liberar(x)
+        del self._por_nodo[x]
+        arista[4] = 0
+        self._suma -= _fijo(w)
+
+    def _sacar_de_fuera(self, arista):
+        # borrado perezoso: la entrada queda en el montículo, inválida
+        arista[5] = 0
+        self._vivas -= 1
+        if len(self._fuera) > 2 * self._vivas + 64:
+            self._fuera = [t for t in self._fuera if t[3][5] == t[2]]
+            heapify(self._fuera)
+
+    def _poner_fuera(self, arista):
+        self._marca += 1
+        arista[5] = self._marca
+        self._vivas += 1
+        heappush(self._fuera, (arista[2], arista[3], self._marca, arista))
+
+    def _colocar(self, arista):
+        """Coloca una arista que no está en el árbol ni en el montículo de fuera."""
+        u, v, w, numero = arista[:4]
+        a, b = self._nodo[u], self._nodo[v]
+        if not self._lct.conectados(a, b):
+            self._enlazar(arista)
+            return
+        lct = self._lct
+        x = lct.maximo_camino(a, b)
+        if (w, numero) < lct.valor[x]:
+            sale = self._aristas[self._por_nodo[x]]
+            self._cortar(sale)
+            self._poner_fuera(sale)
+            self._enlazar(arista)
+        else:
+            self._poner_fuera(arista)
+
+    def _reemplazar(self, limite=None):
+        """
+        Arista de fuera más ligera (y menor que `limite`) que une dos árboles
+        distintos; se enlaza y se devuelve, o None.
+        """
+        lct, nodo, fuera = self._lct, self._nodo, self._fuera
+        probadas = []            # válidas que no sirven: vuelven al montículo
+        elegida = None
+        while fuera:
+            w, numero, marca, arista = fuera[0]
+            if arista[5] != marca:
+                heappop(fuera)   # entrada inválida
+                continue
+            if limite is not None and (w, numero) >= limite:
+                break
+            heappop(fuera)
+            if not lct.conectados(nodo[arista[0]], nodo[arista[1]]):
+                arista[5] = 0
+                self._vivas -= 1
+                self._enlazar(arista)
+                elegida = arista
+                break
+            probadas.append((w, numero, marca, arista))
+        for t in probadas:
+            heappush(fuera, t)
+        return elegida
+
+    # ------------------ Operaciones ------------------
+
+    def insert_edge(self, u, v, w: float) -> bool:
+        """Agrega la arista u–v; False si es un lazo o ya existe."""
+        if u == v:
+            return False
+        k = self._key(u, v)
+        if k in self._aristas:
+            return False
+        self._agregar_nodo(u)
+        self._agregar_nodo(v)
+        arista = [u, v, _peso(w), self._numero, 0, 0]
+        self._numero += 1
+        self._aristas[k] = arista
+        self._colocar(arista)
+        return True
+
+    def delete_edge(self, u, v) -> bool:
+        """Quita la arista u–v; False si no existe."""
+        arista = self._aristas.pop(self._key(u, v), None)
+        if arista is None:
+            return False
+        if arista[4]:
+            self._cortar(arista)
+            self._reemplazar()
+        else:
+            self._sacar_de_fuera(arista)
+        return True
+
+    def update_weight(self, u, v, w: float):
+        """Cambia el peso de u–v (KeyError si no existe)."""
+        arista = self._aristas[self._key(u, v)]
+        w = _peso(w)
+        viejo = arista[2]
+        if w == viejo:
+            return
+
+        if not arista[4]:
+            self._sacar_de_fuera(arista)
+            arista[2] = w
+            if w < viejo:
+                self._colocar(arista)
+            else:
+                self._poner_fuera(arista)
+            return
+
+        if w < viejo:
+            # una arista del árbol que baja de peso sigue en el árbol
+            arista[2] = w
+            self._lct.cambiar_valor(arista[4], (w, arista[3]))
+            self._suma += _fijo(w) - _fijo(viejo)
+            return
+
+        # sube de peso: puede reemplazarla una arista de fuera más ligera
+        self._cortar(arista)
+        arista[2] = w
+        if self._reemplazar(limite=(w, arista[3])) is None:
+            self._enlazar(arista)
+        else:
+            self._poner_fuera(arista)
+
+    # ------------------ Consultas ------------------
+
+    def peso_arista(self, u, v) -> float:
+        return self._aristas[self._key(u, v)][2]
+
+    def en_arbol(self, u, v) -> bool:
+        return bool(self._aristas[self._key(u, v)][4])
+
+    def aristas_arbol(self):
+        return [(u, v, w) for u, v, w, _, x, _ in self._aristas.values() if x]
+
+    def numero_aristas(self) -> int:
+        return len(self._aristas)
+
+    def arbol(self) -> GrafoMST:
+        """Bosque actual como GrafoMST con todos los nodos."""
+        T = GrafoMST(False)
+        for nid, (x, y) in self._coordenadas.items():
+            T.add_nodo(nid, x=x, y=y)
+        for u, v, w in self.aristas_arbol():
+            T.add_arista_peso(u, v, w)
+        return T
+
+    def grafo(self) -> GrafoMST:
+        """Grafo actual (todas las aristas) como GrafoMST."""
+        g = GrafoMST(False)
+        for nid, (x, y) in self._coordenadas.items():
+            g.add_nodo(nid, x=x, y=y)
+        for u, v, w, *_ in self._aristas.values():
+            g.add_arista_peso(u, v, w)
+        return g
+
+
+# todo float finito es un múltiplo entero de 2**-1074: en esa escala la
+# suma es exacta y la división final redondea una sola vez
+_ESCALA = 1 << 1074
+
+
+def _fijo(w: float) -> int:
+    num, den = _peso(w).as_integer_ratio()
+    return num * (_ESCALA // den)
+
+
+def _peso(w) -> float:
+    w = float(w)
+    if not isfinite(w):
+        raise ValueError(f"El MST dinámico requiere pesos finitos: {w}")
+    return w
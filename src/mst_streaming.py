@@ -0,0 +1,168 @@
+from __future__ import annotations
+from itertools import islice
+from operator import itemgetter
+from pathlib import Path
+import heapq
+import pickle
+import tempfile
+
+from grafo_compacto import _raiz, _unir
+from grafo_io import id_natural, _abrir_lectura
+
+
+# ============================================================
+# MST sobre un flujo de aristas (u, v, w)
+# ============================================================
+#
+# Para listas de aristas mucho más grandes que el conjunto de nodos: no se
+# construye ningún GrafoMST. El único estado que crece con la entrada es
+# el union-find, O(n); las aristas sólo se guardan (en disco) si hay que
+# ordenarlas.
+
+# aristas por corrida ordenada en memoria antes de pasar a disco
+ARISTAS_POR_CORRIDA = 1_000_000
+
+# aristas por registro pickle dentro de un archivo de corrida
+_ARISTAS_POR_REGISTRO = 4096
+
+_peso = itemgetter(2)
+
+
+def kruskal_streaming(aristas, ordenadas: bool = False, nodos: int = None,
+                      tam_corrida: int = ARISTAS_POR_CORRIDA, dir_temporal=None):
+    """
+    Kruskal directo sobre un iterable de aristas (u, v, w); genera las
+    aristas aceptadas (u, v, w) conforme se deciden, en orden de peso.
+
+    - ordenadas=True: el flujo ya viene por peso no decreciente y se
+      procesa en una pasada. Si un peso baja se lanza ValueError.
+    - ordenadas=False: ordenamiento externo. Se ordenan corridas de
+      `tam_corrida` aristas en memoria, se escriben en `dir_temporal` (un
+      directorio temporal por omisión, que se borra al terminar) y se
+      mezclan con heapq.merge. Si todo cabe en una corrida no se toca el
+      disco.
+
+    Los empates conservan el orden del flujo (orden estable), igual que
+    KruskalD con las aristas en ese orden. Para un grafo no conexo se
+    obtiene el bosque. Los nodos aislados no aparecen en el flujo.
+
+    Si se conoce el número de nodos (`nodos`), se deja de leer al aceptar
+    nodos - 1 aristas: el resto de la mezcla no se recorre.
+    """
+    objetivo = None if nodos is None else max(nodos - 1, 0)
+    if ordenadas:
+        yield from _kruskal_ordenado(_verificar_orden(aristas), objetivo)
+        return
+
+    it = iter(aristas)
+    primera = sorted(islice(it, tam_corrida), key=_peso)
+    if len(primera) < tam_corrida:
+        yield from _kruskal_ordenado(primera, objetivo)
+        return
+
+    with tempfile.TemporaryDirectory(prefix="mst_corridas_", dir=dir_temporal) as tmp:
+        rutas = [_escribir_corrida(primera, Path(tmp) / "corrida_0.pkl")]
+        del primera
+        while True:
+            corrida = sorted(islice(it, tam_corrida), key=_peso)
+            if not corrida:
+                break
+            rutas.append(_escribir_corrida(corrida, Path(tmp) / f"corrida_{len(rutas)}.pkl"))
+        # heapq.merge es estable entre iterables: ante pesos iguales saca
+        # primero los de la corrida anterior, es decir, en orden del flujo
+        yield from _kruskal_ordenado(heapq.merge(*map(_leer_corrida, rutas), key=_peso), objetivo)
+
+
+def _kruskal_ordenado(aristas, objetivo=None):
+    # union-find sobre enteros densos asignados conforme aparecen los nodos
+    indice = {}
+    padre = []
+    tam = []
+    aceptadas = 0
+    if objetivo == 0:
+        return
+    for u, v, w in aristas:
+        a = indice.get(u)
+        if a is None:
+            a = indice[u] = len(padre)
+            padre.append(a)
+            tam.append(1)
+        b = indice.get(v)
+        if b is None:
+            b = indice[v] = len(padre)
+            padre.append(b)
+            tam.append(1)
+        a, b = _raiz(padre, a), _raiz(padre, b)
+        if a == b:
+            continue
+        _unir(padre, tam, a, b)
+        yield u, v, w
+        aceptadas += 1
+        if aceptadas == objetivo:
+            return
+
+
+def _verificar_orden(aristas):
+    anterior = float("-inf")
+    for num, arista in enumerate(aristas):
+        if arista[2] < anterior:
+            raise ValueError(f"Flujo no ordenado por peso en la arista {num}: {arista!r}")
+        anterior = arista[2]
+        yield arista
+
+
+def _escribir_corrida(corrida, ruta: Path) -> Path:
+    with open(ruta, "wb", buffering=1 << 20) as f:
+        for i in range(0, len(corrida), _ARISTAS_POR_REGISTRO):
+            pickle.dump(corrida[i:i + _ARISTAS_POR_REGISTRO], f, protocol=pickle.HIGHEST_PROTOCOL)
+    return ruta
+
+
+def _leer_corrida(ruta: Path):
+    with open(ruta, "rb", buffering=1 << 20) as f:
+        while True:
+            try:
+                registro = pickle.load(f)
+            except EOFError:
+                return
+            yield from registro
+
+
+def total_streaming(aristas, **opciones):
+    """(lista de aristas aceptadas, total) de kruskal_streaming."""
+    arbol = []
+    total = 0.0
+    for u, v, w in kruskal_streaming(aristas, **opciones):
+        arbol.append((u, v, w))
+        total += w
+    return arbol, total
+
+
+# ============================================================
+# Lectura en streaming de tablas de aristas
+# ============================================================
+
+def leer_tabla_aristas(origen, sep=None, convertir_id=id_natural, omitir: int = 0):
+    """
+    Genera (u, v, w) desde un archivo de texto con una arista por línea
+    ("u v w", o separadas por `sep`), sin cargarlo completo. Acepta ruta,
+    *.gz o manejador binario como los lectores de grafo_io. Las líneas
+    vacías y las que empiezan con '#' se ignoran; `omitir` salta cabeceras.
+    """
+    f, cerrar = _abrir_lectura(origen)
+    try:
+        for num, linea in enumerate(f, start=1):
+            if num <= omitir:
+                continue
+            linea = linea.strip()
+            if not linea or linea[0] == "#":
+                continue
+            partes = linea.split(sep)
+            if len(partes) != 3:
+                raise ValueError(f"Línea {num}: se esperaban 3 campos: {linea!r}")
+            yield convertir_id(partes[0].strip()), convertir_id(partes[1].strip()), float(partes[2])
+    finally:
+        if cerrar:
+            f.close()
+        else:
+            f.detach()
@@ -0,0 +1,70 @@
+from __future__ import annotations
+from array import array
+import random
+import sys
+
+from grafo_mst import GrafoMST
+
+try:
+    import numpy as np
+except ImportError:   # NumPy es opcional: sin él se usan los modos puros
+    np = None
+
+
+# ============================================================
+# Pesos aleatorios en bloque
+# ============================================================
+
+def pesos_aleatorios(rng: random.Random, m: int, wmin: int, wmax: int) -> list:
+    """
+    Los mismos m enteros que [rng.randint(wmin, wmax) for _ in range(m)],
+    sacados en bloque.
+
+    randint(a, b) toma palabras de 32 bits del Mersenne Twister de una en
+    una: se queda con los k bits altos (k = bits de b - a + 1) y descarta
+    las que caen fuera del rango. getrandbits(32 * L) devuelve L palabras
+    seguidas (la primera en los bits bajos), así que basta con pedir un
+    bloque, desplazar y filtrar de forma vectorizada. Las palabras que
+    sobran del último bloque se pierden, pero rng ya no se vuelve a usar.
+    """
+    n = wmax - wmin + 1
+    if n <= 0:
+        raise ValueError(f"Rango vacío: [{wmin}, {wmax}]")
+    k = n.bit_length()
+    if k > 32:
+        return [rng.randint(wmin, wmax) for _ in range(m)]
+
+    pesos = []
+    while len(pesos) < m:
+        faltan = m - len(pesos)
+        # se acepta al menos la mitad de las palabras (n > 2**(k-1))
+        lote = 2 * faltan + 64
+        crudo = rng.getrandbits(32 * lote).to_bytes(4 * lote, "little")
+        if np is not None:
+            v = np.frombuffer(crudo, dtype="<u4") >> (32 - k)
+            v = v[v < n][:faltan]
+            pesos.extend((v.astype(np.int64) + wmin).tolist())
+        else:
+            palabras = array("I" if array("I").itemsize == 4 else "L")
+            palabras.frombytes(crudo)
+            if sys.byteorder != "little":
+                palabras.byteswap()
+            corr = 32 - k
+            for w in palabras:
+                r = w >> corr
+                if r < n:
+                    pesos.append(r + wmin)
+                    if len(pesos) == m:
+                        break
+    return pesos
+
+
+def convertir_y_ponderar(g_base, seed: int, wmin: int = 1, wmax: int = 99) -> GrafoMST:
+    """
+    GrafoMST con los nodos y aristas de g_base y pesos enteros aleatorios
+    en [wmin, wmax] (semilla `seed`), idéntico al recorrido arista por
+    arista con rng.randint. g_base se consume (ver GrafoMST.desde_base).
+    """
+    rng = random.Random(seed)
+    pesos = pesos_aleatorios(rng, g_base.numero_aristas(), wmin, wmax)
+    return GrafoMST.desde_base(g_base, pesos)
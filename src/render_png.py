@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    # se dibuja sobre un FigureCanvasAgg propio, sin pyplot ni backend global
+    import matplotlib
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.collections import EllipseCollection, LineCollection, PathCollection
+    from matplotlib.figure import Figure
+    from matplotlib.path import Path as RutaMPL
+    from matplotlib import patheffects
+except ImportError:   # sólo hace falta para escribir PNG
+    matplotlib = None
+
+
+# ============================================================
+# PNG sin Gephi (matplotlib, backend Agg)
+# ============================================================
+#
+# Reproduce el Preview del script de Gephi: fondo blanco, nodos negros con
+# radio = tamaño (en unidades del layout), aristas negras curvas (grafos
+# generados) o rectas (árboles), etiquetas de nodo blancas con contorno
+# negro y pesos en cursiva. Imagen de 1024×1024 con 4 % de margen, como el
+# exportador PNG de Gephi.
+
+# desplazamiento del punto de control de las aristas curvas, relativo a
+# su longitud
+CURVATURA = 0.2
+
+
+def dibujar_png(ruta, pos, tamanos, eu, ev, etiquetas_nodos=None, etiquetas_aristas=None,
+                curvas: bool = False, grosor: float = 0.3, ancho: int = 1024, alto: int = 1024,
+                margen: float = 0.04, fuente_nodos: float = 20.0, fuente_aristas: float = 14.0):
+    """
+    Escribe un PNG del grafo con posiciones `pos` ((n, 2)), radios
+    `tamanos` y aristas (eu[k], ev[k]). `etiquetas_nodos` y
+    `etiquetas_aristas` son listas de textos (None = sin etiquetas). Los
+    tamaños de fuente están en puntos para una imagen de 1024 px y se
+    escalan con `ancho`.
+    """
+    if matplotlib is None:
+        raise ImportError("Escribir PNG requiere matplotlib")
+
+    pos = np.asarray(pos, dtype=np.float64)
+    tamanos = np.broadcast_to(np.asarray(tamanos, dtype=np.float64), (len(pos),))
+    eu = np.asarray(eu, dtype=np.intp)
+    ev = np.asarray(ev, dtype=np.intp)
+    escala_fuente = ancho / 1024.0
+
+    fig = Figure(figsize=(ancho / 100.0, alto / 100.0), dpi=100, facecolor="white")
+    FigureCanvasAgg(fig)
+    ax = fig.add_axes((margen, margen, 1 - 2 * margen, 1 - 2 * margen))
+    ax.set_axis_off()
+
+    if len(pos):
+        # misma escala en x e y: se centra el dibujo en la caja de
+        # proporción ancho:alto que lo contiene
+        lo = (pos - tamanos[:, None]).min(axis=0)
+        hi = (pos + tamanos[:, None]).max(axis=0)
+        centro = (lo + hi) / 2
+        proporcion = ancho / alto
+        medio = max((hi[0] - lo[0]) / proporcion, hi[1] - lo[1], 1e-9) / 2
+        ax.set_xlim(centro[0] - medio * proporcion, centro[0] + medio * proporcion)
+        ax.set_ylim(centro[1] - medio, centro[1] + medio)
+
+    p1, p2 = pos[eu], pos[ev]
+    medios = (p1 + p2) / 2
+    if curvas and len(eu):
+        # Bézier cuadrática con el control a un lado de la recta
+        dif = p2 - p1
+        control = medios + CURVATURA * np.stack((dif[:, 1], -dif[:, 0]), axis=1)
+        codigos = [RutaMPL.MOVETO, RutaMPL.CURVE3, RutaMPL.CURVE3]
+        rutas = [RutaMPL([a, c, b], codigos) for a, c, b in zip(p1, control, p2)]
+        ax.add_collection(PathCollection(rutas, facecolors="none", edgecolors="black",
+                                         linewidths=grosor, transform=ax.transData, zorder=1))
+        # el punto medio de la curva queda a medio camino hacia el control
+        medios = (medios + control) / 2
+    elif len(eu):
+        ax.add_collection(LineCollection(np.stack((p1, p2), axis=1), colors="black",
+                                         linewidths=grosor, zorder=1))
+
+    if len(pos):
+        ax.add_collection(EllipseCollection(
+            2 * tamanos, 2 * tamanos, np.zeros(len(pos)), units="xy", offsets=pos,
+            offset_transform=ax.transData, facecolors="black", edgecolors="none", zorder=2))
+
+    if etiquetas_aristas is not None:
+        for (x, y), texto in zip(medios, etiquetas_aristas):
+            ax.text(x, y, texto, ha="center", va="center", color="black",
+                    fontsize=fuente_aristas * escala_fuente, family="serif", style="italic",
+                    zorder=3)
+
+    if etiquetas_nodos is not None:
+        contorno = [patheffects.withStroke(linewidth=1.0 * escala_fuente, foreground="black")]
+        for (x, y), texto in zip(pos, etiquetas_nodos):
+            ax.text(x, y, texto, ha="center", va="center", color="white",
+                    fontsize=fuente_nodos * escala_fuente, family="serif",
+                    path_effects=contorno, zorder=4)
+
+    fig.savefig(ruta, dpi=100, facecolor="white")
@@ -0,0 +1,782 @@
+from __future__ import annotations
+import sys
+from pathlib import Path
+import gzip
+import io
+import pickle
+import random
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+from grafo_mst import GrafoMST
+
+
+# ============================================================
+# Utilidades
+# ============================================================
+
+def grafo_aleatorio(n: int, m: int, seed: int, wmin: int = 1, wmax: int = 20) -> GrafoMST:
+    rng = random.Random(seed)
+    g = GrafoMST(False)
+    for i in range(n):
+        g.add_nodo(i)
+    # camino base para garantizar conectividad
+    for i in range(1, n):
+        g.add_arista_peso(rng.randrange(i), i, rng.randint(wmin, wmax))
+    while g.numero_aristas() < m:
+        u, v = rng.randrange(n), rng.randrange(n)
+        if u != v:
+            g.add_arista_peso(u, v, rng.randint(wmin, wmax))
+    return g
+
+
+def aristas(T: GrafoMST):
+    return {(u, v) for u, v, _ in T.aristas_con_peso()}
+
+
+# ============================================================
+# Kruskal inverso
+# ============================================================
+
+def test_kruskal_inverso_coincide_con_directo():
+    for seed in range(20):
+        g = grafo_aleatorio(40, 120, seed)
+        kd, tkd = g.KruskalD()
+        ki, tki = g.KruskalI()
+        assert tki == tkd
+        assert ki.numero_aristas() == g.numero_nodos() - 1
+
+
+def test_kruskal_inverso_desempate_por_orden_de_borrado():
+    # triángulo con pesos iguales: se borra la primera arista revisada
+    g = GrafoMST(False)
+    for i in range(3):
+        g.add_nodo(i)
+    g.add_arista_peso(0, 1, 5)
+    g.add_arista_peso(1, 2, 5)
+    g.add_arista_peso(0, 2, 5)
+
+    primera = g.aristas_con_peso()[0]
+    ki, total = g.KruskalI()
+    assert total == 10.0
+    assert (primera[0], primera[1]) not in aristas(ki)
+
+
+# ============================================================
+# Union-find
+# ============================================================
+
+def test_dsu_iterativo_cadena_larga():
+    from grafo_mst import DSU
+    n = 100_000
+    d = DSU(f"n{i}" for i in range(n))
+    # cadena: cada unión cuelga la raíz vieja de un nodo nuevo
+    assert d.union_many((f"n{i}", f"n{i - 1}") for i in range(1, n)) == n - 1
+    assert d.numero_componentes() == 1
+    assert len(set(d.find_many(f"n{i}" for i in range(0, n, 997)))) == 1
+    assert not d.union("n0", f"n{n - 1}")
+    assert d.agregar("nuevo") and not d.agregar("nuevo")
+    assert d.numero_componentes() == 2 and d.tamano("n5") == n
+
+    d = DSU(range(5))
+    assert d.union(0, 1) and d.union(3, 4)
+    assert d.find(0) == d.find(1) != d.find(2) != d.find(3) == d.find(4)
+
+    denso = DSU(5)
+    assert denso.union(0, 1) and denso.union(3, 4)
+    assert denso.find_many(range(5)) == [denso.find(0)] * 2 + [2] + [denso.find(3)] * 2
+    assert denso.numero_componentes() == 3 and len(denso) == 5
+    assert denso.tamano(4) == 2 and not denso.conectados(1, 2) and denso.conectados(0, 1)
+    with pytest.raises(TypeError):
+        denso.agregar(5)
+
+
+# ============================================================
+# Vista compacta
+# ============================================================
+
+def test_compacto_adyacencia_y_pesos():
+    g = grafo_aleatorio(25, 60, seed=7)
+    c = g.compacto()
+    assert c.numero_nodos() == g.numero_nodos()
+    assert c.numero_aristas() == g.numero_aristas()
+    for i, nid in enumerate(c.ids):
+        vec = {c.ids[c.ady_nodo[k]] for k in range(c.inicio[i], c.inicio[i + 1])}
+        assert vec == {nb.id for nb in g.vecinos(nid)}
+        for k in range(c.inicio[i], c.inicio[i + 1]):
+            assert c.ady_peso[k] == g.peso_arista(nid, c.ids[c.ady_nodo[k]])
+
+
+def test_compacto_en_cache_hasta_que_cambia_el_grafo():
+    g = grafo_aleatorio(30, 80, seed=8)
+    c = g.compacto()
+    assert g.compacto() is c
+    orden = c.orden_por_peso()
+    assert list(orden) == sorted(range(c.numero_aristas()), key=c.ew.__getitem__)
+    desc = sorted(range(c.numero_aristas()), key=c.ew.__getitem__, reverse=True)
+    assert list(c.orden_inverso()) == desc[::-1]
+
+    _, antes = g.KruskalD()
+    g.add_arista_peso(0, 1000, 0.5)
+    assert g.compacto() is not c
+    assert g.KruskalD()[1] == antes + 0.5
+    assert g.KruskalI()[1] == antes + 0.5
+
+
+def test_prim_y_kruskal_coinciden():
+    for seed in range(10):
+        g = grafo_aleatorio(50, 200, seed)
+        _, tkd = g.KruskalD()
+        pr, tpr = g.Prim()
+        assert tpr == tkd
+        assert pr.numero_aristas() == g.numero_nodos() - 1
+
+
+def test_kruskal_numpy_mismo_arbol():
+    pytest.importorskip("numpy")
+    for seed in range(5):
+        g = grafo_aleatorio(300, 3000, seed, wmax=9)
+        kd, tkd = g.KruskalD(modo="compacto")
+        kn, tkn = g.KruskalD(modo="numpy")
+        assert tkn == tkd
+        assert aristas(kn) == aristas(kd)
+
+
+def test_kruskal_enteros_total_exacto():
+    g = grafo_aleatorio(200, 600, seed=4, wmax=9)
+    kd, tkd = g.KruskalD(modo="compacto")
+    ke, tke = g.KruskalD(modo="enteros")
+    assert isinstance(tke, int) and tke == tkd
+    assert aristas(ke) == aristas(kd)
+
+    # el orden de pesos enteros sale de cubetas, estable como sorted()
+    for wmin, wmax in [(1, 9), (-5, 5), (0, 10**6)]:
+        c = grafo_aleatorio(100, 400, seed=5, wmin=wmin, wmax=wmax).compacto()
+        esperado = sorted(range(c.numero_aristas()), key=c.ew.__getitem__)
+        assert (c._orden_cubetas() is None) == (wmax - wmin > 0xFFFF)
+        assert list(c.orden_por_peso()) == esperado
+
+    # sumas por encima de 2**53 no se redondean
+    grande = GrafoMST(False)
+    for i in range(4):
+        grande.add_arista_peso(i, i + 1, 2**52 + 1)
+    assert grande.KruskalD(modo="enteros")[1] == 4 * (2**52 + 1)
+
+    g.add_arista_peso(0, 500, 0.5)
+    with pytest.raises(ValueError):
+        g.KruskalD(modo="enteros")
+
+
+def grafo_geometrico(n: int, radio: float, seed: int) -> GrafoMST:
+    # grafo de radio con pesos euclidianos (como grafoGeografico)
+    rng = random.Random(seed)
+    g = GrafoMST(False)
+    pts = [(rng.random(), rng.random()) for _ in range(n)]
+    for i, (x, y) in enumerate(pts):
+        g.add_nodo(i, x=x, y=y)
+    for i in range(n):
+        for j in range(i + 1, n):
+            d = ((pts[i][0] - pts[j][0]) ** 2 + (pts[i][1] - pts[j][1]) ** 2) ** 0.5
+            if d <= radio:
+                g.add_arista_peso(i, j, d)
+    return g
+
+
+def test_kruskal_geometrico_exacto():
+    pytest.importorskip("numpy")
+    # radio grande (casi completo) y radio chico (no conexo)
+    for n, radio, seed in [(400, 0.9, 1), (400, 0.05, 2), (60, 2.0, 3)]:
+        g = grafo_geometrico(n, radio, seed)
+        kd, tkd = g.KruskalD(modo="compacto")
+        kg, tkg = g.KruskalD(modo="geometrico")
+        assert tkg == tkd
+        assert aristas(kg) == aristas(kd)
+
+    # nube con cúmulos y nodos sueltos; y coordenadas con pesos que no son
+    # distancias (sin poda espacial)
+    rng = random.Random(4)
+    g = GrafoMST(False)
+    pts = [(rng.gauss(cx, 0.02), rng.gauss(cy, 0.02))
+           for cx, cy in [(0.2, 0.2), (0.8, 0.3), (0.5, 0.9)] for _ in range(120)]
+    pts += [(rng.random() * 3, rng.random() * 3) for _ in range(10)]
+    for i, (x, y) in enumerate(pts):
+        g.add_nodo(i, x=x, y=y)
+    for i in range(len(pts)):
+        for j in range(i + 1, len(pts)):
+            g.add_arista_peso(i, j, ((pts[i][0] - pts[j][0]) ** 2 + (pts[i][1] - pts[j][1]) ** 2) ** 0.5)
+    base = grafo_geometrico(200, 0.5, 5)
+    otro = GrafoMST(False)
+    for n in base.nodos():
+        otro.add_nodo(n.id, x=n.x, y=n.y)
+    for i, (u, v, w) in enumerate(base.aristas_con_peso()):
+        otro.add_arista_peso(u, v, w * 3 if i % 7 == 0 else w)
+    for g in (g, otro):
+        kd, tkd = g.KruskalD(modo="compacto")
+        kg, tkg = g.KruskalD(modo="geometrico")
+        assert tkg == tkd
+        assert aristas(kg) == aristas(kd)
+
+    # la rejilla nunca da un radio de k vecinos menor que el verdadero
+    import numpy as np
+    from grafo_compacto import _radios_rejilla
+    x, y = np.array(pts).T
+    radio = _radios_rejilla(x, y, 8)
+    exacto = np.sort(np.hypot(x[:, None] - x[None, :], y[:, None] - y[None, :]), axis=1)[:, 8]
+    assert (radio >= exacto - 1e-12).all()
+
+    # sin coordenadas: el primer umbral es un cuantil de los pesos
+    for seed in range(3):
+        g = grafo_aleatorio(300, 6000, seed)
+        kd, tkd = g.KruskalD(modo="compacto")
+        kg, tkg = g.KruskalD(modo="geometrico")
+        assert tkg == tkd
+        assert aristas(kg) == aristas(kd)
+
+
+# ============================================================
+# Bosque de expansión mínima
+# ============================================================
+
+def grafo_no_conexo(seed: int) -> GrafoMST:
+    # dos grafos aleatorios disjuntos + un nodo aislado
+    a = grafo_aleatorio(15, 40, seed)
+    b = grafo_aleatorio(10, 25, seed + 100)
+    g = GrafoMST(False)
+    for pref, h in (("a", a), ("b", b)):
+        for n in h.nodos():
+            g.add_nodo(f"{pref}{n.id}")
+        for u, v, w in h.aristas_con_peso():
+            g.add_arista_peso(f"{pref}{u}", f"{pref}{v}", w)
+    g.add_nodo("solo")
+    return g, a.KruskalD()[1] + b.KruskalD()[1]
+
+
+def test_los_tres_metodos_devuelven_el_bosque():
+    for seed in range(5):
+        g, esperado = grafo_no_conexo(seed)
+        for metodo in ("KruskalD", "KruskalI", "Prim", "Boruvka"):
+            T, total = getattr(g, metodo)()
+            assert total == esperado
+            assert T.numero_aristas() == g.numero_nodos() - 3
+
+
+def test_bosque_por_componente():
+    g, esperado = grafo_no_conexo(3)
+    for metodo in ("KruskalD", "KruskalI", "Prim"):
+        bosque = g.bosque_expansion_minima(metodo)
+        assert bosque.numero_componentes() == 3
+        assert bosque.total == esperado
+        assert sorted(t.numero_nodos() for t in bosque.arboles) == [1, 10, 15]
+        assert bosque.componente["a0"] != bosque.componente["b0"]
+        for t, tot in zip(bosque.arboles, bosque.totales):
+            assert t.numero_aristas() == t.numero_nodos() - 1
+            assert sum(w for _, _, w in t.aristas_con_peso()) == tot
+
+
+def test_resultado_ligero_y_carga_masiva():
+    g, esperado = grafo_no_conexo(4)
+    g.add_nodo("con_pos", x=0.5, y=1.25)
+    for metodo in ("KruskalD", "KruskalI", "Prim", "Boruvka"):
+        T, total = getattr(g, metodo)()
+        A, total_ligero = getattr(g, metodo)(ligero=True)
+        assert total_ligero == A.total == total == esperado
+        assert len(A) == T.numero_aristas()
+        assert {(u, v) for u, v, _ in A.aristas_con_peso()} == aristas(T)
+
+        # mismo DOT que el GrafoMST, con o sin materializarlo
+        a, b, c = io.BytesIO(), io.BytesIO(), io.BytesIO()
+        T.to_graphviz_ponderado(a)
+        A.to_graphviz_ponderado(b)
+        A.grafo().to_graphviz_ponderado(c)
+        assert a.getvalue() == b.getvalue() == c.getvalue()
+
+    h = GrafoMST.desde_tabla([(0, None, None), (1, 0.5, 2.0), (2, None, None)],
+                             [(1, 0, 4.0), (1, 2, 2.5)])
+    assert h.numero_nodos() == 3 and h.numero_aristas() == 2
+    assert h.peso_arista(0, 1) == 4.0
+    assert h.KruskalD()[1] == 6.5
+
+
+# ============================================================
+# Instrumentación
+# ============================================================
+
+def test_estadisticas_mismo_arbol_y_contadores():
+    from estadisticas_mst import EstadisticasMST
+    g, esperado = grafo_no_conexo(2)
+    for metodo, opciones in [("KruskalD", {}), ("KruskalI", {}),
+                             ("Prim", {"modo": "indexado"}), ("Prim", {"modo": "perezoso"})]:
+        T, total = getattr(g, metodo)(**opciones)
+        st = EstadisticasMST()
+        Tm, tm = getattr(g, metodo)(stats=st, **opciones)
+        assert tm == total == esperado
+        assert aristas(Tm) == aristas(T)
+        assert st.metodo == metodo
+        assert st.aristas_examinadas > 0
+        assert {"construccion", "bucle", "resultado"} <= set(st.tiempos)
+        if metodo.startswith("Kruskal"):
+            assert st.uniones == T.numero_aristas()
+            assert st.finds == 2 * st.aristas_examinadas
+        else:
+            assert st.heap_pop >= T.numero_aristas()
+    assert st.heap_obsoletos == st.heap_pop - T.numero_aristas()
+
+    # conteos exactos a mano: KruskalD se detiene antes de la arista 0-3
+    g = GrafoMST(False)
+    for u, v, w in [(0, 1, 1), (1, 2, 2), (0, 2, 3), (2, 3, 4), (0, 3, 5)]:
+        g.add_arista_peso(u, v, w)
+    st = EstadisticasMST()
+    g.KruskalD(stats=st)
+    assert (st.aristas_examinadas, st.uniones, st.finds) == (4, 3, 8)
+    st = EstadisticasMST()
+    g.Prim(modo="perezoso", stats=st)
+    assert (st.aristas_examinadas, st.heap_push, st.heap_pop, st.heap_obsoletos) == (10, 5, 4, 1)
+
+    # los modos sin contadores no se miden en silencio con otro núcleo
+    for metodo, modo in [("KruskalD", "numpy"), ("KruskalD", "geometrico"),
+                         ("KruskalD", "otro"), ("Prim", "denso"), ("Prim", "otro")]:
+        with pytest.raises(ValueError):
+            getattr(g, metodo)(modo=modo, stats=EstadisticasMST())
+
+
+# ============================================================
+# MST en streaming
+# ============================================================
+
+def test_kruskal_streaming_corridas_en_disco(tmp_path):
+    from mst_streaming import kruskal_streaming, total_streaming, leer_tabla_aristas
+    g, esperado = grafo_no_conexo(5)
+    c = g.compacto()
+    flujo = [(c.ids[c.eu[e]], c.ids[c.ev[e]], c.ew[e]) for e in range(c.numero_aristas())]
+    kd, _ = g.KruskalD()
+
+    for opciones in ({}, {"tam_corrida": 7, "dir_temporal": tmp_path},
+                     {"tam_corrida": 7, "nodos": g.numero_nodos()}):
+        arbol, total = total_streaming(iter(flujo), **opciones)
+        assert total == esperado
+        assert {g._key(u, v) for u, v, _ in arbol} == aristas(kd)
+    assert list(tmp_path.iterdir()) == []   # las corridas se borran
+
+    ordenado = sorted(flujo, key=lambda a: a[2])
+    assert list(kruskal_streaming(ordenado, ordenadas=True)) == list(kruskal_streaming(flujo))
+    with pytest.raises(ValueError):
+        list(kruskal_streaming(ordenado[::-1], ordenadas=True))
+
+    tabla = tmp_path / "aristas.tsv"
+    tabla.write_text("# u v w\n" + "".join(f"{u}\t{v}\t{w}\n" for u, v, w in flujo), encoding="utf-8")
+    assert total_streaming(leer_tabla_aristas(tabla, sep="\t"), tam_corrida=10)[1] == esperado
+
+
+# ============================================================
+# Ponderación en bloque
+# ============================================================
+
+@pytest.mark.parametrize("wmin, wmax", [(1, 99), (1, 1), (0, 63), (1, 64), (-3, 5000)])
+def test_pesos_aleatorios_igual_que_randint(wmin, wmax):
+    from ponderacion import pesos_aleatorios
+    a, b = random.Random(101), random.Random(101)
+    assert pesos_aleatorios(a, 2000, wmin, wmax) == [b.randint(wmin, wmax) for _ in range(2000)]
+
+
+def test_convertir_y_ponderar_en_bloque():
+    from ponderacion import convertir_y_ponderar
+    base = grafo_aleatorio(80, 300, seed=21)
+    base.add_nodo("xy", x=0.25, y=0.75)
+    rng = random.Random(402)
+    esperado = GrafoMST(False)
+    for n in base.nodos():
+        esperado.add_nodo(n.id, x=n.x, y=n.y)
+    for u, v in base._aristas_key:
+        esperado.add_arista_peso(u, v, rng.randint(1, 99))
+
+    g = convertir_y_ponderar(base, seed=402)
+    a, b = io.BytesIO(), io.BytesIO()
+    esperado.to_graphviz_ponderado(a)
+    g.to_graphviz_ponderado(b)
+    assert a.getvalue() == b.getvalue()
+    assert g.KruskalD()[1] == esperado.KruskalD()[1]
+
+
+# ============================================================
+# Caché de resultados
+# ============================================================
+
+def test_cache_mst_aciertos_cambios_y_expulsion(tmp_path, monkeypatch):
+    from cache_mst import CacheMST
+    from concurrent.futures import ThreadPoolExecutor
+
+    g = grafo_aleatorio(40, 120, seed=14)
+    esperado = {m: getattr(g, m)() for m in ("KruskalD", "KruskalI", "Prim")}
+    cache = CacheMST(tmp_path / "cache")
+    monkeypatch.setattr(GrafoMST, "CACHE", cache)
+
+    for _ in range(2):
+        for metodo, (T, total) in esperado.items():
+            T2, total2 = getattr(g, metodo)()
+            assert total2 == total and aristas(T2) == aristas(T)
+    assert (cache.aciertos, cache.fallos) == (3, 3)
+    sel, _ = GrafoMST.mst_compacto(g.compacto(), "KruskalD", modo="auto")
+    assert type(sel) is list and cache.aciertos == 4
+
+    # otro peso, otra huella; otras opciones, otra entrada
+    g.add_arista_peso(0, 40, 0.5)
+    assert g.KruskalD()[1] == esperado["KruskalD"][1] + 0.5
+    g.Prim(start=5)
+    assert (cache.aciertos, cache.fallos) == (4, 5)
+
+    # escritores concurrentes de las mismas claves
+    c = g.compacto()
+    with ThreadPoolExecutor(8) as ex:
+        list(ex.map(lambda _: GrafoMST.mst_compacto(c, "KruskalI"), range(16)))
+    assert GrafoMST.mst_compacto(c, "KruskalI")[1] == g.KruskalI()[1]
+    assert not list((tmp_path / "cache").rglob(".tmp_*"))
+
+    # entrada ilegible o pickle: se descarta sin cargarla y se recalcula
+    clave = cache.clave(c, "KruskalD", {"modo": "auto"})
+    for basura in (b"basura", pickle.dumps((1, [0], 1.0)),
+                   cache._ruta(clave).read_bytes()[:-2]):
+        cache._ruta(clave).write_bytes(basura)
+        assert cache.obtener(clave) is None and not cache._ruta(clave).exists()
+        assert g.KruskalD()[1] == GrafoMST.mst_compacto(c, "KruskalD")[1]
+
+    # totales enteros grandes, exactos
+    cache.guardar("ee" + "0" * 38, [3, 1, 2], 2**70 + 1)
+    sel, total = cache.obtener("ee" + "0" * 38)
+    assert list(sel) == [3, 1, 2] and total == 2**70 + 1 and isinstance(total, int)
+
+    # bajo el límite, escribir no recorre el directorio
+    recorridos = []
+    entradas = cache._entradas
+    with monkeypatch.context() as mp:
+        mp.setattr(cache, "_entradas", lambda: recorridos.append(1) or entradas())
+        cache.guardar("fe" + "0" * 38, [0], 1.0)
+        cache.guardar("fe" + "0" * 38, [0, 1], 1.0)
+    assert recorridos == []
+    assert cache._ocupado >= cache.tamano()    # los hilos de arriba pueden sumar de más
+
+    # límite de tamaño: quedan las usadas más recientemente
+    cache.max_bytes = cache.tamano() // 2
+    cache.guardar("ff" + "0" * 38, [0], 1.0)
+    assert cache.tamano() <= cache.max_bytes
+    assert cache._ocupado == cache.tamano()
+    assert cache.obtener("ff" + "0" * 38) is not None
+
+
+# ============================================================
+# Exportación DOT
+# ============================================================
+
+def test_graphviz_ruta_manejador_y_gzip(tmp_path):
+    g = grafo_aleatorio(30, 70, seed=11)
+    g.add_nodo("con_pos", x=0.5, y=1.25)
+    ruta = tmp_path / "g.gv"
+    g.to_graphviz_ponderado(str(ruta))
+    texto = ruta.read_text(encoding="utf-8")
+    assert texto.startswith("graph G {\n") and texto.endswith("\n}")
+    assert '"con_pos" [pos="0.5,1.25!"];' in texto
+
+    buf = io.BytesIO()
+    g.to_graphviz_ponderado(buf)
+    assert not buf.closed
+    assert buf.getvalue().decode("utf-8") == texto
+
+    g.to_graphviz_ponderado(str(tmp_path / "g.gv.gz"))
+    assert gzip.open(tmp_path / "g.gv.gz").read().decode("utf-8") == texto
+
+
+def test_graphviz_desde_vista_compacta():
+    from grafo_io import escribir_graphviz_compacto
+    g = grafo_aleatorio(30, 70, seed=13)
+    g.add_nodo("con_pos", x=0.5, y=1.25)
+    a, b = io.BytesIO(), io.BytesIO()
+    g.to_graphviz_ponderado(a)
+    escribir_graphviz_compacto(g.compacto(), b)
+    assert a.getvalue() == b.getvalue()
+
+
+def test_graphviz_ida_y_vuelta(tmp_path):
+    g = grafo_aleatorio(40, 100, seed=12)
+    g.add_nodo(1000, x=0.125, y=2.0)
+    g.add_arista_peso(1000, 0, 7.5)
+    ruta = tmp_path / "g.gv"
+    g.to_graphviz_ponderado(str(ruta))
+
+    h = GrafoMST.desde_graphviz(ruta)
+    assert {n.id for n in h.nodos()} == {n.id for n in g.nodos()}
+    assert sorted(map(str, h.aristas_con_peso())) == sorted(map(str, g.aristas_con_peso()))
+    nodo = next(n for n in h.nodos() if n.id == 1000)
+    assert (nodo.x, nodo.y) == (0.125, 2.0)
+    assert h.KruskalD()[1] == g.KruskalD()[1]
+
+
+def test_graphviz_ids_tupla(tmp_path):
+    g = GrafoMST(False)
+    for i in range(3):
+        g.add_nodo((0, i))
+    g.add_arista_peso((0, 0), (0, 1), 2)
+    g.add_arista_peso((0, 1), (0, 2), 3)
+    g.to_graphviz_ponderado(str(tmp_path / "m.gv"))
+
+    h = GrafoMST.desde_graphviz(tmp_path / "m.gv")
+    assert {n.id for n in h.nodos()} == {(0, 0), (0, 1), (0, 2)}
+    assert h.peso_arista((0, 1), (0, 2)) == 3.0
+
+
+# ============================================================
+# Snapshot binario
+# ============================================================
+
+@pytest.mark.parametrize("adyacencia", [False, True])
+def test_snapshot_ida_y_vuelta(tmp_path, adyacencia):
+    g = grafo_aleatorio(60, 150, seed=13)
+    g.add_nodo(500, x=1.5, y=-2.0)
+    g.add_arista_peso(500, 3, 4.25)
+    ruta = tmp_path / "g.gms"
+    g.guardar_snapshot(ruta, adyacencia=adyacencia)
+
+    h = GrafoMST.desde_snapshot(ruta)
+    a, b = io.BytesIO(), io.BytesIO()
+    g.to_graphviz_ponderado(a)
+    h.to_graphviz_ponderado(b)
+    # mismas líneas; el orden de las aristas depende del contenedor de Grafo
+    assert sorted(a.getvalue().splitlines()) == sorted(b.getvalue().splitlines())
+    assert h.Prim()[1] == g.Prim()[1]
+
+
+# ============================================================
+# Variantes de Prim
+# ============================================================
+
+def test_prim_modos_mismo_arbol():
+    modos = ["perezoso", "indexado"]
+    try:
+        import numpy  # noqa: F401
+        modos.append("denso")
+    except ImportError:
+        pass
+    for seed in range(8):
+        # pesos en rango pequeño para forzar empates
+        g = grafo_aleatorio(40, 40 + 80 * seed, seed, wmax=4)
+        arboles = [g.Prim(modo=m) for m in modos]
+        for T, total in arboles[1:]:
+            assert total == arboles[0][1]
+            assert aristas(T) == aristas(arboles[0][0])
+
+
+# ============================================================
+# Borůvka
+# ============================================================
+
+def test_boruvka_mismo_arbol_que_kruskal():
+    modos = ["compacto"]
+    try:
+        import numpy  # noqa: F401
+        modos.append("numpy")
+    except ImportError:
+        pass
+    for seed in range(8):
+        g = grafo_aleatorio(60, 60 + 40 * seed, seed, wmax=3)
+        kd, tkd = g.KruskalD(modo="compacto")
+        for modo in modos:
+            bo, tbo = g.Boruvka(modo=modo)
+            assert tbo == tkd
+            assert aristas(bo) == aristas(kd)
+
+
+# ============================================================
+# MST dinámico
+# ============================================================
+
+def test_mst_dinamico_coincide_con_recalcular():
+    from mst_dinamico import MSTDinamico
+    for seed in range(6):
+        rng = random.Random(seed)
+        g = grafo_aleatorio(25, 50, seed, wmax=6)
+        d = MSTDinamico(g)
+        assert sorted(map(str, d.aristas_arbol())) == sorted(map(str, g.KruskalD()[0].aristas_con_peso()))
+        for _ in range(200):
+            u, v = rng.randrange(25), rng.randrange(25)
+            op = rng.random()
+            if op < 0.35:
+                d.insert_edge(u, v, rng.randint(1, 6))
+            elif op < 0.6:
+                d.delete_edge(u, v)
+            else:
+                u, v, _ = rng.choice(d.grafo().aristas_con_peso())
+                d.update_weight(u, v, rng.randint(1, 6))
+            T, total = d.grafo().KruskalD()
+            assert d.total == total
+            assert len(d.aristas_arbol()) == T.numero_aristas()
+
+
+def test_mst_dinamico_pesos_reales_total_exacto():
+    from math import fsum
+    from mst_dinamico import MSTDinamico
+    rng = random.Random(7)
+    g = grafo_aleatorio(30, 80, 7, wmax=6)
+    d = MSTDinamico(g)
+    for _ in range(400):
+        u, v, _ = rng.choice(d.grafo().aristas_con_peso())
+        if rng.random() < 0.2:
+            d.delete_edge(u, v)
+            d.insert_edge(u, v, rng.choice((0.1, 0.2, 0.3, 1e16)))
+        else:
+            d.update_weight(u, v, rng.choice((0.1, 0.2, 0.3, 0.7, 1e16)))
+        T, _ = d.grafo().KruskalD()
+        assert sorted(w for *_, w in d.aristas_arbol()) == sorted(w for *_, w in T.aristas_con_peso())
+        assert d.total == fsum(w for *_, w in d.aristas_arbol())
+    assert len(d._fuera) <= 2 * d._vivas + 64
+    with pytest.raises(ValueError):
+        d.insert_edge(0, 31, float("inf"))
+
+
+def test_heap_indexado_decrease_key():
+    from grafo_compacto import HeapIndexado
+    h = HeapIndexado(10, d=3)
+    for v, k in [(4, 9), (2, 5), (7, 7), (1, 8)]:
+        assert h.empujar_o_decrementar(v, k)
+    assert not h.empujar_o_decrementar(2, 6)
+    assert h.empujar_o_decrementar(1, 1)
+    assert len(h) == 4
+    assert [h.extraer_min() for _ in range(4)] == [(1, 1), (2, 5), (7, 7), (4, 9)]
+    assert 1 not in h
+
+
+# ============================================================
+# Certificado del MST
+# ============================================================
+
+def camino_en_arbol(c, sel, a, b):
+    ady = {}
+    for e in sel:
+        ady.setdefault(c.eu[e], []).append(e)
+        ady.setdefault(c.ev[e], []).append(e)
+    previo = {a: None}
+    cola = [a]
+    for u in cola:
+        for e in ady.get(u, ()):
+            v = c.ev[e] if c.eu[e] == u else c.eu[e]
+            if v not in previo:
+                previo[v] = (u, e)
+                cola.append(v)
+    camino = []
+    while previo[b] is not None:
+        b, e = previo[b]
+        camino.append(e)
+    return camino
+
+
+@pytest.mark.parametrize("modo", ["puro", "numpy"])
+def test_certificado_acepta_el_mst_y_rechaza_alteraciones(modo):
+    if modo == "numpy":
+        pytest.importorskip("numpy")
+    from certificado_mst import verificar_mst
+
+    g, _ = grafo_no_conexo(7)
+    c = g.compacto()
+    sel, total = GrafoMST.mst_compacto(c, "KruskalD")
+    assert verificar_mst(c, sel, total, modo=modo)
+    assert "bosque" in verificar_mst(c, sel[:-1], modo=modo).motivo
+
+    for seed in range(6):
+        rng = random.Random(seed)
+        n = rng.randint(200, 3000)
+        g = grafo_aleatorio(n, rng.randint(n, 6 * n), seed, wmax=rng.choice((3, 50, 10**6)))
+        c = g.compacto()
+        for metodo in ("KruskalD", "Prim", "Boruvka"):
+            sel, total = GrafoMST.mst_compacto(c, metodo)
+            assert verificar_mst(c, sel, total, modo=modo)
+
+        assert not verificar_mst(c, sel, total + 1, modo=modo)
+        assert not verificar_mst(c, sel + sel[:1], modo=modo)
+        assert not verificar_mst(c, [c.numero_aristas()] + sel[1:], modo=modo)
+
+        en_arbol = set(sel)
+        for _ in range(10):
+            e = rng.choice([k for k in range(c.numero_aristas()) if k not in en_arbol])
+            camino = camino_en_arbol(c, sel, c.eu[e], c.ev[e])
+
+            # cambiar una arista del ciclo por e da otro árbol de
+            # expansión, mínimo sólo si pesan lo mismo
+            f = min(camino, key=c.ew.__getitem__)
+            otro = [k for k in sel if k != f] + [e]
+            cert = verificar_mst(c, otro, modo=modo)
+            assert bool(cert) == (c.ew[e] == c.ew[f])
+            if not cert:
+                assert "máximo de su ciclo" in cert.motivo and cert.arista not in otro
+
+            # quitar una arista fuera del ciclo y agregar e cierra un ciclo
+            x = rng.choice([k for k in sel if k not in set(camino)])
+            cert = verificar_mst(c, [k for k in sel if k != x] + [e], modo=modo)
+            assert cert.motivo == f"la arista {e} cierra un ciclo" and cert.arista == e
+
+
+# ============================================================
+# Layout ForceAtlas2
+# ============================================================
+
+def test_random_java_y_barnes_hut():
+    np = pytest.importorskip("numpy")
+    from layout_fa2 import RandomJava, _repulsion_barnes_hut, _repulsion_exacta
+
+    # new java.util.Random(42).nextInt()
+    assert RandomJava(42).next_int() == -1170105035
+
+    rng = np.random.default_rng(0)
+    pos = rng.normal(size=(1500, 2)) * 100
+    masa = 1.0 + rng.integers(0, 5, 1500)
+    exacta = _repulsion_exacta(pos, masa, 2.0, None)
+    aprox = _repulsion_barnes_hut(pos, masa, 2.0, 1.2, None)
+    error = np.linalg.norm(aprox - exacta, axis=1).mean() / np.linalg.norm(exacta, axis=1).mean()
+    assert error < 0.05
+    fina = _repulsion_barnes_hut(pos, masa, 2.0, 0.2, None)
+    assert np.allclose(fina, exacta, rtol=1e-2, atol=1e-3 * np.abs(exacta).max())
+
+
+def test_forceatlas2_evita_traslape():
+    np = pytest.importorskip("numpy")
+    from layout_fa2 import forceatlas2, posiciones_aleatorias, tamanos_por_grado
+
+    g = grafo_aleatorio(60, 150, seed=15)
+    c = g.compacto()
+    eu, ev = np.frombuffer(c.eu, dtype=np.intc), np.frombuffer(c.ev, dtype=np.intc)
+    tam = tamanos_por_grado(eu, ev, 60)
+    assert tam.min() == 5.0 and tam.max() == 40.0
+
+    def traslapes(p):
+        d = np.hypot(*(p[:, None] - p[None]).transpose(2, 0, 1))
+        t = d < tam[:, None] + tam[None]
+        np.fill_diagonal(t, False)
+        return t.sum() // 2
+
+    pos = posiciones_aleatorias(60)
+    assert np.array_equal(pos, posiciones_aleatorias(60))
+    for barnes_hut in (False, True):
+        p = forceatlas2(pos, eu, ev, 300, barnes_hut=barnes_hut)
+        q = forceatlas2(p, eu, ev, 300, evitar_traslape=True, tamanos=tam, barnes_hut=barnes_hut)
+        assert np.isfinite(q).all()
+        if barnes_hut:
+            # como en Gephi, las regiones lejanas no usan los tamaños
+            assert traslapes(q) * 5 < traslapes(p)
+        else:
+            assert traslapes(q) == 0
+
+
+def test_separar_traslapes_sobre_layout_fijado():
+    np = pytest.importorskip("numpy")
+    from layout_fa2 import separar_traslapes
+
+    rng = np.random.default_rng(3)
+    pos = np.vstack((rng.uniform(0, 200, size=(40, 2)), [[1000.0, 1000.0], [1000.0, 1000.0]]))
+    lejos = np.array([5000.0, -5000.0])
+    pos = np.vstack((pos, [lejos]))
+    q = separar_traslapes(pos, 10.0, iteraciones=500)
+
+    d = np.hypot(*(q[:, None] - q[None]).transpose(2, 0, 1))
+    np.fill_diagonal(d, np.inf)
+    assert d.min() >= 20.0 - 1e-6
+    # el nodo aislado no se mueve y el resto apenas se desplaza
+    assert np.array_equal(q[-1], lejos)
+    assert np.abs(q - pos).max() < 200